@@ -1,16 +1,21 @@
 import os
 import logging
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from datetime import datetime, timedelta
-from fpdf import FPDF
-import tempfile
-import base64
 from io import BytesIO
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
+
+# plotly y fpdf solo se usan al dibujar los gráficos o generar el PDF, así que
+# se importan dentro de las funciones que los necesitan
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+    from fpdf import FPDF
 
 # Configuración del logger
 logging.basicConfig(
@@ -27,63 +32,231 @@ logger = logging.getLogger(__name__)
 DATA_DIR = Path(__file__).parent / "data"
 os.makedirs(DATA_DIR, exist_ok=True)
 
-def load_data() -> pd.DataFrame:
-    """Carga los datos de los artículos desde el archivo CSV."""
+# Columnas del CSV que usa la aplicación; el resto (descripción, imagen...)
+# no se llega a leer
+DATA_COLUMNS = ['title', 'source', 'section', 'published_date', 'url']
+
+# Tipos de las columnas del CSV: fuente y sección tienen pocos valores
+# distintos, por lo que se cargan como categorías
+DATA_DTYPES = {
+    'title': 'string',
+    'source': 'category',
+    'section': 'category',
+    'url': 'string'
+}
+
+# Copia Parquet del CSV que mantiene la aplicación. El nombre no coincide con
+# el del almacén Parquet que puede usar el scraper (articles.parquet)
+PARQUET_COPY_NAME = '.articles.cache.parquet'
+
+# Clave de los metadatos de la copia con el tamaño y la fecha del CSV leído
+PARQUET_COPY_SOURCE_KEY = b'discover_monitor.source_csv'
+
+def _csv_signature(stat: os.stat_result) -> bytes:
+    """Identifica una versión del CSV por su fecha de modificación y su tamaño."""
+    return f"{stat.st_mtime_ns}:{stat.st_size}".encode()
+
+def _read_parquet_copy(csv_file: Path, parquet_file: Path) -> Optional[pd.DataFrame]:
+    """Lee la copia Parquet del CSV si existe y se generó a partir de su versión actual.
+    
+    Args:
+        csv_file: Ruta del CSV original
+        parquet_file: Ruta de la copia en Parquet
+        
+    Returns:
+        DataFrame con los datos, o None si hay que volver a leer el CSV
+    """
+    try:
+        metadata = pq.read_schema(parquet_file).metadata or {}
+        if metadata.get(PARQUET_COPY_SOURCE_KEY) != _csv_signature(csv_file.stat()):
+            return None
+        return pd.read_parquet(parquet_file, columns=DATA_COLUMNS)
+    except Exception as e:
+        # Sin copia (o ilegible): se regenera a partir del CSV
+        logger.debug(f"No se usa la copia Parquet {parquet_file}: {e}")
+        return None
+
+def _write_parquet_copy(df: pd.DataFrame, parquet_file: Path, csv_stat: os.stat_result) -> None:
+    """Guarda una copia Parquet de los datos ya tipados y ordenados.
+    
+    Args:
+        df: DataFrame cargado del CSV
+        parquet_file: Ruta de la copia en Parquet
+        csv_stat: Estado del CSV tomado antes de leerlo. Si el scraper añade
+            filas mientras se lee, la copia ya no coincide con el CSV y se
+            descarta en la siguiente carga.
+    """
+    tmp_file = parquet_file.with_name(parquet_file.name + '.tmp')
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[PARQUET_COPY_SOURCE_KEY] = _csv_signature(csv_stat)
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_file, compression='zstd')
+        os.replace(tmp_file, parquet_file)
+    except Exception as e:
+        logger.warning(f"No se pudo guardar la copia Parquet {parquet_file}: {e}")
+
+@st.cache_data(show_spinner=False)
+def load_data(mtime: Optional[float] = None) -> pd.DataFrame:
+    """Carga los datos de los artículos desde el archivo CSV.
+    
+    El resultado se cachea con ``st.cache_data``; ``mtime`` solo forma parte
+    de la clave de la caché para invalidarla cuando el CSV cambia en disco.
+    
+    Tras leer el CSV se guarda una copia en Parquet junto a él, con los tipos
+    y el orden ya aplicados. Mientras el CSV no cambie (misma fecha de
+    modificación y tamaño), los arranques siguientes leen esa copia en lugar
+    de volver a parsear el CSV.
+    
+    Args:
+        mtime: Fecha de modificación del archivo CSV (ver get_data_mtime)
+        
+    Returns:
+        DataFrame con los datos cargados
+    """
     try:
         data_file = DATA_DIR / "articles.csv"
         if data_file.exists():
-            df = pd.read_csv(data_file, parse_dates=['published_date'])
+            parquet_file = data_file.with_name(PARQUET_COPY_NAME)
+            df = _read_parquet_copy(data_file, parquet_file)
+            if df is not None:
+                logger.info(f"Datos cargados correctamente desde {parquet_file}")
+                return df
+            
+            csv_stat = data_file.stat()
+            df = pd.read_csv(
+                data_file,
+                engine='pyarrow',
+                usecols=DATA_COLUMNS,
+                dtype=DATA_DTYPES,
+                parse_dates=['published_date']
+            )
+            # Ordenar por fecha permite filtrar rangos con búsqueda binaria
+            df = df.sort_values('published_date', na_position='last', ignore_index=True)
+            _write_parquet_copy(df, parquet_file, csv_stat)
             logger.info(f"Datos cargados correctamente desde {data_file}")
             return df
         else:
             logger.warning(f"Archivo {data_file} no encontrado")
-            return pd.DataFrame(columns=['title', 'source', 'section', 'published_date', 'url'])
+            return pd.DataFrame(columns=DATA_COLUMNS)
     except Exception as e:
         logger.error(f"Error al cargar los datos: {e}")
         return pd.DataFrame()
 
+def get_data_mtime() -> Optional[float]:
+    """Obtiene la fecha de modificación del archivo de datos.
+    
+    Returns:
+        Marca de tiempo de la última modificación o None si el archivo no existe
+    """
+    try:
+        return (DATA_DIR / "articles.csv").stat().st_mtime
+    except OSError:
+        return None
+
 def get_data() -> pd.DataFrame:
-    """Obtiene los datos, cargándolos si es necesario.
+    """Obtiene los datos usando la caché de load_data.
+    
+    Los reruns de Streamlit reutilizan el DataFrame cacheado mientras el CSV
+    no se modifique.
     
     Returns:
         DataFrame con los datos cargados
     """
-    if 'df' not in st.session_state or st.session_state.df.empty:
-        st.session_state.df = load_data()
-    return st.session_state.df
+    return load_data(get_data_mtime())
+
+def _column_counts(df: pd.DataFrame, column: str) -> pd.Series:
+    """Cuenta los artículos por valor de una columna, descartando los ceros."""
+    if column not in df.columns:
+        return pd.Series(dtype='int64')
+    # Las columnas categóricas incluyen en value_counts las categorías sin filas
+    counts = df[column].value_counts()
+    return counts[counts > 0]
+
+def summarize_data(df: pd.DataFrame) -> Dict[str, Any]:
+    """Calcula una sola vez los agregados que comparten métricas, gráficos y PDF.
+    
+    Args:
+        df: DataFrame con los datos filtrados
+        
+    Returns:
+        Diccionario con el total de artículos y los conteos por fuente y sección,
+        ordenados de mayor a menor
+    """
+    return {
+        'total': len(df),
+        'source_counts': _column_counts(df, 'source'),
+        'section_counts': _column_counts(df, 'section'),
+    }
+
+@st.cache_data(show_spinner=False)
+def _source_chart_figure(source_counts: pd.Series) -> 'go.Figure':
+    """Construye el gráfico por fuente a partir de los conteos ya agregados.
+    
+    Se cachea sobre la serie de conteos, que es pequeña y barata de
+    hashear, para no reconstruir la figura en cada rerun. Se usa una única
+    traza go.Bar con un color por barra en lugar de px.bar(color=...), que
+    crea una traza por fuente.
+    """
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+    
+    palette = qualitative.Plotly
+    colors = [palette[i % len(palette)] for i in range(len(source_counts))]
+    fig = go.Figure(go.Bar(
+        x=source_counts.index.to_numpy(),
+        y=source_counts.to_numpy(),
+        marker_color=colors,
+    ))
+    fig.update_layout(
+        title='Total de artículos por fuente',
+        xaxis_title='Fuente',
+        yaxis_title='Número de artículos',
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _section_chart_figure(section_counts: pd.Series, top_n: int) -> 'go.Figure':
+    """Construye el gráfico por sección a partir de los conteos ya agregados."""
+    import plotly.graph_objects as go
+    
+    fig = go.Figure(go.Bar(
+        x=section_counts.to_numpy(),
+        y=section_counts.index.to_numpy(),
+        orientation='h',
+    ))
+    fig.update_layout(
+        title=f'Top {top_n} secciones con más artículos',
+        xaxis_title='Número de artículos',
+        yaxis_title='Sección',
+    )
+    return fig
 
-def generate_source_chart(df: pd.DataFrame) -> Optional[go.Figure]:
+def generate_source_chart(df: pd.DataFrame, summary: Optional[Dict[str, Any]] = None) -> Optional['go.Figure']:
     """Genera un gráfico de barras mostrando artículos por fuente.
     
     Args:
         df: DataFrame con los datos de los artículos
+        summary: Agregados ya calculados con summarize_data (opcional)
         
     Returns:
         Objeto Figure de Plotly con el gráfico o None si no hay datos
     """
     if df.empty or 'source' not in df.columns:
         return None
-        
-    source_counts = df['source'].value_counts().reset_index()
-    source_counts.columns = ['Fuente', 'Cantidad']
-    
-    fig = px.bar(
-        source_counts, 
-        x='Fuente', 
-        y='Cantidad',
-        color='Fuente',
-        title='Total de artículos por fuente',
-        labels={'Fuente': 'Fuente', 'Cantidad': 'Número de artículos'}
-    )
     
-    return fig
+    if summary is None:
+        summary = summarize_data(df)
+    return _source_chart_figure(summary['source_counts'])
 
-def generate_section_chart(df: pd.DataFrame, top_n: int = 10) -> Optional[go.Figure]:
+def generate_section_chart(df: pd.DataFrame, top_n: int = 10,
+                           summary: Optional[Dict[str, Any]] = None) -> Optional['go.Figure']:
     """Genera un gráfico de barras mostrando las secciones con más artículos.
     
     Args:
         df: DataFrame con los datos de los artículos
         top_n: Número de secciones a mostrar
+        summary: Agregados ya calculados con summarize_data (opcional)
         
     Returns:
         Objeto Figure de Plotly con el gráfico o None si no hay datos
@@ -91,26 +264,119 @@ def generate_section_chart(df: pd.DataFrame, top_n: int = 10) -> Optional[go.Fig
     if df.empty or 'section' not in df.columns:
         return None
     
-    section_counts = df['section'].value_counts().head(top_n).reset_index()
-    section_counts.columns = ['Sección', 'Cantidad']
+    if summary is None:
+        summary = summarize_data(df)
+    # Los conteos ya vienen ordenados de mayor a menor
+    return _section_chart_figure(summary['section_counts'].head(top_n), top_n)
+
+def _build_pdf_report(df: pd.DataFrame, summary: Optional[Dict[str, Any]] = None) -> 'FPDF':
+    """Compone el informe PDF en memoria.
     
-    fig = px.bar(
-        section_counts, 
-        x='Cantidad', 
-        y='Sección',
-        orientation='h',
-        title=f'Top {top_n} secciones con más artículos',
-        labels={'Cantidad': 'Número de artículos', 'Sección': 'Sección'}
-    )
+    Args:
+        df: DataFrame con los datos de los artículos (no vacío)
+        summary: Agregados ya calculados con summarize_data (opcional)
+        
+    Returns:
+        Documento FPDF listo para serializar
+    """
+    from fpdf import FPDF, XPos, YPos
+    from fpdf.fonts import FontFace
     
-    return fig
+    if summary is None:
+        summary = summarize_data(df)
+        
+    pdf = FPDF(orientation='P', unit='mm', format='A4')
+    # windows-1252 cubre comillas tipográficas y rayas habituales en los titulares
+    pdf.core_fonts_encoding = 'windows-1252'
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=12)
+    
+    # Título
+    pdf.set_font("Helvetica", 'B', 16)
+    pdf.cell(200, 10, text="Informe de Artículos en Discover", align='C', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(10)
+    
+    # Fecha del informe
+    pdf.set_font("Helvetica", size=10)
+    pdf.cell(200, 10, text=f"Generado el: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(10)
+    
+    # Estadísticas
+    pdf.set_font("Helvetica", 'B', 12)
+    pdf.cell(200, 10, text="Estadísticas:", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font("Helvetica", size=10)
+    pdf.cell(200, 10, text=f"Total de artículos: {summary['total']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.cell(200, 10, text=f"Fuentes únicas: {len(summary['source_counts'])}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.cell(200, 10, text=f"Secciones únicas: {len(summary['section_counts'])}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(10)
+    
+    # Tabla de artículos (solo las primeras 50 filas para no hacer el PDF demasiado grande)
+    pdf.set_font("Helvetica", 'B', 12)
+    pdf.cell(200, 10, text=f"Artículos recientes (mostrando {min(50, len(df))} de {len(df)}):", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(5)
+    
+    # Preparar las filas con operaciones vectorizadas para no acceder a
+    # pandas dentro del bucle
+    has_source = 'source' in df.columns
+    has_section = 'section' in df.columns
+    head = df.head(50)
+    # Truncar los títulos largos con los métodos .str en lugar de fila a fila
+    titles = head['title'].fillna('').astype(str)
+    too_long = titles.str.len() > 50
+    titles = titles.where(~too_long, titles.str.slice(0, 50) + '...')
+    rows = pd.DataFrame({
+        'title': titles,
+        'source': head['source'].astype(str) if has_source else '',
+        'section': head['section'].astype(str) if has_section else '',
+        'date': head['published_date'].dt.strftime('%Y-%m-%d').fillna('') if 'published_date' in head.columns else ''
+    }, index=head.index)
+    
+    # Tabla con el componente de fpdf2, que calcula la maquetación de las
+    # columnas una sola vez para todas las filas
+    pdf.set_font("Helvetica", size=8)
+    headings_style = FontFace(emphasis='BOLD', fill_color=(200, 220, 255))
+    with pdf.table(col_widths=(100, 40, 40, 30), headings_style=headings_style, line_height=8) as table:
+        table.row(("Título", "Fuente", "Sección", "Fecha"))
+        for row in rows.itertuples(index=False, name=None):
+            table.row(row)
+    
+    return pdf
+
+def _report_pdf_error(e: Exception) -> None:
+    """Registra y muestra un error producido al generar el informe PDF."""
+    error_msg = f"Error al generar el informe PDF: {e}"
+    logger.error(error_msg, exc_info=True)
+    if 'st' in globals() and hasattr(st, 'error'):
+        st.error(error_msg)
 
-def generate_pdf_report(df: pd.DataFrame, output_path: str) -> None:
+def generate_pdf_bytes(df: pd.DataFrame, summary: Optional[Dict[str, Any]] = None) -> bytes:
+    """Genera el informe PDF y lo devuelve como bytes, sin pasar por disco.
+    
+    Args:
+        df: DataFrame con los datos de los artículos
+        summary: Agregados ya calculados con summarize_data (opcional)
+        
+    Returns:
+        Contenido del PDF, o bytes vacíos si no hay datos
+    """
+    if df.empty:
+        logger.warning("No hay datos para generar el informe PDF")
+        return b''
+        
+    try:
+        return bytes(_build_pdf_report(df, summary).output())
+    except Exception as e:
+        _report_pdf_error(e)
+        raise
+
+def generate_pdf_report(df: pd.DataFrame, output_path: str,
+                        summary: Optional[Dict[str, Any]] = None) -> None:
     """Genera un informe en PDF con los datos de los artículos.
     
     Args:
         df: DataFrame con los datos de los artículos
         output_path: Ruta donde guardar el archivo PDF
+        summary: Agregados ya calculados con summarize_data (opcional)
     """
     if df.empty:
         logger.warning("No hay datos para generar el informe PDF")
@@ -120,85 +386,76 @@ def generate_pdf_report(df: pd.DataFrame, output_path: str) -> None:
         raise ValueError("La ruta de salida no puede estar vacía")
         
     try:
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font("Arial", size=12)
-        
-        # Título
-        pdf.set_font("Arial", 'B', 16)
-        pdf.cell(200, 10, txt="Informe de Artículos en Discover", ln=True, align='C')
-        pdf.ln(10)
-        
-        # Fecha del informe
-        pdf.set_font("Arial", size=10)
-        pdf.cell(200, 10, txt=f"Generado el: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=True)
-        pdf.ln(10)
-        
-        # Estadísticas
-        pdf.set_font("Arial", 'B', 12)
-        pdf.cell(200, 10, txt="Estadísticas:", ln=True)
-        pdf.set_font("Arial", size=10)
-        pdf.cell(200, 10, txt=f"Total de artículos: {len(df)}", ln=True)
-        
-        # Verificar si las columnas existen antes de acceder a ellas
-        has_source = 'source' in df.columns
-        has_section = 'section' in df.columns
-        
-        pdf.cell(200, 10, txt=f"Fuentes únicas: {df['source'].nunique() if has_source else 0}", ln=True)
-        pdf.cell(200, 10, txt=f"Secciones únicas: {df['section'].nunique() if has_section else 0}", ln=True)
-        pdf.ln(10)
-        
-        # Tabla de artículos (solo las primeras 50 filas para no hacer el PDF demasiado grande)
-        pdf.set_font("Arial", 'B', 12)
-        pdf.cell(200, 10, txt=f"Artículos recientes (mostrando {min(50, len(df))} de {len(df)}):", ln=True)
-        pdf.ln(5)
-        
-        # Encabezados de la tabla
-        pdf.set_fill_color(200, 220, 255)
-        pdf.cell(100, 10, "Título", 1, 0, 'C', 1)
-        pdf.cell(40, 10, "Fuente", 1, 0, 'C', 1)
-        pdf.cell(40, 10, "Sección", 1, 0, 'C', 1)
-        pdf.cell(30, 10, "Fecha", 1, 1, 'C', 1)
-        
-        # Filas de la tabla
-        pdf.set_font("Arial", size=8)
-        for _, row in df.head(50).iterrows():
-            # Truncar el título si es muy largo
-            title = row['title'][:50] + '...' if len(row['title']) > 50 else row['title']
-            pdf.cell(100, 8, title, 1)
-            pdf.cell(40, 8, str(row.get('source', '')), 1)
-            pdf.cell(40, 8, str(row.get('section', '')), 1)
-            pdf.cell(30, 8, str(row['published_date'].strftime('%Y-%m-%d') if pd.notnull(row.get('published_date')) else ''), 1, 1)
-        
-        # Guardar el PDF
+        pdf = _build_pdf_report(df, summary)
         pdf.output(output_path)
         logger.info(f"Informe PDF generado en {output_path}")
-        
     except Exception as e:
-        error_msg = f"Error al generar el informe PDF: {e}"
-        logger.error(error_msg, exc_info=True)
-        if 'st' in globals() and hasattr(st, 'error'):
-            st.error(error_msg)
+        _report_pdf_error(e)
         raise
 
-def setup_sidebar_filters(df: pd.DataFrame) -> Dict[str, Any]:
+def _filter_options(df: pd.DataFrame) -> Dict[str, Any]:
+    """Calcula las opciones de los filtros a partir de los datos.
+    
+    Args:
+        df: DataFrame con todos los artículos
+        
+    Returns:
+        Diccionario con la lista de fuentes y las fechas mínima y máxima
+    """
+    if df.empty:
+        sources = []
+    elif isinstance(df['source'].dtype, pd.CategoricalDtype):
+        # Las categorías ya son valores únicos sin nulos: basta con ordenar
+        # esas pocas etiquetas en lugar de recorrer todas las filas
+        sources = sorted(df['source'].cat.categories.tolist())
+    else:
+        sources = sorted(df['source'].dropna().unique().tolist())
+    
+    has_dates = not df.empty and 'published_date' in df.columns
+    return {
+        'sources': sources,
+        'min_date': df['published_date'].min().to_pydatetime() if has_dates else datetime.now() - timedelta(days=30),
+        'max_date': df['published_date'].max().to_pydatetime() if has_dates else datetime.now(),
+    }
+
+@st.cache_data(show_spinner=False)
+def get_filter_options(mtime: Optional[float], _df: pd.DataFrame) -> Dict[str, Any]:
+    """Devuelve las opciones de los filtros del CSV actual.
+    
+    Solo dependen del archivo de datos, así que se cachean por su fecha de
+    modificación y no se recalculan en cada rerun. El DataFrame no forma
+    parte de la clave (el guion bajo evita que Streamlit lo hashee).
+    
+    Args:
+        mtime: Fecha de modificación del CSV, usada como clave de caché
+        _df: DataFrame cargado de ese CSV
+        
+    Returns:
+        Diccionario con la lista de fuentes y las fechas mínima y máxima
+    """
+    return _filter_options(_df)
+
+def setup_sidebar_filters(df: pd.DataFrame, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Configura los filtros en la barra lateral.
     
     Args:
         df: DataFrame con los datos a filtrar
+        options: Opciones ya calculadas con get_filter_options (opcional)
         
     Returns:
         Diccionario con los filtros seleccionados
     """
+    if options is None:
+        options = _filter_options(df)
     filters = {}
     
     # Filtro por fuente
-    sources = ['Todos'] + sorted(df['source'].dropna().unique().tolist()) if not df.empty else ['Todos']
+    sources = ['Todos'] + options['sources']
     filters['source'] = st.sidebar.selectbox('Fuente', sources, index=0)
     
     # Filtro por fecha
-    min_date = df['published_date'].min().to_pydatetime() if not df.empty and 'published_date' in df.columns else datetime.now() - timedelta(days=30)
-    max_date = df['published_date'].max().to_pydatetime() if not df.empty and 'published_date' in df.columns else datetime.now()
+    min_date = options['min_date']
+    max_date = options['max_date']
     
     date_range = st.sidebar.date_input(
         'Rango de fechas',
@@ -227,7 +484,9 @@ def apply_filters(df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
     if df.empty:
         return df
         
-    filtered_df = df.copy()
+    # Sin copia: los filtros devuelven un DataFrame nuevo solo cuando recortan
+    # los datos y ninguna función posterior modifica el resultado
+    filtered_df = df
     
     # Aplicar filtro de fuente si existe la clave 'source' en los filtros
     if 'source' in filters and filters.get('source') != 'Todos':
@@ -240,46 +499,88 @@ def apply_filters(df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
         end_date = pd.Timestamp(filters['end_date']).date() if filters['end_date'] else None
         
         if start_date and end_date:
-            filtered_df = filtered_df[
-                (filtered_df['published_date'].dt.date >= start_date) &
-                (filtered_df['published_date'].dt.date <= end_date)
-            ]
+            filtered_df = _filter_date_range(filtered_df, start_date, end_date)
     
     return filtered_df
 
-def display_metrics(filtered_df: pd.DataFrame) -> None:
+def _is_sorted_by_date(dates: pd.Series) -> bool:
+    """Indica si la columna de fechas está ordenada (con los NaT al final)."""
+    if dates.dt.tz is not None:
+        return False
+    n_valid = dates.count()
+    return dates.iloc[:n_valid].is_monotonic_increasing and not dates.iloc[n_valid:].notna().any()
+
+def _filter_date_range(df: pd.DataFrame, start_date, end_date) -> pd.DataFrame:
+    """Filtra las filas cuya fecha de publicación está entre dos días (incluidos).
+    
+    Si la columna está ordenada (como la deja load_data) el rango se obtiene
+    con np.searchsorted sobre los datetime64 en O(log n), sin crear objetos
+    date por fila.
+    
+    Args:
+        df: DataFrame a filtrar
+        start_date: Primer día del rango
+        end_date: Último día del rango
+        
+    Returns:
+        DataFrame filtrado
+    """
+    dates = df['published_date']
+    # Límites como Timestamp: [inicio del primer día, inicio del día siguiente al último)
+    start = pd.Timestamp(start_date)
+    end = pd.Timestamp(end_date) + pd.Timedelta(days=1)
+    if _is_sorted_by_date(dates):
+        values = dates.to_numpy()
+        lo = np.searchsorted(values, start.to_datetime64(), side='left')
+        hi = np.searchsorted(values, end.to_datetime64(), side='left')
+        return df.iloc[lo:hi]
+    
+    # Sin orden se compara directamente sobre datetime64, sin crear un objeto
+    # date por fila
+    if dates.dt.tz is not None:
+        start = start.tz_localize(dates.dt.tz)
+        end = end.tz_localize(dates.dt.tz)
+    return df[(dates >= start) & (dates < end)]
+
+def display_metrics(filtered_df: pd.DataFrame, summary: Optional[Dict[str, Any]] = None) -> None:
     """Muestra las métricas principales.
     
     Args:
         filtered_df: DataFrame con los datos filtrados
+        summary: Agregados ya calculados con summarize_data (opcional)
     """
     if not filtered_df.empty:
+        if summary is None:
+            summary = summarize_data(filtered_df)
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Total de artículos", len(filtered_df))
+            st.metric("Total de artículos", summary['total'])
         with col2:
-            st.metric("Fuentes únicas", filtered_df['source'].nunique() if not filtered_df.empty else 0)
+            st.metric("Fuentes únicas", len(summary['source_counts']))
         with col3:
-            st.metric("Secciones únicas", filtered_df['section'].nunique() if not filtered_df.empty else 0)
+            st.metric("Secciones únicas", len(summary['section_counts']))
 
-def display_charts(filtered_df: pd.DataFrame) -> None:
+def display_charts(filtered_df: pd.DataFrame, summary: Optional[Dict[str, Any]] = None) -> None:
     """Muestra los gráficos.
     
     Args:
         filtered_df: DataFrame con los datos filtrados
+        summary: Agregados ya calculados con summarize_data (opcional)
     """
     if not filtered_df.empty:
+        if summary is None:
+            summary = summarize_data(filtered_df)
         tab1, tab2 = st.tabs(["📊 Por fuente", "📈 Por sección"])
         
         with tab1:
-            fig = generate_source_chart(filtered_df)
+            fig = generate_source_chart(filtered_df, summary=summary)
             if fig:
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.warning("No hay datos para mostrar el gráfico por fuente")
         
         with tab2:
-            fig = generate_section_chart(filtered_df)
+            fig = generate_section_chart(filtered_df, summary=summary)
             if fig:
                 st.plotly_chart(fig, use_container_width=True)
             else:
@@ -308,11 +609,12 @@ def display_table(filtered_df: pd.DataFrame) -> None:
     else:
         st.warning("No hay datos que coincidan con los filtros seleccionados")
 
-def export_data(filtered_df: pd.DataFrame) -> None:
+def export_data(filtered_df: pd.DataFrame, summary: Optional[Dict[str, Any]] = None) -> None:
     """Muestra los controles de exportación.
     
     Args:
         filtered_df: DataFrame con los datos a exportar
+        summary: Agregados ya calculados con summarize_data (opcional)
     """
     if filtered_df.empty:
         st.sidebar.warning("No hay datos para exportar")
@@ -321,78 +623,96 @@ def export_data(filtered_df: pd.DataFrame) -> None:
     st.sidebar.markdown("---")
     st.sidebar.subheader("Exportar datos")
     
-    # Exportar a CSV
+    # Exportar a CSV (en memoria, sin pasar por un archivo temporal)
     if st.sidebar.button("Exportar a CSV"):
-        tmp_file_path = None
         try:
-            # Create a temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp_file:
-                tmp_file_path = tmp_file.name
-                filtered_df.to_csv(tmp_file_path, index=False)
-            
-            # Create download button
-            with open(tmp_file_path, 'rb') as f:
-                st.sidebar.download_button(
-                    label="Descargar CSV",
-                    data=f,
-                    file_name="articulos_discover.csv",
-                    mime="text/csv"
-                )
+            buffer = BytesIO()
+            filtered_df.to_csv(buffer, index=False)
+            st.sidebar.download_button(
+                label="Descargar CSV",
+                data=buffer.getvalue(),
+                file_name="articulos_discover.csv",
+                mime="text/csv"
+            )
             st.success("Datos exportados a CSV exitosamente")
         except Exception as e:
             error_msg = f"Error al exportar a CSV: {e}"
             st.error(error_msg)
             logger.error(error_msg, exc_info=True)
-        finally:
-            # Clean up the temporary file if it was created
-            if tmp_file_path and os.path.exists(tmp_file_path):
-                try:
-                    os.unlink(tmp_file_path)
-                except Exception as e:
-                    logger.error(f"Error al limpiar archivo temporal: {e}", exc_info=True)
 
     # Exportar a Excel
     if st.sidebar.button("Exportar a Excel"):
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-                filtered_df.to_excel(tmp_file.name, index=False, engine='openpyxl')
-                with open(tmp_file.name, 'rb') as f:
-                    st.sidebar.download_button(
-                        label="Descargar Excel",
-                        data=f,
-                        file_name="articulos_discover.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                    )
+            buffer = BytesIO()
+            filtered_df.to_excel(buffer, index=False, engine='xlsxwriter')
+            st.sidebar.download_button(
+                label="Descargar Excel",
+                data=buffer.getvalue(),
+                file_name="articulos_discover.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
             st.success("Datos exportados a Excel exitosamente")
         except Exception as e:
             st.error(f"Error al exportar a Excel: {e}")
             logger.error(f"Error al exportar a Excel: {e}")
-        finally:
-            if os.path.exists(tmp_file.name):
-                os.unlink(tmp_file.name)
 
-    # Exportar a PDF
+    # Exportar a PDF (generado en memoria)
     if st.sidebar.button("Generar Informe PDF"):
-        tmp_file = None
         try:
-            tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-            tmp_file.close()  # Close the file so generate_pdf_report can write to it
-            generate_pdf_report(filtered_df, tmp_file.name)
-            
-            with open(tmp_file.name, 'rb') as f:
-                st.sidebar.download_button(
-                    label="Descargar PDF",
-                    data=f,
-                    file_name="informe_articulos.pdf",
-                    mime="application/pdf"
-                )
+            pdf_bytes = generate_pdf_bytes(filtered_df, summary=summary)
+            st.sidebar.download_button(
+                label="Descargar PDF",
+                data=pdf_bytes,
+                file_name="informe_articulos.pdf",
+                mime="application/pdf"
+            )
             st.success("Informe PDF generado exitosamente")
         except Exception as e:
             st.error(f"Error al generar el PDF: {e}")
             logger.error(f"Error al generar el PDF: {e}", exc_info=True)
-        finally:
-            if tmp_file and os.path.exists(tmp_file.name):
-                os.unlink(tmp_file.name)
+
+def render_dashboard(df: pd.DataFrame, filter_options: Optional[Dict[str, Any]] = None) -> None:
+    """Muestra los filtros y todo lo que depende de ellos.
+    
+    Args:
+        df: DataFrame con todos los artículos cargados
+        filter_options: Opciones de los filtros (opcional, ver get_filter_options)
+    """
+    # Configurar la barra lateral con manejo de errores
+    try:
+        filters = setup_sidebar_filters(df, filter_options) if not df.empty else {}
+    except Exception as e:
+        st.error(f"Error al configurar los filtros: {str(e)}")
+        logger.error(f"Error en setup_sidebar_filters: {str(e)}", exc_info=True)
+        filters = {}
+    
+    # Aplicar filtros
+    filtered_df = apply_filters(df, filters) if not df.empty else pd.DataFrame()
+    
+    # Agregados compartidos por métricas, gráficos e informe PDF
+    summary = summarize_data(filtered_df)
+    
+    # Mostrar métricas
+    display_metrics(filtered_df, summary)
+    
+    # Mostrar gráficos
+    display_charts(filtered_df, summary)
+    
+    # Mostrar tabla
+    display_table(filtered_df)
+    
+    # Mostrar controles de exportación
+    export_data(filtered_df, summary)
+
+@st.fragment
+def _dashboard_fragment(df: pd.DataFrame, filter_options: Optional[Dict[str, Any]] = None) -> None:
+    """Ejecuta render_dashboard como fragmento de Streamlit.
+    
+    Al cambiar un filtro o pulsar un botón de exportación solo se vuelve a
+    ejecutar este fragmento con el DataFrame de la última ejecución completa,
+    sin repetir la configuración de la página ni la carga de datos.
+    """
+    render_dashboard(df, filter_options)
 
 def main() -> None:
     """Función principal de la aplicación Streamlit."""
@@ -409,39 +729,17 @@ def main() -> None:
         st.title("📊 Monitor de Contenidos en Discover")
         st.markdown("---")
         
-        # Inicializar el estado de la sesión para los datos
-        if 'df' not in st.session_state:
-            st.session_state.df = pd.DataFrame()
-        
-        # Cargar datos iniciales si no hay datos en la sesión
-        if st.session_state.df.empty:
-            st.session_state.df = load_data()
-        
-        # Obtener los datos
+        # Obtener los datos (cacheados mientras el CSV no cambie)
         df = get_data()
+        filter_options = get_filter_options(get_data_mtime(), df) if not df.empty else None
         
-        # Configurar la barra lateral con manejo de errores
-        try:
-            filters = setup_sidebar_filters(df) if not df.empty else {}
-        except Exception as e:
-            st.error(f"Error al configurar los filtros: {str(e)}")
-            logger.error(f"Error en setup_sidebar_filters: {str(e)}", exc_info=True)
-            filters = {}
-        
-        # Aplicar filtros
-        filtered_df = apply_filters(df, filters) if not df.empty else pd.DataFrame()
-        
-        # Mostrar métricas
-        display_metrics(filtered_df)
-        
-        # Mostrar gráficos
-        display_charts(filtered_df)
-        
-        # Mostrar tabla
-        display_table(filtered_df)
-        
-        # Mostrar controles de exportación
-        export_data(filtered_df)
+        # Filtros, métricas, gráficos, tabla y exportación. Fuera de una sesión
+        # de Streamlit (p. ej. con `python app.py`) st.fragment no ejecuta la
+        # función, así que en ese caso se llama directamente
+        if get_script_run_ctx(suppress_warning=True) is not None:
+            _dashboard_fragment(df, filter_options)
+        else:
+            render_dashboard(df, filter_options)
         
         # Mostrar mensaje si no hay datos
         if df.empty:
@@ -2,33 +2,54 @@
 """
 Script para verificar las rutas de los sitemaps de los sitios web.
 """
+import io
 import json
+import logging
 import os
+import queue
+import re
+import socket
+import sys
+import threading
 import time
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import xml.etree.ElementTree as ET
-from urllib.parse import urljoin, urlparse
+from datetime import timedelta
+from urllib.parse import urljoin, urlsplit
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
-import time
+
+from discover_monitor.config import SiteSpec
+from discover_monitor.http_cache import create_cached_session, declared_size
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+logger = logging.getLogger(__name__)
 
 # Lista de sitios web para verificar con sus sitemaps conocidos
-SITES = [
-    {"url": "https://theobjective.com", "sitemap": "https://theobjective.com/sitemap_index.xml"},
-    {"url": "https://www.elmundo.es", "sitemap": "https://www.elmundo.es/mapas/sitemap-index.xml"},
-    {"url": "https://www.elconfidencial.com", "sitemap": "https://www.elconfidencial.com/sitemap_index.xml"},
-    {"url": "https://www.infobae.com/espana/", "sitemap": "https://www.infobae.com/espana/sitemap.xml"},
-    {"url": "https://www.libertaddigital.com", "sitemap": "https://www.libertaddigital.com/sitemap_index.xml"},
-    {"url": "https://www.vozpopuli.com", "sitemap": "https://www.vozpopuli.com/sitemap_index.xml"},
-    {"url": "https://www.publico.es", "sitemap": "https://www.publico.es/sitemap_index.xml"},
-    {"url": "https://okdiario.com", "sitemap": "https://okdiario.com/sitemap_index.xml"},
-    {"url": "https://www.eldiario.es", "sitemap": "https://www.eldiario.es/sitemap_index.xml"},
-    {"url": "https://www.larazon.es", "sitemap": "https://www.larazon.es/sitemap_index.xml"},
-    {"url": "https://www.20minutos.es", "sitemap": "https://www.20minutos.es/sitemap_index.xml"},
-    {"url": "https://www.abc.es", "sitemap": "https://www.abc.es/sitemap.xml"},
-    {"url": "https://www.elespanol.com", "sitemap": "https://www.elespanol.com/sitemap_index.xml"},
-    {"url": "https://www.elperiodico.com", "sitemap": "https://www.elperiodico.com/sitemap_index.xml"}
-]
+SITES = (
+    SiteSpec("The Objective", "https://theobjective.com", "https://theobjective.com/sitemap_index.xml"),
+    SiteSpec("El Mundo", "https://www.elmundo.es", "https://www.elmundo.es/mapas/sitemap-index.xml"),
+    SiteSpec("El Confidencial", "https://www.elconfidencial.com", "https://www.elconfidencial.com/sitemap_index.xml"),
+    SiteSpec("Infobae", "https://www.infobae.com/espana/", "https://www.infobae.com/espana/sitemap.xml"),
+    SiteSpec("Libertad Digital", "https://www.libertaddigital.com", "https://www.libertaddigital.com/sitemap_index.xml"),
+    SiteSpec("Vozpópuli", "https://www.vozpopuli.com", "https://www.vozpopuli.com/sitemap_index.xml"),
+    SiteSpec("Público", "https://www.publico.es", "https://www.publico.es/sitemap_index.xml"),
+    SiteSpec("OKDiario", "https://okdiario.com", "https://okdiario.com/sitemap_index.xml"),
+    SiteSpec("eldiario.es", "https://www.eldiario.es", "https://www.eldiario.es/sitemap_index.xml"),
+    SiteSpec("La Razón", "https://www.larazon.es", "https://www.larazon.es/sitemap_index.xml"),
+    SiteSpec("20 Minutos", "https://www.20minutos.es", "https://www.20minutos.es/sitemap_index.xml"),
+    SiteSpec("ABC", "https://www.abc.es", "https://www.abc.es/sitemap.xml"),
+    SiteSpec("El Español", "https://www.elespanol.com", "https://www.elespanol.com/sitemap_index.xml"),
+    SiteSpec("El Periódico", "https://www.elperiodico.com", "https://www.elperiodico.com/sitemap_index.xml")
+)
 
 # Headers para simular un navegador
 HEADERS = {
@@ -60,17 +81,132 @@ SITEMAP_PATHS = [
     "/mapas/sitemap-index.xml"  # Usado por El Mundo
 ]
 
+# Aciertos acumulados por ruta de SITEMAP_PATHS, persistidos entre ejecuciones
+PATH_STATS_FILE = os.path.join('data', 'sitemap_path_stats.json')
+_PATH_STATS = {}
+_path_stats_lock = threading.Lock()
+
+def load_path_stats():
+    """Carga los aciertos por ruta guardados en ejecuciones anteriores"""
+    try:
+        with open(PATH_STATS_FILE, 'rb') as f:
+            data = f.read()
+        stats = orjson.loads(data) if orjson is not None else json.loads(data)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(stats, dict):
+        return {}
+    return {path: count for path, count in stats.items()
+            if path in SITEMAP_PATHS and isinstance(count, int)}
+
+def save_path_stats(stats):
+    """Guarda los aciertos por ruta para ordenar los sondeos de la próxima ejecución"""
+    try:
+        os.makedirs(os.path.dirname(PATH_STATS_FILE), exist_ok=True)
+        _write_bytes(PATH_STATS_FILE, _json_bytes(stats))
+    except OSError as e:
+        logger.warning(f"No se pudieron guardar las estadísticas de rutas: {str(e)}")
+
+def ordered_sitemap_paths():
+    """Devuelve SITEMAP_PATHS ordenadas por aciertos, conservando la prioridad en empates"""
+    return sorted(SITEMAP_PATHS, key=lambda path: -_PATH_STATS.get(path, 0))
+
+def record_path_hit(base_url, sitemap_url):
+    """Suma un acierto si el sitemap está en una de las rutas de SITEMAP_PATHS del sitio"""
+    origin = _site_origin(base_url)
+    if not sitemap_url.startswith(origin):
+        return
+    path = sitemap_url[len(origin):]
+    if path in SITEMAP_PATHS:
+        with _path_stats_lock:
+            _PATH_STATS[path] = _PATH_STATS.get(path, 0) + 1
+
+# Tamaño del pool de conexiones: cubre los hilos de sondeo de rutas de un sitio
+# más la descarga de robots.txt, de modo que ninguna conexión keep-alive se
+# descarte mientras todos los sitios se procesan a la vez
+POOL_SIZE = 32
+
+# Caché HTTP en disco entre ejecuciones (solo si requests-cache está instalado)
+HTTP_CACHE_FILE = os.path.join('data', 'http_cache')
+HTTP_CACHE_EXPIRE = timedelta(days=1)
+# Respuestas completas (200) más grandes no se guardan en la caché
+HTTP_CACHE_MAX_BYTES = 64 * 1024
+
+def is_cacheable_response(response):
+    """Indica si una respuesta debe guardarse en la caché HTTP
+    
+    Los sondeos piden solo el comienzo del sitemap (206). Si el servidor ignora
+    el Range y devuelve el documento completo con un 200, solo se guarda cuando
+    declara un tamaño pequeño (como robots.txt); si no, la caché descargaría
+    todo el cuerpo que el sondeo evita leer.
+    """
+    size = declared_size(response)
+    if response.status_code == 206:
+        return size is None or size <= HTTP_CACHE_MAX_BYTES
+    return size is not None and size <= HTTP_CACHE_MAX_BYTES
+
+def create_session():
+    """Crea la sesión HTTP compartida con un pool de conexiones ampliado y reintentos
+    
+    Si requests-cache está disponible, robots.txt y los sondeos de sitemaps se
+    guardan en una caché SQLite (ver is_cacheable_response), de modo que una
+    nueva ejecución en el mismo día no vuelve a descargarlos y las siguientes
+    usan peticiones condicionales.
+    """
+    session = create_cached_session(
+        HTTP_CACHE_FILE,
+        HTTP_CACHE_EXPIRE,
+        is_cacheable_response,
+        allowable_methods=('GET', 'HEAD'),
+        allowable_codes=(200, 206),
+        match_headers=['Range'],
+    )
+    session.headers.update(HEADERS)
+    session.max_redirects = 3
+    
+    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+# Separación mínima (en segundos) entre peticiones consecutivas al mismo host
+HOST_MIN_INTERVAL = 1.0
+
+# Instante reservado para la última petición a cada host
+_host_next_slot = {}
+_host_lock = threading.Lock()
+
+def throttle(url, min_interval=HOST_MIN_INTERVAL):
+    """Espera lo necesario para no superar el ritmo permitido contra el host de la URL
+    
+    Cada llamada reserva su turno bajo el lock y duerme fuera de él, de modo que
+    los hilos que consultan hosts distintos nunca se bloquean entre sí.
+    """
+    host = urlsplit(url).netloc
+    with _host_lock:
+        now = time.monotonic()
+        slot = max(now, _host_next_slot.get(host, now - min_interval) + min_interval)
+        _host_next_slot[host] = slot
+    if slot > now:
+        time.sleep(slot - now)
+
+# Directiva Sitemap de robots.txt (sin distinguir mayúsculas), sobre bytes
+_SITEMAP_RE = re.compile(rb'(?im)^[ \t]*sitemap[ \t]*:[ \t]*(\S+)')
+
 def get_robots_txt(session, base_url):
-    """Obtiene el contenido de robots.txt"""
+    """Obtiene el contenido de robots.txt en bytes"""
     try:
         robots_url = urljoin(base_url, '/robots.txt')
+        throttle(robots_url)
         response = session.get(robots_url, timeout=10, allow_redirects=True)
-        response.raise_for_status()
+        if response.status_code != 200:
+            return None
         if 'text/plain' in response.headers.get('content-type', '').lower():
-            return response.text
+            return response.content
         return None
-    except Exception as e:
-        print(f"  Error al obtener robots.txt para {base_url}: {str(e)}")
+    except (requests.RequestException, socket.timeout) as e:
+        logger.warning(f"  Error al obtener robots.txt para {base_url}: {str(e)}")
         return None
 
 def find_sitemap_in_robots(robots_content):
@@ -78,104 +214,202 @@ def find_sitemap_in_robots(robots_content):
     if not robots_content:
         return None
     
-    for line in robots_content.split('\n'):
-        line = line.strip()
-        if line.lower().startswith('sitemap:'):
-            parts = line.split(':', 1)
-            if len(parts) > 1:
-                return parts[1].strip()
-    return None
+    if isinstance(robots_content, str):
+        robots_content = robots_content.encode('utf-8')
+    
+    match = _SITEMAP_RE.search(robots_content)
+    return match.group(1).decode('utf-8', 'ignore') if match else None
+
+# Tiempo de validez (en segundos) del sitemap extraído de robots.txt
+ROBOTS_CACHE_TTL = 3600
+
+# Caché por origen: origen -> (instante de la consulta, sitemap encontrado o None).
+# Solo se guarda la URL extraída, nunca el contenido completo de robots.txt
+_ROBOTS_CACHE = {}
 
-def check_sitemap_url(session, base_url, path):
+@lru_cache(maxsize=128)
+def _site_origin(base_url):
+    """Normaliza una URL a su origen (esquema + host), sin barra final"""
+    parsed = urlsplit(base_url)
+    return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}"
+
+def get_sitemap_from_robots(session, base_url):
+    """Obtiene el sitemap declarado en robots.txt, reutilizando consultas recientes"""
+    origin = _site_origin(base_url)
+    cached = _ROBOTS_CACHE.get(origin)
+    if cached and time.monotonic() - cached[0] < ROBOTS_CACHE_TTL:
+        return cached[1]
+    
+    robots_content = get_robots_txt(session, base_url)
+    if robots_content is None:
+        # No se cachean los fallos para que un reintento vuelva a consultarlo
+        return None
+    
+    sitemap_url = find_sitemap_in_robots(robots_content)
+    _ROBOTS_CACHE[origin] = (time.monotonic(), sitemap_url)
+    return sitemap_url
+
+# Bytes que se descargan de cada candidato para identificar el documento
+SNIFF_BYTES = 4096
+
+# Elementos raíz válidos para un sitemap (índice, lista de URLs o feed RSS)
+SITEMAP_ROOT_TAGS = ('sitemapindex', 'urlset', 'rss')
+
+# Filtro previo sobre bytes: sin alguna de estas etiquetas no hace falta analizar
+_SITEMAP_TAG_RE = re.compile(rb'<(?:[\w.-]+:)?(?:sitemapindex|urlset|rss)[\s>/]', re.IGNORECASE)
+
+def is_sitemap_xml(data):
+    """Indica si el comienzo de un documento corresponde a un sitemap XML
+    
+    Solo se analiza hasta el primer elemento raíz, por lo que basta con los
+    primeros bytes del documento aunque esté truncado.
+    """
+    # Las páginas HTML (p. ej. errores 404 servidos con 200) se descartan
+    # con una única búsqueda, sin crear el parser XML
+    if not _SITEMAP_TAG_RE.search(data):
+        return False
+    try:
+        for _, elem in ET.iterparse(io.BytesIO(data.lstrip()), events=('start',)):
+            return elem.tag.rsplit('}', 1)[-1] in SITEMAP_ROOT_TAGS
+    except ET.ParseError:
+        pass
+    return False
+
+def check_sitemap_url(session, sitemap_url):
     """Verifica si una URL de sitemap es accesible"""
-    sitemap_url = urljoin(base_url, path)
+    if not sitemap_url:
+        return None
+    
     try:
-        # Primero intentamos con HEAD para ahorrar ancho de banda
+        throttle(sitemap_url)
+        # Una única petición GET que solo pide el comienzo del documento
+        response = session.get(
+            sitemap_url,
+            timeout=8,
+            allow_redirects=True,
+            stream=True,
+            headers={'Range': f'bytes=0-{SNIFF_BYTES - 1}'}
+        )
         try:
-            response = session.head(sitemap_url, timeout=5, allow_redirects=True)
-            if response.status_code != 200:
+            if response.status_code not in (200, 206):
                 return None
-                
-            # Verificar que la respuesta parece ser un XML
-            content_type = response.headers.get('content-type', '').lower()
-            if 'xml' in content_type or 'text/xml' in content_type:
-                return sitemap_url
-        except:
-            pass
-        
-        # Si HEAD falla o no está claro, intentamos con GET
-        try:
-            response = session.get(sitemap_url, timeout=10, allow_redirects=True, stream=True)
-            if response.status_code == 200:
-                # Verificar los primeros bytes para ver si es XML
-                chunk = response.raw.read(100).decode('utf-8', 'ignore').lower()
-                if '<?xml' in chunk or '<sitemapindex' in chunk or '<urlset' in chunk:
-                    return sitemap_url
-        except:
-            pass
             
+            # Verificar los primeros bytes para ver si es XML
+            if is_sitemap_xml(response.raw.read(SNIFF_BYTES, decode_content=True)):
+                return sitemap_url
+        finally:
+            response.close()
     except Exception as e:
-        print(f"  Error al verificar {sitemap_url}: {str(e)}")
+        logger.debug(f"  Error al verificar {sitemap_url}: {str(e)}")
     return None
 
 def find_sitemap(session, site_info):
     """Busca el sitemap de un sitio web"""
-    base_url = site_info['url']
-    known_sitemap = site_info.get('sitemap')
+    base_url = site_info.url
+    known_sitemap = site_info.sitemap
     
-    print(f"\nBuscando sitemap para: {base_url}")
+    logger.info(f"Buscando sitemap para: {base_url}")
     
     # 0. Verificar si el sitemap conocido funciona
     if known_sitemap:
-        if check_sitemap_url(session, base_url, known_sitemap):
-            print(f"  Sitemap conocido funciona: {known_sitemap}")
+        if check_sitemap_url(session, known_sitemap):
+            logger.info(f"  Sitemap conocido funciona: {known_sitemap}")
+            record_path_hit(base_url, known_sitemap)
             return known_sitemap
-        print(f"  El sitemap conocido no funciona: {known_sitemap}")
+        logger.info(f"  El sitemap conocido no funciona: {known_sitemap}")
     
     # 1. Buscar en robots.txt
-    print("  Buscando en robots.txt...")
-    robots_content = get_robots_txt(session, base_url)
-    if robots_content:
-        sitemap_url = find_sitemap_in_robots(robots_content)
-        if sitemap_url:
-            print(f"  Encontrado en robots.txt: {sitemap_url}")
-            return sitemap_url
+    logger.info("  Buscando en robots.txt...")
+    sitemap_url = get_sitemap_from_robots(session, base_url)
+    if sitemap_url:
+        logger.info(f"  Encontrado en robots.txt: {sitemap_url}")
+        record_path_hit(base_url, sitemap_url)
+        return sitemap_url
     
     # 2. Probar rutas comunes de sitemaps
-    print("  Probando rutas comunes de sitemaps...")
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = []
-        for path in SITEMAP_PATHS:
-            futures.append(executor.submit(check_sitemap_url, session, base_url, path))
+    logger.info("  Probando rutas comunes de sitemaps...")
+    # Todas las rutas son absolutas, así que basta con concatenarlas al origen;
+    # las que más han acertado en ejecuciones anteriores se prueban primero
+    origin = _site_origin(base_url)
+    candidates = [origin + path for path in ordered_sitemap_paths()]
+    
+    executor = ThreadPoolExecutor(max_workers=10)
+    try:
+        futures = [
+            executor.submit(check_sitemap_url, session, sitemap_url)
+            for sitemap_url in candidates
+        ]
         
         for future in as_completed(futures):
             result = future.result()
             if result:
-                print(f"  Sitemap encontrado: {result}")
+                logger.info(f"  Sitemap encontrado: {result}")
+                record_path_hit(base_url, result)
                 return result
+    finally:
+        # Con el primer acierto se cancelan las rutas que aún no se han
+        # probado y no se espera a las peticiones que ya están en curso
+        executor.shutdown(wait=False, cancel_futures=True)
     
     # 3. Si no se encuentra, devolver la ruta por defecto o la conocida
     default_sitemap = known_sitemap or urljoin(base_url, "/sitemap.xml")
-    print(f"  Usando sitemap por defecto: {default_sitemap}")
+    logger.info(f"  Usando sitemap por defecto: {default_sitemap}")
     return default_sitemap
 
+_WWW_RE = re.compile(r'^www\.')
+
+def site_name_from_url(url):
+    """Deriva un nombre legible a partir del dominio de la URL"""
+    domain = _WWW_RE.sub('', urlsplit(url).netloc)
+    return domain.split('.')[0].capitalize()
+
+def process_site(session, site_info):
+    """Busca el sitemap de un sitio y construye su entrada de resultados"""
+    site_url = site_info.url
+    
+    # Intentar encontrar el sitemap
+    sitemap = find_sitemap(session, site_info)
+    
+    return {
+        'url': site_url.rstrip('/'),
+        'sitemap': sitemap,
+        'name': site_info.name or site_name_from_url(site_url)
+    }
+
+def _json_bytes(data):
+    """Serializa datos a JSON indentado, codificado en UTF-8"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _write_bytes(path, data):
+    """Escribe bytes en un fichero sin pasar por la capa de texto con búfer"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
 def save_results(results):
     """Guarda los resultados en un archivo"""
     try:
         # Crear directorio data si no existe
         os.makedirs('data', exist_ok=True)
         
-        # Guardar resultados en formato de texto
+        # Ambos formatos se generan en memoria y se escriben de una vez
         txt_path = os.path.join('data', 'sitemap_results.txt')
-        with open(txt_path, 'w', encoding='utf-8') as f:
-            f.write("=== Resultados de búsqueda de sitemaps ===\n\n")
-            for result in results:
-                f.write(f"{result['url']}: {result['sitemap']}\n")
+        json_path = os.path.join('data', 'sitemaps.json')
+        txt_data = "=== Resultados de búsqueda de sitemaps ===\n\n" + "".join(
+            f"{result['url']}: {result['sitemap']}\n" for result in results
+        )
+        
+        # Guardar resultados en formato de texto
+        _write_bytes(txt_path, txt_data.encode('utf-8'))
         
         # Guardar resultados en formato JSON para uso posterior
-        json_path = os.path.join('data', 'sitemaps.json')
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        _write_bytes(json_path, _json_bytes(results))
         
         print(f"\nLos resultados se han guardado en {txt_path} y {json_path}")
         return True
@@ -183,45 +417,69 @@ def save_results(results):
         print(f"Error al guardar los resultados: {str(e)}")
         return False
 
-def main():
-    """Función principal"""
-    session = requests.Session()
-    session.headers.update(HEADERS)
-    session.max_redirects = 3
+def _start_log_listener():
+    """Encola los registros de los hilos de trabajo y los emite desde un único hilo
     
-    results = []
+    Returns:
+        tuple: El QueueListener en marcha y el QueueHandler añadido al logger.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = QueueListener(log_queue, stream_handler)
     
+    queue_handler = QueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    logger.setLevel(logging.INFO)
+    listener.start()
+    return listener, queue_handler
+
+def _stop_log_listener(listener, queue_handler):
+    """Vacía la cola de registros y retira el QueueHandler del logger"""
+    logger.removeHandler(queue_handler)
+    listener.stop()
+
+# Sitio propio, marcado con is_own_site en la configuración generada
+OWN_SITE_URL = 'https://theobjective.com'
+
+def build_config_snippet(results):
+    """Genera el bloque WEBSITES de config.py a partir de los resultados"""
+    lines = ["WEBSITES = ("]
+    lines.extend(
+        f"    SiteSpec(name={r['name']!r}, url={r['url']!r}, sitemap={r['sitemap']!r}"
+        f"{', is_own_site=True' if r['url'] == OWN_SITE_URL else ''}),"
+        for r in results
+    )
+    lines.append(")")
+    return "\n".join(lines) + "\n"
+
+def _run(session):
+    """Procesa todos los sitios y muestra y guarda los resultados"""
     print("=== Verificando sitemaps ===")
+    _PATH_STATS.clear()
+    _PATH_STATS.update(load_path_stats())
     
-    # Usar una barra de progreso manual para mejor control
-    with tqdm(total=len(SITES), desc="Procesando sitios") as pbar:
-        for site_info in SITES:
+    # Cada sitio es un servidor distinto, así que se procesan todos a la vez
+    # sobre la misma sesión; el resultado conserva el orden de SITES
+    site_results = [None] * len(SITES)
+    # La barra se redibuja como mucho dos veces por segundo
+    with tqdm(total=len(SITES), desc="Procesando sitios", mininterval=0.5, leave=False) as pbar, \
+            ThreadPoolExecutor(max_workers=len(SITES)) as executor:
+        futures = {
+            executor.submit(process_site, session, site_info): index
+            for index, site_info in enumerate(SITES)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
             try:
-                site_url = site_info['url']
-                pbar.set_description(f"Procesando {site_url}")
-                
-                # Intentar encontrar el sitemap
-                sitemap = find_sitemap(session, site_info)
-                
-                # Extraer nombre del sitio
-                domain = urlparse(site_url).netloc
-                name = domain.replace('www.', '').split('.')[0].capitalize()
-                
-                # Agregar a resultados
-                results.append({
-                    'url': site_url.rstrip('/'),
-                    'sitemap': sitemap,
-                    'name': name
-                })
-                
-                # Pequeña pausa para no sobrecargar
-                time.sleep(1)
-                
+                site_results[index] = future.result()
             except Exception as e:
-                print(f"\nError procesando {site_info.get('url')}: {str(e)}")
+                logger.error(f"Error procesando {SITES[index].url}: {str(e)}")
             finally:
                 pbar.update(1)
     
+    results = [result for result in site_results if result is not None]
+    
     # Mostrar resumen
     print("\n=== Resumen ===")
     success = sum(1 for r in results if r['sitemap'])
@@ -244,16 +502,19 @@ def main():
     
     # Generar configuración para config.py
     print("\n=== Configuración para config.py ===")
-    print("WEBSITES = [")
-    for result in results:
-        site_url = result['url']
-        is_own = site_url == 'https://theobjective.com'
-        own_site_line = ",\n        'is_own_site': True" if is_own else ""
-        print(f"    {{'name': '{result['name']}', 'url': '{site_url}', 'sitemap': '{result['sitemap']}'{own_site_line}}},")
-    print("]")
+    sys.stdout.write(build_config_snippet(results))
     
     # Guardar resultados
     save_results(results)
+    save_path_stats(_PATH_STATS)
+
+def main():
+    """Función principal"""
+    listener, queue_handler = _start_log_listener()
+    try:
+        _run(create_session())
+    finally:
+        _stop_log_listener(listener, queue_handler)
 
 if __name__ == "__main__":
     main()
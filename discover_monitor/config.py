@@ -1,4 +1,37 @@
+from dataclasses import dataclass
 from datetime import datetime
+from functools import cache
+from typing import Optional
+
+@dataclass(frozen=True, slots=True)
+class SiteSpec:
+    """A website to monitor and where to find its sitemap.
+    
+    Attributes:
+        name (str): Display name used as the article source.
+        url (str): Base URL of the site.
+        sitemap (str, optional): Sitemap URL, if known.
+        is_own_site (bool): Whether the site is our own property.
+        dynamic_sitemap (bool): Whether the sitemap URL changes over time.
+    """
+    name: str
+    url: str
+    sitemap: Optional[str] = None
+    is_own_site: bool = False
+    dynamic_sitemap: bool = False
+
+@cache
+def get_elpais_sitemap_for(year, month):
+    """Build the El País sitemap URL for a given month.
+    
+    Args:
+        year (int): Four-digit year.
+        month (int): Month number (1-12).
+    
+    Returns:
+        str: Formatted sitemap URL for that month and year.
+    """
+    return f"https://elpais.com/sitemaps/{year}/{month:02d}/sitemap.xml"
 
 def get_elpais_sitemap():
     """Generate the El País sitemap URL for the current month and year.
@@ -7,107 +40,97 @@ def get_elpais_sitemap():
         str: Formatted sitemap URL for the current month and year.
     """
     now = datetime.now()
-    return f"https://elpais.com/sitemaps/{now.year}/{now.month:02d}/sitemap.xml"
+    return get_elpais_sitemap_for(now.year, now.month)
 
 # List of websites to monitor with verified sitemaps
-WEBSITES = [
-    {
-        'name': 'The Objective',
-        'url': 'https://theobjective.com',
-        'sitemap': 'https://theobjective.com/sitemap_index.xml',
-        'is_own_site': True
-    },
-    {
-        'name': 'El Mundo',
-        'url': 'https://www.elmundo.es',
-        'sitemap': 'https://www.elmundo.es/sitemaps/sitemap.xml',
-        'is_own_site': False
-    },
-    {
-        'name': 'El Confidencial',
-        'url': 'https://www.elconfidencial.com',
-        'sitemap': 'https://www.elconfidencial.com/sitemap_index.xml',
-        'is_own_site': False
-    },
-    {
-        'name': 'Infobae',
-        'url': 'https://www.infobae.com/espana',
-        'sitemap': 'https://www.infobae.com/arc/outboundfeeds/sitemap2/',
-        'is_own_site': False
-    },
-    {
-        'name': 'Libertad Digital',
-        'url': 'https://www.libertaddigital.com',
-        'sitemap': 'https://www.libertaddigital.com/sitemap.xml',
-        'is_own_site': False
-    },
-    {
-        'name': 'Vozpópuli',
-        'url': 'https://www.vozpopuli.com',
-        'sitemap': 'https://www.vozpopuli.com/sitemaps/sitemap-news2.xml',
-        'is_own_site': False
-    },
-    {
-        'name': 'Público',
-        'url': 'https://www.publico.es',
-        'sitemap': 'https://www.publico.es/sitemap-index.xml',
-        'is_own_site': False
-    },
-    {
-        'name': 'OKDiario',
-        'url': 'https://okdiario.com',
-        'sitemap': 'https://okdiario.com/sitemap_index.xml',
-        'is_own_site': False
-    },
-    {
-        'name': 'El País',
-        'url': 'https://elpais.com',
-        'sitemap': get_elpais_sitemap(),
-        'is_own_site': False,
-        'dynamic_sitemap': True
-    },
-    {
-        'name': 'eldiario.es',
-        'url': 'https://www.eldiario.es',
-        'sitemap': 'https://www.eldiario.es/sitemap_index_25b87.xml',
-        'is_own_site': False
-    },
-    {
-        'name': 'La Razón',
-        'url': 'https://www.larazon.es',
-        'sitemap': 'https://www.larazon.es/sitemaps/news.xml',
-        'is_own_site': False
-    },
-    {
-        'name': '20 Minutos',
-        'url': 'https://www.20minutos.es',
-        'sitemap': 'https://www.20minutos.es/sitemap-index.xml',
-        'is_own_site': False
-    },
-    {
-        'name': 'ABC',
-        'url': 'https://www.abc.es',
-        'sitemap': 'https://www.abc.es/sitemap.xml',
-        'is_own_site': False
-    },
-    {
-        'name': 'El Español',
-        'url': 'https://www.elespanol.com',
-        'sitemap': 'https://www.elespanol.com/sitemap_index.xml',
-        'is_own_site': False
-    },
-    {
-        'name': 'El Periódico',
-        'url': 'https://www.elperiodico.com',
-        'sitemap': 'https://www.elperiodico.com/es/google-news.xml',
-        'is_own_site': False
-    }
-]
+WEBSITES = (
+    SiteSpec(
+        name='The Objective',
+        url='https://theobjective.com',
+        sitemap='https://theobjective.com/sitemap_index.xml',
+        is_own_site=True
+    ),
+    SiteSpec(
+        name='El Mundo',
+        url='https://www.elmundo.es',
+        sitemap='https://www.elmundo.es/sitemaps/sitemap.xml'
+    ),
+    SiteSpec(
+        name='El Confidencial',
+        url='https://www.elconfidencial.com',
+        sitemap='https://www.elconfidencial.com/sitemap_index.xml'
+    ),
+    SiteSpec(
+        name='Infobae',
+        url='https://www.infobae.com/espana',
+        sitemap='https://www.infobae.com/arc/outboundfeeds/sitemap2/'
+    ),
+    SiteSpec(
+        name='Libertad Digital',
+        url='https://www.libertaddigital.com',
+        sitemap='https://www.libertaddigital.com/sitemap.xml'
+    ),
+    SiteSpec(
+        name='Vozpópuli',
+        url='https://www.vozpopuli.com',
+        sitemap='https://www.vozpopuli.com/sitemaps/sitemap-news2.xml'
+    ),
+    SiteSpec(
+        name='Público',
+        url='https://www.publico.es',
+        sitemap='https://www.publico.es/sitemap-index.xml'
+    ),
+    SiteSpec(
+        name='OKDiario',
+        url='https://okdiario.com',
+        sitemap='https://okdiario.com/sitemap_index.xml'
+    ),
+    SiteSpec(
+        name='El País',
+        url='https://elpais.com',
+        sitemap=get_elpais_sitemap(),
+        dynamic_sitemap=True
+    ),
+    SiteSpec(
+        name='eldiario.es',
+        url='https://www.eldiario.es',
+        sitemap='https://www.eldiario.es/sitemap_index_25b87.xml'
+    ),
+    SiteSpec(
+        name='La Razón',
+        url='https://www.larazon.es',
+        sitemap='https://www.larazon.es/sitemaps/news.xml'
+    ),
+    SiteSpec(
+        name='20 Minutos',
+        url='https://www.20minutos.es',
+        sitemap='https://www.20minutos.es/sitemap-index.xml'
+    ),
+    SiteSpec(
+        name='ABC',
+        url='https://www.abc.es',
+        sitemap='https://www.abc.es/sitemap.xml'
+    ),
+    SiteSpec(
+        name='El Español',
+        url='https://www.elespanol.com',
+        sitemap='https://www.elespanol.com/sitemap_index.xml'
+    ),
+    SiteSpec(
+        name='El Periódico',
+        url='https://www.elperiodico.com',
+        sitemap='https://www.elperiodico.com/es/google-news.xml'
+    )
+)
 
 # Google Search Console API settings
 GSC_CREDENTIALS_FILE = 'credentials.json'  # You'll need to create this file with your GSC credentials
 GSC_PROPERTY = 'sc-domain:theobjective.com'  # Your Search Console property
 
+# Scraper settings
+SCRAPER_MAX_WORKERS = 32  # Shared thread pool size; sitemap and article fetches are I/O bound
+MAX_SITEMAPS_PER_INDEX = 20  # Child sitemaps followed per sitemap index (None for no limit)
+
 # Data storage
 DATA_DIR = 'data'
 ARTICLES_FILE = f"{DATA_DIR}/articles.csv"
@@ -0,0 +1,53 @@
+"""
+Caché HTTP en disco compartida por el scraper y la verificación de sitemaps.
+
+requests-cache es opcional: sin él las sesiones se crean sin caché.
+"""
+from datetime import timedelta
+from typing import Callable, Optional
+
+import requests
+
+try:
+    import requests_cache
+except ImportError:  # requests-cache es opcional
+    requests_cache = None
+
+
+def declared_size(response) -> Optional[int]:
+    """Tamaño del cuerpo según Content-Length, o None si no se declara (o no es válido)."""
+    try:
+        return int(response.headers.get('content-length'))
+    except (TypeError, ValueError):
+        return None
+
+
+def create_cached_session(cache_file: str, expire_after: timedelta,
+                          filter_fn: Callable[[requests.Response], bool],
+                          **kwargs) -> requests.Session:
+    """Crea una sesión HTTP con caché SQLite en disco si requests-cache está disponible.
+
+    Las respuestas guardadas no se vuelven a descargar dentro de expire_after
+    y, pasado ese tiempo, se revalidan con peticiones condicionales.
+
+    Args:
+        cache_file: Ruta de la base de datos de la caché
+        expire_after: Tiempo de validez de las respuestas guardadas
+        filter_fn: Decide, solo con las cabeceras, si una respuesta se guarda.
+            requests-cache lee el cuerpo completo de lo que guarda, también en
+            las peticiones con stream=True, así que el filtro debe rechazar las
+            respuestas grandes o que no interesan antes de que se descarguen.
+        **kwargs: Otras opciones de CachedSession
+
+    Returns:
+        CachedSession, o requests.Session si requests-cache no está instalado
+    """
+    if requests_cache is None:
+        return requests.Session()
+    return requests_cache.CachedSession(
+        cache_file,
+        backend='sqlite',
+        expire_after=expire_after,
+        filter_fn=filter_fn,
+        **kwargs,
+    )
@@ -37,8 +37,8 @@ def main():
     print(f"Monitoring {len(WEBSITES)} websites")
     
     try:
-        monitor = DiscoverMonitor()
-        monitor.run()
+        with DiscoverMonitor() as monitor:
+            monitor.run()
         print("\nMonitoring complete. Check the data directory for results.")
     except KeyboardInterrupt:
         print("\nMonitoring stopped by user.")
@@ -1,24 +1,39 @@
+import io
 import os
+import csv
+import re
 import sys
 import json
 import time
+import threading
 import logging
 import pandas as pd
 import requests
-import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import deque
 from datetime import datetime, timedelta
+from functools import lru_cache, partial
+from itertools import chain
 from pathlib import Path
-from urllib.parse import urlparse, urljoin
-from bs4 import BeautifulSoup
+from types import MappingProxyType
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+from dateutil import parser as date_parser
+import lxml.html
+from lxml import etree
 from tqdm import tqdm
-from typing import List, Dict, Optional, Set, Tuple
-from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, List, Dict, Optional, Set, Tuple, Union
+from dataclasses import dataclass, fields
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
 
 # Asegurarse de que el directorio padre esté en el path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from discover_monitor.config import WEBSITES, DATA_DIR, ARTICLES_FILE, DISCOVER_DATA_FILE
+from discover_monitor.config import (
+    WEBSITES, SiteSpec, DATA_DIR, ARTICLES_FILE, DISCOVER_DATA_FILE,
+    SCRAPER_MAX_WORKERS, MAX_SITEMAPS_PER_INDEX
+)
+from discover_monitor.http_cache import create_cached_session, declared_size
 
 # Asegurarse de que el directorio de datos exista
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -41,12 +56,48 @@ SITEMAP_NS = {
     'news': 'http://www.google.com/schemas/sitemap-news/0.9',
     'image': 'http://www.google.com/schemas/sitemap-image/1.1'
 }
-MAX_WORKERS = 5  # Número máximo de workers para procesamiento paralelo
+MAX_WORKERS = SCRAPER_MAX_WORKERS  # Número máximo de workers para procesamiento paralelo
 REQUEST_TIMEOUT = 15  # Segundos
 
-@dataclass
+# Headers para que las peticiones de artículos parezcan de un navegador real
+ARTICLE_REQUEST_HEADERS = MappingProxyType({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'es-ES,es;q=0.8,en-US;q=0.5,en;q=0.3',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+})
+
+# Atributos de las etiquetas con la fecha de publicación, por orden de preferencia
+DATE_SELECTORS = (
+    {'name': 'article:published_time'},
+    {'property': 'article:published_time'},
+    {'name': 'date'},
+    {'property': 'og:published_time'},
+    {'name': 'publish-date'},
+    {'name': 'pubdate'},
+    {'class': 'date-published'},
+    {'class': 'entry-date'},
+    {'class': 'published'},
+)
+HTTP_POOL_SIZE = 64  # Conexiones reutilizables por host
+MAX_REQUESTS_PER_HOST = 8  # Descargas simultáneas de artículos por host
+MAX_PAGE_BYTES = 3 * 1024 * 1024  # Páginas más grandes no se parsean
+
+# Caché HTTP en disco entre ejecuciones (solo si requests-cache está instalado)
+HTTP_CACHE_FILE = os.path.join(DATA_DIR, 'scraper_http_cache')
+HTTP_CACHE_EXPIRE = timedelta(hours=1)
+HTTP_CACHE_MAX_BYTES = 10 * 1024 * 1024  # Sitemaps más grandes no se guardan en la caché
+
+@dataclass(slots=True)
 class Article:
-    """Clase para representar un artículo extraído."""
+    """Clase para representar un artículo extraído.
+    
+    Usa __slots__ para reducir la memoria por instancia: se crea un artículo
+    por cada URL de sitemap. No es inmutable porque extract_article_info y
+    monitor_websites completan sus campos in situ.
+    """
     url: str
     title: str
     section: str
@@ -72,6 +123,61 @@ class Article:
             'timestamp': datetime.now().isoformat()
         }
 
+# Columnas guardadas por artículo, en el mismo orden que Article.to_dict
+ARTICLE_FIELDS = tuple(field.name for field in fields(Article))
+# Columnas del CSV de artículos: las de Article.to_dict, con la marca de tiempo
+CSV_COLUMNS = ARTICLE_FIELDS + ('timestamp',)
+# Compresión de los archivos de artículos en Parquet
+PARQUET_COMPRESSION = 'zstd'
+
+def _is_parquet(path: str) -> bool:
+    """Indica si la ruta corresponde a un archivo Parquet (por su extensión)."""
+    return path.lower().endswith('.parquet')
+
+def convert_csv_to_parquet(csv_file: str, parquet_file: Optional[str] = None) -> str:
+    """Convierte un CSV de artículos existente a Parquet (migración de una sola vez).
+    
+    Args:
+        csv_file: Ruta del CSV de artículos
+        parquet_file: Ruta de destino; por defecto, la del CSV con extensión .parquet
+        
+    Returns:
+        Ruta del archivo Parquet generado
+    """
+    parquet_file = parquet_file or f"{os.path.splitext(csv_file)[0]}.parquet"
+    df = pd.read_csv(csv_file)
+    tmp_file = f"{parquet_file}.tmp"
+    df.to_parquet(tmp_file, index=False, compression=PARQUET_COMPRESSION)
+    os.replace(tmp_file, parquet_file)
+    logger.info(f"Convertidos {len(df)} artículos de {csv_file} a {parquet_file}")
+    return parquet_file
+
+# Formatos de fecha comunes a probar cuando la cadena no es ISO 8601
+# Cada patrón (anclado al inicio) selecciona directamente los formatos que
+# pueden encajar, en lugar de probarlos todos capturando ValueError
+DATE_FORMAT_RULES = (
+    (re.compile(r'\d{1,2}/\d{1,2}/\d{4} \d'), (
+        "%d/%m/%Y %H:%M:%S",    # Formato europeo con tiempo
+        "%m/%d/%Y %H:%M:%S",    # Formato americano con tiempo
+    )),
+    (re.compile(r'\d{1,2}/\d{1,2}/\d{4}$'), (
+        "%d/%m/%Y",             # Formato europeo sin tiempo
+        "%m/%d/%Y",             # Formato americano sin tiempo
+    )),
+    (re.compile(r'[A-Za-z]{3}, .*[+-]\d{4}$'), (
+        "%a, %d %b %Y %H:%M:%S %z",  # RFC 2822 con timezone
+    )),
+    (re.compile(r'[A-Za-z]{3}, '), (
+        "%a, %d %b %Y %H:%M:%S",      # RFC 2822 sin timezone
+    )),
+    (re.compile(r'[A-Za-z]{3} [A-Za-z]{3} '), (
+        "%a %b %d %H:%M:%S %Y",       # Formato de fecha de Unix
+    )),
+)
+
+# Cadenas que pueden ser ISO 8601 (o formato SQL): empiezan por el año
+_ISO_DATE_RE = re.compile(r'\d{4}-?\d{2}')
+
 def _parse_date(date_str: str) -> Optional[datetime]:
     """Parsea una cadena de fecha a un objeto datetime.
     
@@ -85,92 +191,502 @@ def _parse_date(date_str: str) -> Optional[datetime]:
         return None
     
     # Eliminar espacios en blanco al inicio y final
-    date_str = date_str.strip()
-    
-    # Lista de formatos de fecha comunes a probar
-    date_formats = [
-        "%Y-%m-%dT%H:%M:%S%z",  # ISO 8601 con timezone
-        "%Y-%m-%dT%H:%M:%S",    # ISO 8601 sin timezone
-        "%Y-%m-%d %H:%M:%S",    # Formato SQL
-        "%Y-%m-%d",             # Solo fecha
-        "%d/%m/%Y %H:%M:%S",    # Formato europeo con tiempo
-        "%d/%m/%Y",             # Formato europeo sin tiempo
-        "%m/%d/%Y %H:%M:%S",    # Formato americano con tiempo
-        "%m/%d/%Y",             # Formato americano sin tiempo
-        "%a, %d %b %Y %H:%M:%S %z",  # RFC 2822 con timezone
-        "%a, %d %b %Y %H:%M:%S",      # RFC 2822 sin timezone
-        "%a %b %d %H:%M:%S %Y",       # Formato de fecha de Unix
-    ]
-    
-    for fmt in date_formats:
+    return _parse_date_cached(date_str.strip())
+
+@lru_cache(maxsize=4096)
+def _parse_date_cached(date_str: str) -> Optional[datetime]:
+    """Parsea una cadena de fecha ya normalizada; los sitemaps repiten muchas fechas."""
+    # Vía rápida: ISO 8601 (lo habitual en sitemaps) y formato SQL
+    if _ISO_DATE_RE.match(date_str):
+        iso_str = date_str[:-1] + '+00:00' if date_str.endswith('Z') else date_str
         try:
-            return datetime.strptime(date_str, fmt)
+            return datetime.fromisoformat(iso_str)
         except ValueError:
-            continue
+            pass
+    
+    for pattern, formats in DATE_FORMAT_RULES:
+        if pattern.match(date_str):
+            for fmt in formats:
+                try:
+                    return datetime.strptime(date_str, fmt)
+                except ValueError:
+                    continue
+            break
     
-    # Intentar con dateutil.parser si está disponible
+    # Último recurso: dateutil
     try:
-        from dateutil import parser
-        return parser.parse(date_str)
-    except (ImportError, ValueError):
+        return date_parser.parse(date_str)
+    except (ValueError, OverflowError):
         pass
     
     logger.warning(f"No se pudo parsear la fecha: {date_str}")
     return None
 
+def _read_capped(response, limit: int) -> Optional[bytes]:
+    """Lee el cuerpo de una respuesta en streaming sin pasar de ``limit`` bytes.
+    
+    Args:
+        response: Respuesta HTTP pedida con stream=True
+        limit: Tamaño máximo aceptado en bytes
+        
+    Returns:
+        El cuerpo completo, o None si supera el límite (según Content-Length
+        o al leerlo)
+    """
+    content_length = response.headers.get('content-length')
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        return None
+    
+    body = bytearray()
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        body += chunk
+        if len(body) > limit:
+            return None
+    return bytes(body)
+
+# Candidatos a título, descripción e imagen de un artículo, recogidos con una
+# sola consulta XPath en orden de documento
+_ARTICLE_NODES_XPATH = etree.XPath(
+    "//h1 | //title"
+    " | //meta[@property='og:title' or @name='title'"
+    " or @property='og:description' or @name='description' or @itemprop='description'"
+    " or @property='og:image' or @name='twitter:image']"
+    " | //p[contains(concat(' ', normalize-space(@class), ' '), ' article-summary ')]"
+    " | //div[contains(concat(' ', normalize-space(@class), ' '), ' article-content ')]/p"
+    " | //div[contains(concat(' ', normalize-space(@class), ' '), ' entry-content ')]/p"
+    " | //img"
+)
+
+# Prioridad (menor es mejor) de cada meta etiqueta: (atributo, valor) -> (campo, prioridad)
+_META_PRIORITY = {
+    ('property', 'og:title'): ('title', 2),
+    ('name', 'title'): ('title', 3),
+    ('property', 'og:description'): ('description', 0),
+    ('name', 'description'): ('description', 1),
+    ('itemprop', 'description'): ('description', 2),
+    ('property', 'og:image'): ('image', 0),
+    ('name', 'twitter:image'): ('image', 1),
+}
+
+def _has_class(element, class_name: str) -> bool:
+    """Indica si un elemento lxml tiene la clase CSS indicada."""
+    return class_name in (element.get('class') or '').split()
+
+def _parse_html(response, content: Optional[bytes] = None):
+    """Parsea el HTML de una respuesta con lxml.html a partir de los bytes recibidos.
+    
+    Solo se indica la codificación cuando la cabecera Content-Type la declara;
+    en otro caso lxml la toma de la propia página (meta charset).
+    
+    Args:
+        response: Respuesta HTTP con el HTML del artículo
+        content: Cuerpo ya leído de la respuesta (por defecto, response.content)
+        
+    Returns:
+        Raíz del documento lxml o None si el cuerpo está vacío
+    """
+    if content is None:
+        content = response.content
+    if not content or not content.strip():
+        return None
+    content_type = response.headers.get('content-type', '').lower()
+    encoding = response.encoding if 'charset=' in content_type else None
+    parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+    return lxml.html.document_fromstring(content, parser=parser)
+
+# Consultas de extract_article_info: primer nodo que cumple cada condición
+_FIRST_TITLE_XPATH = etree.XPath("(//title)[1]")
+_FIRST_META_PROPERTY_XPATH = etree.XPath("(//meta[@property=$value])[1]")
+_FIRST_META_NAME_XPATH = etree.XPath("(//meta[@name=$value])[1]")
+_FIRST_IMG_XPATH = etree.XPath("(//img[@src])[1]")
+_DATE_XPATHS = tuple(
+    etree.XPath(
+        f"(//*[contains(concat(' ', normalize-space(@class), ' '), ' {value} ')])[1]"
+        if attr == 'class' else f"(//*[@{attr}='{value}'])[1]"
+    )
+    for selector in DATE_SELECTORS for attr, value in selector.items()
+)
+
+def _first_node(tree, xpath, **variables):
+    """Devuelve el primer nodo de una consulta XPath, o None (también sin documento)."""
+    if tree is None:
+        return None
+    nodes = xpath(tree, **variables)
+    return nodes[0] if nodes else None
+
+def _candidate_priority(node) -> Optional[Tuple[str, int]]:
+    """Devuelve el campo y la prioridad de un nodo candidato, o None si no aplica."""
+    tag = node.tag
+    if tag == 'h1':
+        return 'title', 0
+    if tag == 'title':
+        return 'title', 1
+    if tag == 'meta':
+        for attr in ('property', 'name', 'itemprop'):
+            match = _META_PRIORITY.get((attr, node.get(attr)))
+            if match:
+                return match
+        return None
+    if tag == 'p':
+        if _has_class(node, 'article-summary'):
+            return 'description', 3
+        return 'description', 4 if _has_class(node.getparent(), 'article-content') else 5
+    if tag == 'img':
+        if _has_class(node, 'article-image'):
+            return 'image', 2
+        if _has_class(node, 'wp-post-image'):
+            return 'image', 3
+        for ancestor in node.iterancestors():
+            if ancestor.tag == 'figure':
+                return 'image', 4
+            if ancestor.tag == 'div' and _has_class(ancestor, 'article-image'):
+                return 'image', 5
+    return None
+
+def _extract_page_metadata(tree) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Obtiene título, descripción e imagen de un documento en un solo recorrido.
+    
+    Args:
+        tree: Raíz del documento lxml (o None)
+        
+    Returns:
+        Tupla (título, descripción, URL de imagen); cada valor puede ser None
+    """
+    best = {}
+    if tree is not None:
+        for node in _ARTICLE_NODES_XPATH(tree):
+            candidate = _candidate_priority(node)
+            if candidate is None:
+                continue
+            field, priority = candidate
+            if field in best and best[field][0] <= priority:
+                continue
+            if node.tag == 'meta':
+                value = (node.get('content') or '').strip()
+            elif node.tag == 'img':
+                value = node.get('src') or ''
+            else:
+                value = node.text_content().strip()
+            if value:
+                best[field] = (priority, value)
+    
+    return tuple(best[field][1] if field in best else None
+                 for field in ('title', 'description', 'image'))
+
+# Declaración XML inicial; se descarta al pasar texto ya decodificado a lxml
+_XML_DECLARATION_RE = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+# Detección del tipo de sitemap sobre los primeros bytes del documento
+SITEMAP_SNIFF_BYTES = 4096
+_SITEMAP_INDEX_RE = re.compile(rb'sitemapindex', re.IGNORECASE)
+_NEWS_SITEMAP_RE = re.compile(rb'newssitemap|sitemap-news/|<news:', re.IGNORECASE)
+
+_NEWS = '{%s}' % SITEMAP_NS['news']
+_IMAGE = '{%s}' % SITEMAP_NS['image']
+
+# Texto de todas las etiquetas <loc>, tengan o no namespace
+_LOC_TEXT_XPATH = etree.XPath("//*[local-name()='loc']/text()")
+
+def _xml_bytes(xml_content) -> bytes:
+    """Devuelve el XML como bytes para lxml.
+    
+    Al texto ya decodificado se le quita la declaración XML (su encoding ya no
+    aplica) y se codifica en UTF-8; los bytes se devuelven tal cual.
+    """
+    if isinstance(xml_content, str):
+        return _XML_DECLARATION_RE.sub('', xml_content, count=1).encode('utf-8')
+    return xml_content
+
+def _iter_sitemap_urls(xml_content):
+    """Recorre en streaming las etiquetas <url> de un sitemap.
+    
+    Cada elemento se libera tras procesarse, de modo que la memoria no crece
+    con el tamaño del sitemap. El XML mal formado se recupera en lo posible.
+    
+    Args:
+        xml_content: Contenido del sitemap (texto o bytes)
+        
+    Yields:
+        Elementos lxml de cada etiqueta <url>, con o sin namespace
+    """
+    xml_content = _xml_bytes(xml_content)
+    if not xml_content or not xml_content.strip():
+        return
+    
+    try:
+        for _, element in etree.iterparse(io.BytesIO(xml_content), events=('end',),
+                                          tag='{*}url', recover=True):
+            yield element
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+    except etree.XMLSyntaxError as e:
+        logger.debug(f"XML de sitemap no válido: {str(e)}")
+
+def _child_text(element, path: str) -> str:
+    """Devuelve el texto sin espacios de la ruta indicada o cadena vacía."""
+    text = element.findtext(path)
+    return text.strip() if text else ''
+
+def _entry_texts(url_tag) -> Dict[str, str]:
+    """Recoge en un solo recorrido el texto de las etiquetas de una entrada <url>.
+    
+    Las claves son nombres locales (sin namespace) y se queda el primer valor
+    de cada una. Las hijas directas tienen prioridad sobre las anidadas, de
+    modo que <loc> no se confunde con <image:loc>.
+    
+    Args:
+        url_tag: Elemento lxml de la entrada <url>
+        
+    Returns:
+        Diccionario nombre local -> texto sin espacios ('' si está vacía)
+    """
+    texts = {}
+    nested = []
+    for child in url_tag:
+        tag = child.tag
+        if not isinstance(tag, str):  # Comentarios e instrucciones de proceso
+            continue
+        texts.setdefault(tag.rpartition('}')[2], (child.text or '').strip())
+        if len(child):
+            nested.append(child)
+    for child in nested:
+        for node in child.iterdescendants():
+            tag = node.tag
+            if isinstance(tag, str):
+                texts.setdefault(tag.rpartition('}')[2], (node.text or '').strip())
+    return texts
+
+@lru_cache(maxsize=8192)
+def _url_parts(url: str) -> Tuple[str, Tuple[str, ...]]:
+    """Descompone una URL una sola vez en host y segmentos de la ruta.
+    
+    Returns:
+        Tupla (netloc, segmentos de la ruta sin barras inicial y final);
+        sin ruta, los segmentos son una tupla vacía
+    """
+    parts = urlsplit(url)
+    return parts.netloc, tuple(parts.path.strip('/').split('/')) if parts.path else ()
+
+# Parámetros de seguimiento que no cambian el contenido de la página
+# (además de todos los utm_*)
+TRACKING_QUERY_PARAMS = frozenset({'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid'})
+
+def canonicalize_url(url: str) -> str:
+    """Normaliza una URL para detectar artículos repetidos.
+    
+    Pone en minúsculas el esquema y el host, quita los parámetros de
+    seguimiento, ordena el resto de la query y elimina el fragmento y la
+    barra final de la ruta. La URL original se sigue guardando tal cual.
+    """
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_QUERY_PARAMS
+    )
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'),
+                       urlencode(query), ''))
+
+def _section_from_url(url: str) -> str:
+    """Extrae la sección (primer segmento de la ruta) de una URL."""
+    path_parts = _url_parts(url)[1]
+    return path_parts[0] if path_parts else 'home'
+
+# Número aproximado de líneas de progreso que se registran por bucle sin terminal
+PROGRESS_LOG_STEPS = 20
+
+def _progress(iterable, total: int, desc: str):
+    """Muestra el avance de un bucle largo.
+    
+    En un terminal se usa una barra tqdm que se redibuja como mucho dos veces
+    por segundo. Sin terminal (cron, CI) no se escribe en stderr por cada
+    elemento: se registra una línea de log cada ~1/PROGRESS_LOG_STEPS del total.
+    """
+    if sys.stderr.isatty():
+        yield from tqdm(iterable, total=total, desc=desc, mininterval=0.5, leave=False)
+        return
+    step = max(1, total // PROGRESS_LOG_STEPS)
+    for done, item in enumerate(iterable, 1):
+        yield item
+        if done % step == 0 or done == total:
+            logger.info(f"{desc}: {done}/{total}")
+
 class DiscoverMonitor:
-    def __init__(self, output_file: str = None, max_workers: int = 5):
+    def __init__(self, output_file: str = None, max_workers: int = MAX_WORKERS,
+                 max_index_sitemaps: Optional[int] = MAX_SITEMAPS_PER_INDEX):
         """Inicializa el monitor de Discover.
         
         Args:
             output_file: Ruta al archivo de salida para guardar los artículos.
             max_workers: Número máximo de workers para el ThreadPoolExecutor.
+            max_index_sitemaps: Sitemaps hijos a seguir por índice (None sin límite).
         """
         self.output_file = output_file or os.path.join(DATA_DIR, 'articles.csv')
+        # Fichero auxiliar con una URL por línea de los artículos ya guardados
+        self.seen_urls_file = f"{os.path.splitext(self.output_file)[0]}_seen_urls.txt"
+        # ETag / Last-Modified de cada sitemap para pedirlos con GET condicional
+        # (y, en los índices, sus sitemaps hijos para seguirlos tras un 304)
+        self.sitemap_meta_file = f"{os.path.splitext(self.output_file)[0]}_sitemap_meta.json"
+        # (se carga del disco la primera vez que se necesita)
+        self._sitemap_meta: Optional[Dict[str, Dict[str, Any]]] = None
+        self._sitemap_meta_lock = threading.Lock()
+        # Sitemaps visitados desde cada sitemap raíz en la última llamada a fetch_sitemap
+        self._sitemap_trees: Dict[str, Set[str]] = {}
+        # Sitemaps cuya última descarga respondió 304 (sin cambios)
+        self._unchanged_sitemaps: Set[str] = set()
         self.max_workers = max_workers
+        self.max_index_sitemaps = max_index_sitemaps
+        # Pool de hilos compartido por todas las descargas (sitemaps y artículos);
+        # los hilos se crean bajo demanda
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Límite de descargas por host para no saturar (ni ser bloqueados por) un
+        # mismo sitio: artículos en espera y descargas en curso de cada host.
+        # Los artículos solo llegan al pool cuando su host tiene hueco, así que
+        # ningún hilo del pool se queda esperando por el límite
+        self._host_queues: Dict[str, deque] = {}
+        self._host_active: Dict[str, int] = {}
+        self._host_slots_lock = threading.Lock()
         self.articles = []  # Lista para almacenar los artículos encontrados
         self.processed_urls = set()  # Conjunto para URLs ya procesadas
-        self.session = requests.Session()
+        # URLs descartadas por no ser HTML o por su tamaño: no se vuelven a pedir
+        self._skipped_urls: Set[str] = set()
+        self.session = self._create_session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        # Un pool de conexiones keep-alive por host con hueco para todos los workers
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE,
+                              pool_maxsize=max(max_workers, HTTP_POOL_SIZE),
+                              max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.setup_directories()
 
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """Crea la sesión HTTP, con caché en disco si requests-cache está disponible.
+        
+        Con la caché, los sitemaps sin cambios no se vuelven a descargar dentro
+        de HTTP_CACHE_EXPIRE y, pasado ese tiempo, se revalidan con peticiones
+        condicionales (ETag / Last-Modified). Solo se guardan los sitemaps
+        (ver _is_cacheable_sitemap).
+        """
+        return create_cached_session(
+            HTTP_CACHE_FILE,
+            HTTP_CACHE_EXPIRE,
+            DiscoverMonitor._is_cacheable_sitemap,
+            cache_control=True,
+            allowable_codes=(200,),
+        )
+
+    @staticmethod
+    def _is_cacheable_sitemap(response) -> bool:
+        """Indica si una respuesta es un sitemap XML que puede guardarse en la caché HTTP.
+        
+        Las páginas de artículos quedan fuera: la caché leería el cuerpo completo
+        antes de que _read_capped aplique MAX_PAGE_BYTES, y guardaría también
+        lo que después se descarta por no ser HTML.
+        """
+        content_type = response.headers.get('content-type', '').lower()
+        if 'xml' not in content_type:
+            return False
+        size = declared_size(response)
+        return size is None or size <= HTTP_CACHE_MAX_BYTES
+
+    def close(self) -> None:
+        """Detiene el pool de hilos compartido y cierra la sesión HTTP.
+        
+        Las tareas que aún no han empezado se cancelan; las que están en curso
+        se esperan.
+        """
+        self._executor.shutdown(cancel_futures=True)
+        self.session.close()
+
+    def __enter__(self) -> 'DiscoverMonitor':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
     def setup_directories(self):
         """Crea los directorios necesarios si no existen."""
         os.makedirs(DATA_DIR, exist_ok=True)
         
-    def _save_articles(self, file_path: str = None) -> None:
-        """Guarda los artículos en un archivo CSV.
+    def _loaded_sitemap_meta(self) -> Dict[str, Dict[str, Any]]:
+        """Devuelve los validadores HTTP de los sitemaps, leyéndolos del disco la primera vez.
         
-        Args:
-            file_path: Ruta del archivo donde guardar los artículos. Si es None, se usa self.output_file.
+        Debe llamarse con _sitemap_meta_lock adquirido.
         """
-        if not file_path:
-            file_path = self.output_file
-            
-        if not self.articles:
-            logger.warning("No hay artículos para guardar")
-            return
-            
+        if self._sitemap_meta is None:
+            self._sitemap_meta = {}
+            try:
+                with open(self.sitemap_meta_file, encoding='utf-8') as f:
+                    meta = json.load(f)
+                if isinstance(meta, dict):
+                    self._sitemap_meta = meta
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.warning(f"No se pudo leer {self.sitemap_meta_file}: {str(e)}")
+        return self._sitemap_meta
+
+    def _save_sitemap_meta(self) -> None:
+        """Guarda los validadores HTTP de los sitemaps para la siguiente ejecución."""
+        with self._sitemap_meta_lock:
+            if self._sitemap_meta is None:
+                return  # No se ha descargado ningún sitemap
+            meta = dict(self._sitemap_meta)
         try:
-            # Convertir los artículos a diccionarios
-            articles_data = [article.to_dict() for article in self.articles]
-            
-            # Crear DataFrame y guardar en CSV
-            df = pd.DataFrame(articles_data)
-            
-            # Asegurarse de que el directorio existe
-            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
-            
-            # Guardar el archivo
-            df.to_csv(file_path, index=False, encoding='utf-8')
-            logger.info(f"Artículos guardados en {file_path}")
-            
-        except Exception as e:
-            logger.error(f"Error al guardar los artículos: {str(e)}")
-            raise
+            with open(self.sitemap_meta_file, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, indent=2, sort_keys=True)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar {self.sitemap_meta_file}: {str(e)}")
+
+    def _forget_sitemap_meta(self, sitemap_url: str) -> None:
+        """Olvida los validadores de un sitemap y de los sitemaps hijos visitados.
+        
+        Así la siguiente ejecución los descarga completos aunque no hayan cambiado.
+        """
+        with self._sitemap_meta_lock:
+            meta = self._loaded_sitemap_meta()
+            for url in self._sitemap_trees.get(sitemap_url, {sitemap_url}):
+                meta.pop(url, None)
+
+    def _conditional_headers(self, sitemap_url: str) -> Dict[str, str]:
+        """Cabeceras If-None-Match / If-Modified-Since para un sitemap ya visto."""
+        with self._sitemap_meta_lock:
+            meta = self._loaded_sitemap_meta().get(sitemap_url) or {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def _remember_sitemap_meta(self, sitemap_url: str, response,
+                               children: Optional[List[str]] = None) -> None:
+        """Guarda en memoria el ETag / Last-Modified de la respuesta de un sitemap.
         
+        Args:
+            sitemap_url: URL del sitemap
+            response: Respuesta HTTP del sitemap
+            children: Sitemaps hijos si es un índice. Un 304 del índice no dice
+                nada de sus hijos, así que se guardan para seguir pidiéndolos.
+        """
+        meta: Dict[str, Any] = {}
+        for header, key in (('ETag', 'etag'), ('Last-Modified', 'last_modified')):
+            value = response.headers.get(header)
+            if isinstance(value, str) and value:
+                meta[key] = value
+        if meta and children is not None:
+            meta['children'] = list(children)
+        with self._sitemap_meta_lock:
+            if meta:
+                self._loaded_sitemap_meta()[sitemap_url] = meta
+            else:
+                self._loaded_sitemap_meta().pop(sitemap_url, None)
+
     def _fetch_sitemap(self, url: str) -> Optional[str]:
         """Descarga el contenido de un sitemap.
         
@@ -203,80 +719,14 @@ class DiscoverMonitor:
             response = self.session.get(url, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extraer título (usando varios selectores comunes)
-            title = None
-            title_selectors = [
-                'h1',
-                'h1.article-title',
-                'h1.entry-title',
-                'h1.post-title',
-                'title',
-                'meta[property="og:title"]',
-                'meta[name="title"]'
-            ]
-            
-            for selector in title_selectors:
-                element = soup.select_one(selector)
-                if element and element.get_text().strip():
-                    title = element.get_text().strip()
-                    if selector.startswith('meta'):
-                        title = element.get('content', '').strip()
-                    if title:
-                        break
-            
-            # Extraer descripción
-            description = None
-            desc_selectors = [
-                'meta[property="og:description"]',
-                'meta[name="description"]',
-                'meta[itemprop="description"]',
-                'p.article-summary',
-                'div.article-content > p',
-                'div.entry-content > p'
-            ]
-            
-            for selector in desc_selectors:
-                element = soup.select_one(selector)
-                if element:
-                    if selector.startswith('meta'):
-                        description = element.get('content', '').strip()
-                    else:
-                        description = element.get_text().strip()
-                    if description:
-                        break
-            
-            # Extraer imagen
-            image_url = None
-            img_selectors = [
-                'meta[property="og:image"]',
-                'meta[name="twitter:image"]',
-                'img.article-image',
-                'img.wp-post-image',
-                'figure img',
-                'div.article-image img'
-            ]
-            
-            for selector in img_selectors:
-                element = soup.select_one(selector)
-                if element:
-                    if selector.startswith('meta'):
-                        image_url = element.get('content', '')
-                    else:
-                        image_url = element.get('src', '')
-                    if image_url:
-                        break
+            # Un único recorrido del documento recoge todos los candidatos
+            title, description, image_url = _extract_page_metadata(_parse_html(response))
             
-            # Extraer sección (de la URL o de la navegación)
+            # Extraer sección de la URL
+            netloc, path_parts = _url_parts(url)
             section = 'General'
-            try:
-                # Intentar extraer de la URL
-                path_parts = urlparse(url).path.strip('/').split('/')
-                if len(path_parts) > 1 and path_parts[0]:
-                    section = path_parts[0].capitalize()
-            except Exception as e:
-                logger.warning(f"No se pudo extraer la sección de la URL {url}: {str(e)}")
+            if len(path_parts) > 1 and path_parts[0]:
+                section = path_parts[0].capitalize()
             
             # Crear y devolver el artículo
             return Article(
@@ -284,7 +734,7 @@ class DiscoverMonitor:
                 title=title or 'Sin título',
                 section=section,
                 description=description or '',
-                source=urlparse(url).netloc,
+                source=netloc,
                 is_own_site=False,
                 image_url=image_url
             )
@@ -293,62 +743,42 @@ class DiscoverMonitor:
             logger.error(f"Error al analizar el artículo {url}: {str(e)}")
             return None
 
-    def _parse_sitemap_index(self, xml_content: str) -> List[str]:
+    def _parse_sitemap_index(self, xml_content: Union[str, bytes]) -> List[str]:
         """Parsea un índice de sitemap y devuelve las URLs de los sitemaps."""
         try:
             # Registrar los primeros 200 caracteres del contenido para depuración
             logger.debug(f"Parsing sitemap index. Content start: {xml_content[:200]}...")
             
-            # Intentar con namespaces primero
-            root = ET.fromstring(xml_content)
-            
-            # Intentar diferentes patrones de búsqueda
-            sitemap_locs = []
-            
-            # Patrón 1: Con namespace
-            sitemap_locs = root.findall('.//sitemap:loc', SITEMAP_NS)
-            
-            # Si no se encontraron con namespace, intentar sin namespace
-            if not sitemap_locs:
-                logger.debug("No se encontraron sitemaps con namespace, intentando sin namespace...")
-                sitemap_locs = root.findall('.//loc')
-            
-            # Si aún no hay resultados, buscar en todo el documento
-            if not sitemap_locs:
-                logger.debug("Búsqueda exhaustiva de sitemaps...")
-                sitemap_locs = root.findall('.//{*}loc') or root.findall('.//loc')
+            data = _xml_bytes(xml_content)
+            try:
+                root = etree.fromstring(data)
+            except etree.XMLSyntaxError as e:
+                logger.error(f"Error de parseo XML en el sitemap índice: {str(e)}")
+                # Recuperar lo que se pueda del documento mal formado
+                root = etree.fromstring(data, etree.XMLParser(recover=True)) if data.strip() else None
+            if root is None:
+                return []
             
-            # Filtrar y limpiar las URLs
+            # Filtrar y limpiar las URLs (con o sin namespace)
             urls = []
-            for loc in sitemap_locs:
-                if loc is not None and loc.text and loc.text.strip():
-                    url = loc.text.strip()
-                    # Asegurarse de que la URL sea absoluta
-                    if not url.startswith(('http://', 'https://')):
-                        logger.warning(f"URL relativa encontrada en sitemap: {url}")
-                        continue
-                    urls.append(url)
+            for loc in _LOC_TEXT_XPATH(root):
+                url = loc.strip()
+                if not url:
+                    continue
+                # Asegurarse de que la URL sea absoluta
+                if not url.startswith(('http://', 'https://')):
+                    logger.warning(f"URL relativa encontrada en sitemap: {url}")
+                    continue
+                urls.append(url)
             
             logger.info(f"Se encontraron {len(urls)} URLs de sitemap en el índice")
             return urls
             
-        except ET.ParseError as e:
-            logger.error(f"Error de parseo XML en el sitemap índice: {str(e)}")
-            # Intentar con BeautifulSoup como respaldo
-            try:
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(xml_content, 'lxml')
-                urls = [loc.text.strip() for loc in soup.find_all('loc') if loc and loc.text.strip()]
-                logger.info(f"Se encontraron {len(urls)} URLs de sitemap usando BeautifulSoup")
-                return urls
-            except Exception as bs_e:
-                logger.error(f"Error al analizar con BeautifulSoup: {str(bs_e)}")
-                return []
         except Exception as e:
             logger.error(f"Error inesperado al analizar índice de sitemap: {str(e)}", exc_info=True)
             return []
 
-    def _parse_news_sitemap(self, xml_content: str) -> List[Article]:
+    def _parse_news_sitemap(self, xml_content: Union[str, bytes]) -> List[Article]:
         """Parsea un sitemap de noticias y devuelve información de artículos."""
         articles = []
         try:
@@ -357,67 +787,35 @@ class DiscoverMonitor:
             # Registrar los primeros 200 caracteres del contenido para depuración
             logger.debug(f"Contenido del sitemap de noticias (inicio): {xml_content[:200]}...")
             
-            # Usar BeautifulSoup para un análisis más flexible
-            soup = BeautifulSoup(xml_content, 'lxml-xml')
-            
-            # Buscar todas las etiquetas url
-            url_tags = soup.find_all('url')
-            logger.info(f"Se encontraron {len(url_tags)} etiquetas 'url' en el sitemap de noticias")
-            
-            for url_tag in url_tags:
+            url_count = 0
+            for url_tag in _iter_sitemap_urls(xml_content):
+                url_count += 1
                 try:
                     # Extraer la URL
-                    loc_tag = url_tag.find('loc')
-                    if not loc_tag or not loc_tag.text.strip():
+                    url = _child_text(url_tag, '{*}loc')
+                    if not url:
                         continue
                     
-                    url = loc_tag.text.strip()
-                    
                     # Extraer metadatos de noticias
-                    news_tag = url_tag.find('news:news')
-                    if not news_tag:
+                    news_tag = url_tag.find(_NEWS + 'news')
+                    if news_tag is None:
                         logger.debug(f"No se encontró etiqueta de noticias para {url}")
                         continue
                     
                     # Extraer título
-                    title_tag = news_tag.find('news:title')
-                    title = title_tag.text.strip() if title_tag and title_tag.text else 'Sin título'
+                    title = _child_text(news_tag, _NEWS + 'title') or 'Sin título'
                     
                     # Extraer fecha de publicación
-                    pub_date = None
-                    pub_date_tag = news_tag.find('news:publication_date')
-                    if pub_date_tag and pub_date_tag.text:
-                        try:
-                            # Manejar diferentes formatos de fecha
-                            pub_date_str = pub_date_tag.text.strip()
-                            # Intentar con diferentes formatos de fecha
-                            for fmt in ('%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%dT%H:%M:%S', 
-                                       '%Y-%m-%d %H:%M:%S', '%Y-%m-%d'):
-                                try:
-                                    pub_date = datetime.strptime(pub_date_str, fmt)
-                                    break
-                                except ValueError:
-                                    continue
-                        except Exception as e:
-                            logger.warning(f"No se pudo analizar la fecha de publicación para {url}: {str(e)}")
+                    pub_date = _parse_date(_child_text(news_tag, _NEWS + 'publication_date'))
                     
                     # Extraer imagen si está disponible
-                    image_url = None
-                    image_tag = url_tag.find('image:image')
-                    if image_tag:
-                        image_loc = image_tag.find('image:loc')
-                        if image_loc and image_loc.text:
-                            image_url = image_loc.text.strip()
-                    
-                    # Extraer sección de la URL
-                    parsed_url = urlparse(url)
-                    section = parsed_url.path.strip('/').split('/')[0] if parsed_url.path else 'home'
+                    image_url = _child_text(url_tag, f'{_IMAGE}image/{_IMAGE}loc') or None
                     
                     # Crear objeto Article
                     article = Article(
                         url=url,
                         title=title,
-                        section=section,
+                        section=_section_from_url(url),
                         description='',  # Se completará más tarde
                         source='',  # Se establecerá más adelante
                         is_own_site=False,  # Se ajustará según el sitio
@@ -431,6 +829,7 @@ class DiscoverMonitor:
                 except Exception as e:
                     logger.warning(f"Error procesando entrada de noticia: {str(e)}", exc_info=True)
             
+            logger.info(f"Se encontraron {url_count} etiquetas 'url' en el sitemap de noticias")
             logger.info(f"Se procesaron {len(articles)} artículos del sitemap de noticias")
             return articles
             
@@ -438,74 +837,37 @@ class DiscoverMonitor:
             logger.error(f"Error inesperado al analizar sitemap de noticias: {str(e)}", exc_info=True)
             return []
 
-    def _parse_standard_sitemap(self, xml_content: str) -> List[Article]:
+    def _parse_standard_sitemap(self, xml_content: Union[str, bytes]) -> List[Article]:
         """Parsea un sitemap estándar y devuelve información de URLs."""
         articles = []
         try:
             logger.debug("Analizando sitemap estándar...")
             
-            # Usar BeautifulSoup para un análisis más flexible
-            soup = BeautifulSoup(xml_content, 'lxml-xml')
-            
-            # Buscar todas las etiquetas url
-            url_tags = soup.find_all('url')
-            logger.info(f"Se encontraron {len(url_tags)} etiquetas 'url' en el sitemap estándar")
-            
-            for url_tag in url_tags:
+            url_count = 0
+            for url_tag in _iter_sitemap_urls(xml_content):
+                url_count += 1
                 try:
+                    # Un único recorrido de la entrada recoge todos sus campos
+                    texts = _entry_texts(url_tag)
+                    
                     # Extraer la URL
-                    loc_tag = url_tag.find('loc')
-                    if not loc_tag or not loc_tag.text.strip():
+                    url = texts.get('loc')
+                    if not url:
                         continue
-                        
-                    url = loc_tag.text.strip()
                     
                     # Extraer fecha de última modificación
-                    lastmod = None
-                    lastmod_tag = url_tag.find('lastmod')
-                    if lastmod_tag and lastmod_tag.text:
-                        try:
-                            # Intentar con diferentes formatos de fecha
-                            lastmod_str = lastmod_tag.text.strip()
-                            for fmt in ('%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%dT%H:%M:%S', 
-                                       '%Y-%m-%d %H:%M:%S', '%Y-%m-%d'):
-                                try:
-                                    lastmod = datetime.strptime(lastmod_str, fmt)
-                                    break
-                                except ValueError:
-                                    continue
-                        except Exception as e:
-                            logger.debug(f"No se pudo analizar la fecha de modificación para {url}: {str(e)}")
+                    lastmod = _parse_date(texts.get('lastmod'))
                     
-                    # Extraer título si está disponible
-                    title = ''
-                    title_tag = url_tag.find('title') or url_tag.find('news:title')
-                    if title_tag and title_tag.text:
-                        title = title_tag.text.strip()
-                    
-                    # Extraer descripción si está disponible
-                    description = ''
-                    desc_tag = url_tag.find('description') or url_tag.find('news:description')
-                    if desc_tag and desc_tag.text:
-                        description = desc_tag.text.strip()
-                    
-                    # Extraer imagen si está disponible
-                    image_url = None
-                    image_tag = url_tag.find('image:image') or url_tag.find('image')
-                    if image_tag:
-                        image_loc = image_tag.find('image:loc') or image_tag.find('loc')
-                        if image_loc and image_loc.text:
-                            image_url = image_loc.text.strip()
-                    
-                    # Extraer sección de la URL
-                    parsed_url = urlparse(url)
-                    section = parsed_url.path.strip('/').split('/')[0] if parsed_url.path else 'home'
+                    # Extraer título y descripción si están disponibles
+                    # (directamente en <url> o dentro de <news:news>)
+                    title = texts.get('title', '')
+                    description = texts.get('description', '')
                     
                     # Crear objeto Article
                     article = Article(
                         url=url,
                         title=title,
-                        section=section,
+                        section=_section_from_url(url),
                         description=description,
                         source='',  # Se establecerá más adelante
                         is_own_site=False,  # Se ajustará según el sitio
@@ -518,6 +880,7 @@ class DiscoverMonitor:
                 except Exception as e:
                     logger.warning(f"Error procesando entrada de sitemap: {str(e)}", exc_info=True)
             
+            logger.info(f"Se encontraron {url_count} etiquetas 'url' en el sitemap estándar")
             logger.info(f"Se procesaron {len(articles)} URLs del sitemap estándar")
             return articles
             
@@ -529,54 +892,118 @@ class DiscoverMonitor:
         """
         Obtiene y analiza un sitemap, manejando tanto índices como sitemaps regulares.
         Devuelve una lista de artículos con metadatos básicos.
+        
+        Los sitemaps hijos de un índice se descargan en el pool compartido. Las
+        tareas nunca esperan a otras tareas (solo este método espera), por lo
+        que los índices anidados no pueden bloquear el pool.
+        """
+        articles, child_urls = self._process_sitemap(sitemap_url)
+        seen = {sitemap_url}
+        pending = set()
+        
+        def submit_children(urls):
+            for url in urls:
+                if url not in seen:
+                    seen.add(url)
+                    pending.add(self._executor.submit(self._process_sitemap, url))
+        
+        submit_children(child_urls)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    child_articles, child_urls = future.result()
+                except Exception as e:
+                    logger.error(f"Error processing sitemap: {str(e)}")
+                    continue
+                articles.extend(child_articles)
+                submit_children(child_urls)
+        
+        self._sitemap_trees[sitemap_url] = seen
+        return articles
+    
+    def _process_sitemap(self, sitemap_url: str) -> Tuple[List[Article], List[str]]:
+        """Descarga y analiza un único sitemap.
+        
+        Returns:
+            Tupla (artículos encontrados, URLs de sitemaps hijos si es un índice)
         """
         try:
             logger.info(f"Fetching sitemap: {sitemap_url}")
-            response = self.session.get(sitemap_url, timeout=REQUEST_TIMEOUT)
+            conditional_headers = self._conditional_headers(sitemap_url)
+            if conditional_headers:
+                response = self.session.get(sitemap_url, headers=conditional_headers,
+                                            timeout=REQUEST_TIMEOUT)
+            else:
+                response = self.session.get(sitemap_url, timeout=REQUEST_TIMEOUT)
+            if response.status_code == 304:
+                logger.info(f"Sitemap sin cambios desde la última ejecución: {sitemap_url}")
+                # Los hijos de un índice sin cambios pueden haber cambiado:
+                # se siguen pidiendo, cada uno con su propio GET condicional
+                with self._sitemap_meta_lock:
+                    meta = self._loaded_sitemap_meta().get(sitemap_url) or {}
+                    children = list(meta.get('children') or [])
+                    self._unchanged_sitemaps.add(sitemap_url)
+                return [], self._limit_index_children(sitemap_url, children)
+            with self._sitemap_meta_lock:
+                self._unchanged_sitemaps.discard(sitemap_url)
             response.raise_for_status()
+            if getattr(response, 'from_cache', False) is True:
+                logger.debug(f"Sitemap servido desde la caché HTTP: {sitemap_url}")
             
             content_type = response.headers.get('content-type', '').lower()
+            # Los parsers XML trabajan sobre los bytes recibidos, sin decodificar
+            content = response.content
+            # El tipo de sitemap se deduce de la cabecera y del inicio del documento
+            head = content[:SITEMAP_SNIFF_BYTES]
             
             # Verificar si es un índice de sitemap
-            if 'sitemapindex' in response.text.lower() or 'sitemapindex' in content_type:
+            if 'sitemapindex' in content_type or _SITEMAP_INDEX_RE.search(head):
                 logger.info(f"Detected sitemap index: {sitemap_url}")
-                sitemap_urls = self._parse_sitemap_index(response.text)
-                
-                # Procesar cada sitemap en el índice
-                articles = []
-                with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-                    futures = [
-                        executor.submit(self.fetch_sitemap, sitemap_url)
-                        for sitemap_url in sitemap_urls[:20]  # Limitar para no sobrecargar
-                    ]
-                    
-                    for future in as_completed(futures):
-                        try:
-                            articles.extend(future.result())
-                        except Exception as e:
-                            logger.error(f"Error processing sitemap: {str(e)}")
-                
-                return articles
+                sitemap_urls = self._parse_sitemap_index(content)
+                self._remember_sitemap_meta(sitemap_url, response, children=sitemap_urls)
+                return [], self._limit_index_children(sitemap_url, sitemap_urls)
                 
             # Verificar si es un sitemap de noticias
-            elif 'newssitemap' in response.text.lower() or 'newssitemap' in content_type:
+            elif 'newssitemap' in content_type or _NEWS_SITEMAP_RE.search(head):
                 logger.info(f"Detected news sitemap: {sitemap_url}")
-                return self._parse_news_sitemap(response.text)
+                articles = self._parse_news_sitemap(content)
+                self._remember_sitemap_meta(sitemap_url, response)
+                return articles, []
                 
             # Asumir que es un sitemap estándar
             else:
                 logger.info(f"Detected standard sitemap: {sitemap_url}")
-                return self._parse_standard_sitemap(response.text)
+                articles = self._parse_standard_sitemap(content)
+                self._remember_sitemap_meta(sitemap_url, response)
+                return articles, []
                 
         except requests.RequestException as e:
             logger.error(f"Error fetching sitemap {sitemap_url}: {str(e)}")
-            return []
-        except ET.ParseError as e:
+            return [], []
+        except etree.XMLSyntaxError as e:
             logger.error(f"Error parsing XML from {sitemap_url}: {str(e)}")
-            return []
+            return [], []
         except Exception as e:
             logger.error(f"Unexpected error processing {sitemap_url}: {str(e)}")
-            return []
+            return [], []
+
+    def _sitemap_unchanged(self, sitemap_url: str) -> bool:
+        """Indica si todos los sitemaps visitados desde sitemap_url respondieron 304."""
+        with self._sitemap_meta_lock:
+            tree = self._sitemap_trees.get(sitemap_url)
+            return bool(tree) and tree <= self._unchanged_sitemaps
+
+    def _limit_index_children(self, sitemap_url: str, sitemap_urls: List[str]) -> List[str]:
+        """Recorta los sitemaps hijos de un índice a max_index_sitemaps."""
+        limit = self.max_index_sitemaps
+        if limit is not None and len(sitemap_urls) > limit:
+            logger.warning(
+                f"El índice {sitemap_url} tiene {len(sitemap_urls)} sitemaps; "
+                f"solo se procesan los primeros {limit}"
+            )
+            return sitemap_urls[:limit]
+        return sitemap_urls
 
     def extract_article_info(self, article: Article) -> Optional[Article]:
         """
@@ -588,107 +1015,44 @@ class DiscoverMonitor:
         Returns:
             Article actualizado con la información extraída, o None si hay un error
         """
+        if article.url in self._skipped_urls:
+            logger.debug(f"Skipping previously rejected URL: {article.url}")
+            return None
+        
         try:
             logger.debug(f"Extracting article info from: {article.url}")
             
-            # Configurar headers para parecer un navegador real
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'es-ES,es;q=0.8,en-US;q=0.5,en;q=0.3',
-                'DNT': '1',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-            
-            # Realizar la petición con manejo de redirecciones
+            # Realizar la petición con manejo de redirecciones; el cuerpo se
+            # descarga en streaming, así que con las cabeceras basta para
+            # descartar lo que no es HTML o es demasiado grande (sin un HEAD previo)
             response = self.session.get(
                 article.url, 
-                headers=headers,
+                headers=ARTICLE_REQUEST_HEADERS,
                 timeout=REQUEST_TIMEOUT, 
-                allow_redirects=True
+                allow_redirects=True,
+                stream=True
             )
-            response.raise_for_status()
-            
-            # Verificar que el contenido sea HTML
-            content_type = response.headers.get('content-type', '').lower()
-            if 'text/html' not in content_type:
-                logger.warning(f"Skipping non-HTML content at {article.url} (Content-Type: {content_type})")
-                return None
+            try:
+                response.raise_for_status()
+                if getattr(response, 'from_cache', False) is True:
+                    logger.debug(f"Artículo servido desde la caché HTTP: {article.url}")
                 
-            # Parsear el HTML con BeautifulSoup
-            soup = BeautifulSoup(response.text, 'lxml')
-            
-            # Extraer título si no lo tenemos
-            if not article.title or article.title == 'Sin título':
-                title_tag = soup.find('title')
-                if title_tag:
-                    article.title = title_tag.get_text(strip=True)
-                else:
-                    # Intentar encontrar el título en meta tags
-                    og_title = soup.find('meta', property='og:title')
-                    if og_title and og_title.get('content'):
-                        article.title = og_title['content'].strip()
-                    else:
-                        article.title = 'Sin título'
-            
-            # Extraer descripción
-            description = ''
-            meta_desc = soup.find('meta', {'name': 'description'}) or \
-                       soup.find('meta', {'property': 'og:description'})
-            if meta_desc and meta_desc.get('content'):
-                description = meta_desc['content'].strip()
-            article.description = description
-            
-            # Extraer imagen destacada si no la tenemos
-            if not article.image_url:
-                og_image = soup.find('meta', property='og:image')
-                if og_image and og_image.get('content'):
-                    article.image_url = og_image['content']
-                else:
-                    # Intentar encontrar la primera imagen grande
-                    img = soup.find('img', {'src': True})
-                    if img:
-                        article.image_url = urljoin(article.url, img['src'])
-            
-            # Extraer fecha de publicación si no la tenemos
-            if not article.published_date:
-                # Buscar en meta tags comunes de fecha
-                date_selectors = [
-                    {'name': 'article:published_time'},
-                    {'property': 'article:published_time'},
-                    {'name': 'date'},
-                    {'property': 'og:published_time'},
-                    {'name': 'publish-date'},
-                    {'name': 'pubdate'},
-                    {'class': 'date-published'},
-                    {'class': 'entry-date'},
-                    {'class': 'published'},
-                ]
+                # Verificar que el contenido sea HTML
+                content_type = response.headers.get('content-type', '').lower()
+                if 'text/html' not in content_type:
+                    logger.warning(f"Skipping non-HTML content at {article.url} (Content-Type: {content_type})")
+                    self._skipped_urls.add(article.url)
+                    return None
                 
-                for selector in date_selectors:
-                    try:
-                        date_tag = soup.find(attrs=selector)
-                        if date_tag and date_tag.get('content'):
-                            date_str = date_tag['content']
-                            article.published_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                            break
-                        elif date_tag and date_tag.text.strip():
-                            # Intentar parsear la fecha del texto
-                            date_str = date_tag.text.strip()
-                            # Aquí podrías agregar más formatos de fecha según sea necesario
-                            for fmt in ('%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%d', '%d/%m/%Y'):
-                                try:
-                                    article.published_date = datetime.strptime(date_str, fmt)
-                                    break
-                                except ValueError:
-                                    continue
-                            if article.published_date:
-                                break
-                    except Exception as e:
-                        logger.debug(f"Error parsing date with selector {selector}: {str(e)}")
-                        continue
+                content = _read_capped(response, MAX_PAGE_BYTES)
+                if content is None:
+                    logger.warning(f"Skipping page larger than {MAX_PAGE_BYTES} bytes at {article.url}")
+                    self._skipped_urls.add(article.url)
+                    return None
+            finally:
+                response.close()
             
+            self._parse_article_html(article, response, content)
             logger.info(f"Successfully extracted article: {article.title}")
             return article
             
@@ -699,8 +1063,141 @@ class DiscoverMonitor:
             logger.error(f"Unexpected error processing {article.url}: {str(e)}", exc_info=True)
             return None
 
-    def load_existing_data(self) -> pd.DataFrame:
-        """Load existing articles data from CSV if it exists.
+    def extract_articles_bulk(self, articles: List[Article]) -> Dict[Future, Article]:
+        """Lanza la extracción de varios artículos a la vez en el pool compartido.
+        
+        Todas las descargas quedan en vuelo simultáneamente, con un máximo de
+        MAX_REQUESTS_PER_HOST por host. Los artículos que superan el límite
+        esperan en una cola propia de su host (no en el pool), de modo que no
+        retrasan las tareas de otros sitios.
+        
+        Args:
+            articles: Artículos a completar
+            
+        Returns:
+            Diccionario futuro -> artículo; cada futuro devuelve el resultado
+            de extract_article_info
+        """
+        futures = {}
+        hosts = set()
+        with self._host_slots_lock:
+            for article in articles:
+                future = Future()
+                futures[future] = article
+                host = _url_parts(article.url)[0]
+                self._host_queues.setdefault(host, deque()).append((article, future))
+                hosts.add(host)
+        for host in hosts:
+            self._dispatch_host_extractions(host)
+        return futures
+
+    def _dispatch_host_extractions(self, host: str) -> None:
+        """Envía al pool artículos en espera de un host mientras tenga huecos libres."""
+        while True:
+            with self._host_slots_lock:
+                queue = self._host_queues.get(host)
+                if not queue or self._host_active.get(host, 0) >= MAX_REQUESTS_PER_HOST:
+                    return
+                article, future = queue.popleft()
+                if not queue:
+                    del self._host_queues[host]
+                self._host_active[host] = self._host_active.get(host, 0) + 1
+            
+            if not future.set_running_or_notify_cancel():
+                self._release_host_slot(host)
+                continue
+            try:
+                task = self._executor.submit(self.extract_article_info, article)
+            except RuntimeError as e:
+                # Pool cerrado
+                self._release_host_slot(host)
+                future.set_exception(e)
+                continue
+            task.add_done_callback(partial(self._finish_host_extraction, host, future))
+
+    def _release_host_slot(self, host: str) -> None:
+        """Libera un hueco de descarga de un host."""
+        with self._host_slots_lock:
+            self._host_active[host] -= 1
+            if not self._host_active[host]:
+                del self._host_active[host]
+
+    def _finish_host_extraction(self, host: str, future: Future, task: Future) -> None:
+        """Traslada el resultado de una descarga y lanza la siguiente del mismo host."""
+        self._release_host_slot(host)
+        self._dispatch_host_extractions(host)
+        try:
+            future.set_result(task.result())
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _parse_article_html(self, article: Article, response, content: Optional[bytes] = None) -> Article:
+        """Completa un artículo con los datos del HTML ya descargado.
+        
+        Args:
+            article: Artículo a completar (se modifica in situ)
+            response: Respuesta HTTP con el HTML del artículo
+            content: Cuerpo ya leído de la respuesta (por defecto, response.content)
+            
+        Returns:
+            El mismo artículo, actualizado
+        """
+        # Parsear el HTML con lxml
+        tree = _parse_html(response, content)
+        
+        # Extraer título si no lo tenemos
+        if not article.title or article.title == 'Sin título':
+            title_tag = _first_node(tree, _FIRST_TITLE_XPATH)
+            if title_tag is not None:
+                article.title = title_tag.text_content().strip()
+            else:
+                # Intentar encontrar el título en meta tags
+                og_title = _first_node(tree, _FIRST_META_PROPERTY_XPATH, value='og:title')
+                if og_title is not None and og_title.get('content'):
+                    article.title = og_title.get('content').strip()
+                else:
+                    article.title = 'Sin título'
+        
+        # Extraer descripción
+        description = ''
+        meta_desc = _first_node(tree, _FIRST_META_NAME_XPATH, value='description')
+        if meta_desc is None:
+            meta_desc = _first_node(tree, _FIRST_META_PROPERTY_XPATH, value='og:description')
+        if meta_desc is not None and meta_desc.get('content'):
+            description = meta_desc.get('content').strip()
+        article.description = description
+        
+        # Extraer imagen destacada si no la tenemos
+        if not article.image_url:
+            og_image = _first_node(tree, _FIRST_META_PROPERTY_XPATH, value='og:image')
+            if og_image is not None and og_image.get('content'):
+                article.image_url = og_image.get('content')
+            else:
+                # Intentar encontrar la primera imagen grande
+                img = _first_node(tree, _FIRST_IMG_XPATH)
+                if img is not None:
+                    article.image_url = urljoin(article.url, img.get('src'))
+        
+        # Extraer fecha de publicación si no la tenemos
+        if not article.published_date:
+            # Buscar en meta tags comunes de fecha
+            for date_xpath in _DATE_XPATHS:
+                date_tag = _first_node(tree, date_xpath)
+                if date_tag is None:
+                    continue
+                # La fecha está en el atributo content (meta) o en el texto de la etiqueta
+                article.published_date = _parse_date(date_tag.get('content') or date_tag.text_content())
+                if article.published_date:
+                    break
+        
+        return article
+
+    def load_existing_data(self, usecols: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load existing articles data from CSV (or Parquet) if it exists.
+        
+        Args:
+            usecols: Only parse these columns (all of them if None). Other
+                columns are skipped by the reader instead of being built.
         
         Returns:
             pd.DataFrame: DataFrame containing existing articles, or empty DataFrame if file doesn't exist or is corrupted.
@@ -709,7 +1206,9 @@ class DiscoverMonitor:
             return pd.DataFrame()
             
         try:
-            return pd.read_csv(self.output_file)
+            if _is_parquet(self.output_file):
+                return pd.read_parquet(self.output_file, columns=usecols)
+            return pd.read_csv(self.output_file, usecols=usecols)
         except pd.errors.EmptyDataError as e:
             logger.error(f"Error loading {self.output_file}: {str(e)}")
             return pd.DataFrame()
@@ -717,60 +1216,156 @@ class DiscoverMonitor:
             logger.error(f"Unexpected error loading {self.output_file}: {str(e)}")
             return pd.DataFrame()
 
-    def save_articles(self, articles):
-        """Save articles to CSV, appending to existing data.
+    def load_seen_urls(self) -> Set[str]:
+        """Devuelve las URLs canónicas (ver canonicalize_url) de los artículos ya guardados.
         
-        Args:
-            articles: List of Article objects or dictionaries to save
-        """
-        if not articles:
-            return
-            
-        # Convert Article objects to dictionaries if needed
-        if isinstance(articles[0], Article):
-            articles = [article.to_dict() for article in articles]
-            
-        # Convert list of dicts to DataFrame
-        new_df = pd.DataFrame(articles)
+        Se leen del fichero auxiliar seen_urls_file, sin cargar el CSV. Si aún
+        no existe (primera ejecución o CSV previo), se obtienen del CSV con
+        load_existing_data y se crea el fichero para las siguientes ejecuciones.
         
-        # Ensure required columns exist
-        required_columns = ['url', 'title', 'section', 'description', 'source', 
-                          'is_own_site', 'published_date', 'last_modified', 'image_url']
+        Returns:
+            Set[str]: URLs canónicas ya guardadas
+        """
+        if os.path.exists(self.output_file) and os.path.exists(self.seen_urls_file):
+            try:
+                with open(self.seen_urls_file, encoding='utf-8') as f:
+                    urls = set(f.read().splitlines())
+                urls.discard('')
+                return urls
+            except OSError as e:
+                logger.warning(f"Error leyendo {self.seen_urls_file}, se usa el CSV: {str(e)}")
         
-        # Add missing columns with None if they don't exist
-        for col in required_columns:
-            if col not in new_df.columns:
-                new_df[col] = None
+        url_index = self.load_existing_data(usecols=['url'])
+        if url_index.empty or 'url' not in url_index.columns:
+            return set()
+        urls = set(map(canonicalize_url, url_index['url'].dropna().astype(str)))
         
-        # If output file exists, load existing data and merge
         if os.path.exists(self.output_file):
             try:
-                existing_df = pd.read_csv(self.output_file)
-                
-                # Ensure existing data has all required columns
-                for col in required_columns:
-                    if col not in existing_df.columns:
-                        existing_df[col] = None
-                
-                # Concatenate and drop duplicates, keeping the first occurrence (existing data)
-                combined_df = pd.concat([existing_df, new_df])
-                combined_df = combined_df.drop_duplicates(subset=['url'], keep='first')
-            except Exception as e:
-                logger.error(f"Error loading existing articles: {str(e)}")
-                combined_df = new_df
-        else:
-            combined_df = new_df
+                with open(self.seen_urls_file, 'w', encoding='utf-8') as f:
+                    f.writelines(f"{url}\n" for url in urls)
+            except OSError as e:
+                logger.warning(f"No se pudo crear {self.seen_urls_file}: {str(e)}")
+        return urls
+
+    def save_articles(self, articles):
+        """Append articles to the output CSV.
+        
+        Only the given rows are written: the file is opened in append mode and
+        the header is written only when the file is new or empty. Callers are
+        responsible for deduplication (monitor_websites filters against the
+        URLs already stored), so the existing CSV is never re-read here. The
+        saved URLs are also appended, in canonical form, to seen_urls_file for
+        load_seen_urls.
+        
+        If output_file ends in .parquet the articles are stored in Parquet
+        instead; the file cannot be appended to, so it is rewritten with the
+        new rows added (monitor_websites saves once per run).
+        
+        Args:
+            articles: Iterable of Article objects or dictionaries to save.
+                Rows are streamed to the file, so a generator is fine.
+        """
+        rows = (
+            article.to_dict() if isinstance(article, Article) else article
+            for article in articles
+        )
+        first = next(rows, None)
+        if first is None:
+            return
         
         # Create data directory if it doesn't exist
-        os.makedirs(os.path.dirname(self.output_file), exist_ok=True)
+        os.makedirs(os.path.dirname(os.path.abspath(self.output_file)), exist_ok=True)
         
-        # Save to CSV
         try:
-            combined_df.to_csv(self.output_file, index=False)
-            logger.info(f"Saved {len(articles)} articles to {self.output_file}")
+            urls = []
+            if _is_parquet(self.output_file):
+                new_rows = list(chain((first,), rows))
+                new_file = self._append_parquet(new_rows)
+                urls = [row.get('url') for row in new_rows]
+            else:
+                with open(self.output_file, 'a', newline='', encoding='utf-8') as f:
+                    writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS, extrasaction='ignore')
+                    new_file = f.tell() == 0
+                    if new_file:
+                        writer.writeheader()
+                    for row in chain((first,), rows):
+                        writer.writerow(row)
+                        urls.append(row.get('url'))
+            logger.info(f"Saved {len(urls)} articles to {self.output_file}")
         except Exception as e:
             logger.error(f"Error saving articles to {self.output_file}: {str(e)}")
             raise
+        
+        # Mantener al día el fichero de URLs vistas. Si falta y el CSV ya tenía
+        # filas, se deja que load_seen_urls lo reconstruya completo desde el CSV.
+        if new_file or os.path.exists(self.seen_urls_file):
+            try:
+                with open(self.seen_urls_file, 'w' if new_file else 'a', encoding='utf-8') as f:
+                    f.writelines(f"{canonicalize_url(url)}\n" for url in urls if url)
+            except OSError as e:
+                logger.warning(f"No se pudo actualizar {self.seen_urls_file}: {str(e)}")
+
+    def compact_articles(self) -> int:
+        """Deja una sola fila por URL canónica en el archivo de salida, la más reciente.
+        
+        save_articles solo añade filas al final, así que si una URL se guarda
+        más de una vez (por ejemplo, al reprocesarla tras corregir su título)
+        el archivo acumula versiones. Se conserva la de mayor ``timestamp`` de
+        extracción (en caso de empate, la escrita después), en lugar de la
+        primera. Pensado para ejecutarse de vez en cuando, no en cada guardado.
+        
+        Returns:
+            Número de filas eliminadas
+        """
+        df = self.load_existing_data()
+        if df.empty or 'url' not in df.columns:
+            return 0
+        
+        latest = df
+        if 'timestamp' in df.columns:
+            # Las marcas ISO 8601 se ordenan bien como texto; el orden estable
+            # mantiene la última fila escrita en los empates
+            latest = df.sort_values('timestamp', kind='stable', na_position='first')
+        keys = latest['url'].map(lambda url: canonicalize_url(url) if isinstance(url, str) else url)
+        compacted = latest[~keys.duplicated(keep='last')].sort_index()
+        removed = len(df) - len(compacted)
+        if not removed:
+            return 0
+        
+        tmp_file = f"{self.output_file}.tmp"
+        if _is_parquet(self.output_file):
+            compacted.to_parquet(tmp_file, index=False, compression=PARQUET_COMPRESSION)
+        else:
+            compacted.to_csv(tmp_file, index=False, encoding='utf-8')
+        os.replace(tmp_file, self.output_file)
+        
+        # El conjunto de URLs no cambia, pero se regenera por si estaba desfasado
+        try:
+            with open(self.seen_urls_file, 'w', encoding='utf-8') as f:
+                f.writelines(f"{canonicalize_url(url)}\n"
+                             for url in compacted['url'].dropna().astype(str))
+        except OSError as e:
+            logger.warning(f"No se pudo actualizar {self.seen_urls_file}: {str(e)}")
+        
+        logger.info(f"Compactado {self.output_file}: {removed} filas duplicadas eliminadas")
+        return removed
+
+    def _append_parquet(self, rows: List[Dict]) -> bool:
+        """Añade filas al archivo Parquet de salida reescribiéndolo de forma atómica.
+        
+        Returns:
+            True si el archivo no existía o estaba vacío
+        """
+        df = pd.DataFrame.from_records(rows, columns=CSV_COLUMNS)
+        existing = pd.read_parquet(self.output_file) if os.path.exists(self.output_file) else None
+        new_file = existing is None or existing.empty
+        if not new_file:
+            df = pd.concat([existing, df], ignore_index=True)
+        tmp_file = f"{self.output_file}.tmp"
+        df.to_parquet(tmp_file, index=False, compression=PARQUET_COMPRESSION)
+        os.replace(tmp_file, self.output_file)
+        return new_file
 
     def monitor_websites(self, max_articles_per_site: int = 50) -> None:
         """
@@ -784,83 +1379,101 @@ class DiscoverMonitor:
         # Crear directorio de datos si no existe
         os.makedirs(DATA_DIR, exist_ok=True)
         
-        # Cargar datos existentes
-        existing_articles = self.load_existing_data()
-        existing_urls = set(existing_articles['url'].tolist()) if not existing_articles.empty else set()
+        # URLs ya guardadas en ejecuciones anteriores
+        existing_urls = self.load_seen_urls()
         
-        # Estadísticas
-        total_new = 0
+        # Extracciones en vuelo de todos los sitios: futuro -> (sitio, artículo)
+        pending: Dict[Future, Tuple[SiteSpec, Article]] = {}
         
-        # Procesar cada sitio web
-        for site in tqdm(WEBSITES, desc="Sitios web"):
+        # Procesar cada sitio web: las descargas de artículos se lanzan en el
+        # pool compartido sin esperar, de modo que un sitio lento se solapa
+        # con la lectura de los sitemaps de los siguientes
+        for site in _progress(WEBSITES, len(WEBSITES), "Sitios web"):
             try:
-                site_name = site['name']
+                site_name = site.name
                 logger.info(f"Procesando sitio: {site_name}")
                 
                 # Obtener artículos del sitemap
-                articles = self.fetch_sitemap(site['sitemap'])
+                articles = self.fetch_sitemap(site.sitemap)
                 
                 if not articles:
-                    logger.warning(f"No se encontraron artículos en el sitemap de {site_name}")
+                    if self._sitemap_unchanged(site.sitemap):
+                        # Con GET condicional es lo habitual: nada nuevo que procesar
+                        logger.info(f"Sitemap de {site_name} sin cambios desde la última ejecución")
+                    else:
+                        logger.warning(f"No se encontraron artículos en el sitemap de {site_name}")
                     continue
                 
-                # Establecer información del sitio en los artículos
+                # Filtrar artículos nuevos en una sola pasada, etiquetando solo
+                # los que se quedan; se para en el primero que ya no cabe
+                new_articles = []
                 for article in articles:
+                    key = canonicalize_url(article.url)
+                    if key in existing_urls:
+                        continue
+                    if len(new_articles) == max_articles_per_site:
+                        # Quedan artículos para la próxima ejecución: los sitemaps
+                        # deben descargarse de nuevo aunque no cambien
+                        self._forget_sitemap_meta(site.sitemap)
+                        break
                     article.source = site_name
-                    article.is_own_site = site.get('is_own_site', False)
-                
-                # Filtrar artículos nuevos
-                new_articles = [
-                    article for article in articles 
-                    if article.url not in existing_urls
-                ][:max_articles_per_site]
+                    article.is_own_site = site.is_own_site
+                    new_articles.append(article)
+                    # Evitar variantes de la misma URL en el sitemap y que otro
+                    # sitio vuelva a lanzarla en esta ejecución
+                    existing_urls.add(key)
                 
                 if not new_articles:
                     logger.info(f"No hay artículos nuevos en {site_name}")
                     continue
                 
-                # Procesar artículos en paralelo
-                processed_articles = []
-                with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-                    # Crear tareas para extraer información de cada artículo
-                    future_to_article = {
-                        executor.submit(self.extract_article_info, article): article
-                        for article in new_articles
-                    }
-                    
-                    # Procesar resultados a medida que estén disponibles
-                    for future in tqdm(
-                        as_completed(future_to_article),
-                        total=len(new_articles),
-                        desc=f"Procesando {site_name}",
-                        leave=False
-                    ):
-                        article = future_to_article[future]
-                        try:
-                            result = future.result()
-                            if result:
-                                processed_articles.append(result)
-                                existing_urls.add(result.url)  # Evitar duplicados en esta ejecución
-                        except Exception as e:
-                            logger.error(f"Error procesando artículo {article.url}: {str(e)}")
-                
-                # Guardar artículos procesados
-                if processed_articles:
-                    self.save_articles(processed_articles)
-                    total_new += len(processed_articles)
-                    logger.info(f"Añadidos {len(processed_articles)} nuevos artículos de {site_name}")
+                for future, article in self.extract_articles_bulk(new_articles).items():
+                    pending[future] = (site, article)
                 
             except Exception as e:
-                logger.error(f"Error monitoreando {site.get('name', 'sitio desconocido')}: {str(e)}", exc_info=True)
+                logger.error(f"Error monitoreando {site.name}: {str(e)}", exc_info=True)
+        
+        # Recoger los resultados de todos los sitios a medida que terminan
+        run_articles: List[Article] = []
+        added_per_site: Dict[str, int] = {}
+        # Sitemaps con artículos que no se pudieron extraer
+        failed_sitemaps: Set[str] = set()
+        for future in _progress(as_completed(pending), len(pending), "Procesando artículos"):
+            site, article = pending[future]
+            try:
+                result = future.result()
+                if result:
+                    run_articles.append(result)
+                    added_per_site[site.name] = added_per_site.get(site.name, 0) + 1
+                else:
+                    failed_sitemaps.add(site.sitemap)
+            except Exception as e:
+                logger.error(f"Error procesando artículo {article.url}: {str(e)}")
+                failed_sitemaps.add(site.sitemap)
+        
+        for site_name, added in added_per_site.items():
+            logger.info(f"Añadidos {added} nuevos artículos de {site_name}")
+        
+        # Los artículos fallidos no quedan como vistos: sus sitemaps deben
+        # descargarse de nuevo en la próxima ejecución para reintentarlos
+        for sitemap_url in failed_sitemaps:
+            self._forget_sitemap_meta(sitemap_url)
+        
+        # Una sola escritura (en modo append) para todos los sitios
+        if run_articles:
+            self.save_articles(run_articles)
+        self._save_sitemap_meta()
         
-        logger.info(f"Monitoreo completado. Se añadieron {total_new} artículos nuevos en total.")
+        logger.info(f"Monitoreo completado. Se añadieron {len(run_articles)} artículos nuevos en total.")
 
-    def run(self, max_articles_per_site: int = 50):
+    def run(self, max_articles_per_site: int = 50, compact: bool = False):
         """
         Ejecuta el proceso de monitoreo completo.
         
         Args:
             max_articles_per_site: Número máximo de artículos a procesar por sitio
+            compact: Si es True, al terminar se compacta el archivo de salida
+                (ver compact_articles)
         """
         start_time = datetime.now()
         logger.info("=" * 80)
@@ -870,6 +1483,8 @@ class DiscoverMonitor:
         try:
             # Ejecutar el monitoreo de sitios web
             self.monitor_websites(max_articles_per_site)
+            if compact:
+                self.compact_articles()
             
             # Calcular tiempo de ejecución
             execution_time = datetime.now() - start_time
@@ -884,5 +1499,5 @@ class DiscoverMonitor:
             raise
 
 if __name__ == "__main__":
-    monitor = DiscoverMonitor()
-    monitor.run()
\ No newline at end of file
+    with DiscoverMonitor() as monitor:
+        monitor.run()
\ No newline at end of file
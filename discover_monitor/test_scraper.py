@@ -24,10 +24,9 @@ def main():
     test_sites = WEBSITES[:2]
     
     # Configurar el monitor con los sitios de prueba
-    monitor = DiscoverMonitor()
-    
-    # Probar con un máximo de 3 artículos por sitio
-    monitor.run(max_articles_per_site=3)
+    with DiscoverMonitor() as monitor:
+        # Probar con un máximo de 3 artículos por sitio
+        monitor.run(max_articles_per_site=3)
 
 if __name__ == "__main__":
     # Crear directorio de datos si no existe
@@ -0,0 +1,55 @@
+"""Configuración compartida para las pruebas."""
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+import streamlit as st
+
+
+@pytest.fixture(autouse=True)
+def clear_streamlit_cache():
+    """Limpia la caché de st.cache_data para que las pruebas no compartan resultados."""
+    st.cache_data.clear()
+    yield
+    st.cache_data.clear()
+
+
+@pytest.fixture(scope="session")
+def sample_data():
+    """Datos de ejemplo compartidos por toda la sesión.
+    
+    Se construyen una sola vez y con fechas fijas; ninguna prueba debe
+    modificarlos (la aplicación nunca altera el DataFrame que recibe).
+    """
+    return pd.DataFrame({
+        'title': ['Test Article 1', 'Test Article 2'],
+        'source': ['Source A', 'Source B'],
+        'section': ['News', 'Sports'],
+        'published_date': [pd.Timestamp('2023-01-01'), pd.Timestamp('2023-01-02')],
+        'url': ['http://example.com/1', 'http://example.com/2'],
+        'description': ['Test description 1', 'Test description 2'],
+        'image_url': ['http://example.com/img1.jpg', 'http://example.com/img2.jpg'],
+        'author': ['Author 1', 'Author 2']
+    })
+
+
+class _SidebarStub:
+    """Sustituto ligero de st.sidebar con solo los métodos que usa la aplicación.
+    
+    Cada método es un MagicMock, así que admite side_effect, return_value y
+    las aserciones habituales, sin que MagicMock cree atributos al vuelo.
+    """
+    __slots__ = ('button', 'selectbox', 'date_input', 'warning', 'markdown',
+                 'subheader', 'download_button')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, MagicMock())
+
+
+@pytest.fixture
+def sidebar_stub(monkeypatch):
+    """Instala un _SidebarStub como st.sidebar de la aplicación y lo devuelve."""
+    stub = _SidebarStub()
+    monkeypatch.setattr('discover_monitor.app.st.sidebar', stub)
+    return stub
@@ -3,7 +3,7 @@ import sys
 import pytest
 import pandas as pd
 import tempfile
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import ANY, patch, MagicMock, mock_open
 from pathlib import Path
 import streamlit as st
 
@@ -21,67 +21,57 @@ TEST_DATA = pd.DataFrame({
 
 # Fixture to set up the test environment
 @pytest.fixture
-def setup_test_environment():
+def setup_test_environment(monkeypatch):
     # Create a mock for the load_data function
     with patch('discover_monitor.app.load_data') as mock_load_data:
         # Set up the mock to return test data by default
         mock_load_data.return_value = TEST_DATA.copy()
         
-        # Create a proper mock for st.session_state that supports attribute access
-        class SessionState(dict):
-            def __init__(self, *args, **kwargs):
-                super().__init__(*args, **kwargs)
-                self.__dict__ = self
-                
-        st.session_state = SessionState()
-        st.session_state.df = pd.DataFrame()  # Initialize with empty DataFrame
-        
         # Create a mock for st.sidebar
-        st.sidebar = MagicMock()
+        mock_sidebar = MagicMock()
+        monkeypatch.setattr(st, 'sidebar', mock_sidebar)
         st.sidebar.button.return_value = False
         st.sidebar.selectbox.return_value = 'Todos'
         st.sidebar.date_input.return_value = [pd.Timestamp('2023-01-01'), pd.Timestamp('2023-01-02')]
-        st.sidebar.subheader = MagicMock()
-        st.sidebar.markdown = MagicMock()
         
         # Create a mock for st.spinner
-        st.spinner = MagicMock()
+        monkeypatch.setattr(st, 'spinner', MagicMock())
         
         # Create a mock for st.rerun
-        st.rerun = MagicMock()
+        monkeypatch.setattr(st, 'rerun', MagicMock())
         
         # Create a mock for st.error
-        st.error = MagicMock()
+        monkeypatch.setattr(st, 'error', MagicMock())
         
         # Create a mock for st.success
-        st.success = MagicMock()
+        monkeypatch.setattr(st, 'success', MagicMock())
         
         # Create a mock for st.warning
-        st.warning = MagicMock()
+        monkeypatch.setattr(st, 'warning', MagicMock())
         
         # Create a mock for st.info
-        st.info = MagicMock()
+        monkeypatch.setattr(st, 'info', MagicMock())
         
         # Create a mock for st.columns
-        st.columns = MagicMock(return_value=[MagicMock(), MagicMock(), MagicMock()])
+        monkeypatch.setattr(st, 'columns', MagicMock(return_value=[MagicMock(), MagicMock(), MagicMock()]))
         
         # Create a mock for st.tabs
-        st.tabs = MagicMock(return_value=[MagicMock(), MagicMock(), MagicMock()])
+        monkeypatch.setattr(st, 'tabs', MagicMock(return_value=[MagicMock(), MagicMock(), MagicMock()]))
         
         # Create a mock for st.metric
-        st.metric = MagicMock()
+        monkeypatch.setattr(st, 'metric', MagicMock())
         
         # Create a mock for st.markdown
-        st.markdown = MagicMock()
+        monkeypatch.setattr(st, 'markdown', MagicMock())
         
         # Create a mock for st.dataframe
-        st.dataframe = MagicMock()
+        monkeypatch.setattr(st, 'dataframe', MagicMock())
         
         # Create a mock for st.download_button
-        st.download_button = MagicMock(return_value=True)
+        monkeypatch.setattr(st, 'download_button', MagicMock(return_value=True))
         
         # Create a mock for st.selectbox
-        st.selectbox = MagicMock(return_value='CSV')
+        monkeypatch.setattr(st, 'selectbox', MagicMock(return_value='CSV'))
         
         # Create a mock for tempfile.NamedTemporaryFile
         with patch('tempfile.NamedTemporaryFile') as mock_tempfile:
@@ -129,7 +119,13 @@ def test_load_data_success(mock_data_dir, mock_read_csv):
     mock_file.exists.assert_called_once()
     
     # Verify read_csv was called with the correct arguments
-    mock_read_csv.assert_called_once_with(mock_file, parse_dates=['published_date'])
+    mock_read_csv.assert_called_once_with(
+        mock_file,
+        engine='pyarrow',
+        usecols=app.DATA_COLUMNS,
+        dtype=app.DATA_DTYPES,
+        parse_dates=['published_date']
+    )
 
 @patch('pandas.read_csv')
 @patch('discover_monitor.app.DATA_DIR')
@@ -197,7 +193,13 @@ def test_load_data_exception_handling(mock_data_dir, mock_read_csv):
         mock_file.exists.assert_called_once()
         
         # Verify read_csv was called with the correct arguments
-        mock_read_csv.assert_called_once_with(mock_file, parse_dates=['published_date'])
+        mock_read_csv.assert_called_once_with(
+            mock_file,
+            engine='pyarrow',
+            usecols=app.DATA_COLUMNS,
+            dtype=app.DATA_DTYPES,
+            parse_dates=['published_date']
+        )
         
         # Verify the error was logged
         mock_logger.error.assert_called_once_with(f"Error al cargar los datos: {test_exception}")
@@ -228,21 +230,22 @@ def test_get_data_loaded(setup_test_environment):
     mock_load_data.assert_called_once()
 
 
-def test_get_data_cached(setup_test_environment):
-    """Test that get_data uses cached data on subsequent calls."""
+@patch('discover_monitor.app.get_data_mtime')
+@patch('pandas.read_csv')
+@patch('discover_monitor.app.DATA_DIR')
+def test_get_data_cached(mock_data_dir, mock_read_csv, mock_mtime):
+    """Test that get_data reuses the cached data until the CSV changes."""
     # Arrange
-    mock_load_data = setup_test_environment
-    
-    # Set up the mock to return test data
-    mock_load_data.return_value = TEST_DATA.copy()
+    mock_file = MagicMock()
+    mock_file.exists.return_value = True
+    mock_data_dir.__truediv__.return_value = mock_file
+    mock_read_csv.return_value = TEST_DATA.copy()
+    mock_mtime.return_value = 1.0
 
     # First call should load data
     result1 = app.get_data()
 
-    # Reset the mock to track subsequent calls
-    mock_load_data.reset_mock()
-
-    # Second call should use cached data
+    # Second call with the same mtime should use cached data
     result2 = app.get_data()
 
     # Assert
@@ -253,12 +256,15 @@ def test_get_data_cached(setup_test_environment):
     assert 'section' in result2.columns
     assert 'published_date' in result2.columns
     assert 'url' in result2.columns
+    pd.testing.assert_frame_equal(result1, result2)
     
-    # Verify load_data was not called again
-    mock_load_data.assert_not_called()
-    
-    # Verify both calls return the same DataFrame
-    assert result1 is result2
+    # Verify the CSV was read only once
+    mock_read_csv.assert_called_once()
+
+    # A new mtime invalidates the cache
+    mock_mtime.return_value = 2.0
+    app.get_data()
+    assert mock_read_csv.call_count == 2
 
 
 def test_generate_source_chart():
@@ -316,7 +322,7 @@ def test_generate_section_chart():
     assert 'yaxis' in fig.layout
 
 
-@patch('discover_monitor.app.FPDF')
+@patch('fpdf.FPDF')
 def test_generate_pdf_report(mock_fpdf, setup_test_environment, tmp_path):
     """Test that generate_pdf_report creates a PDF file."""
     # Arrange
@@ -351,22 +357,13 @@ def test_main_flow_with_data(setup_test_environment):
     mock_load_data.return_value = TEST_DATA.copy()
 
     # Act - Simulate the main application flow
-    result = app.get_data()
+    with patch('discover_monitor.app.get_data_mtime', return_value=1.0):
+        result = app.get_data()
 
     # Assert
-    mock_load_data.assert_called_once()
+    mock_load_data.assert_called_once_with(1.0)
     assert not result.empty
-    assert 'df' in st.session_state
-    assert not st.session_state.df.empty
-    
-    # Verify the session state was updated
-    assert st.session_state.df is result
-    
-    # Test session state caching
-    mock_load_data.reset_mock()
-    cached_result = app.get_data()
-    mock_load_data.assert_not_called()
-    assert not cached_result.empty
+    assert len(result) == 2
 
 
 @patch('discover_monitor.app.st.warning')
@@ -376,16 +373,11 @@ def test_main_flow_no_data(mock_warning, setup_test_environment):
     mock_load_data = setup_test_environment
     mock_load_data.return_value = pd.DataFrame()  # Empty DataFrame
     
-    # Reset the session state
-    st.session_state.clear()
-    
     # Act - Simulate the main application flow
     result = app.get_data()
     
     # Assert
     mock_load_data.assert_called_once()
-    assert 'df' in st.session_state
-    assert st.session_state.df.empty
     assert result.empty
     
     # Test that the UI handles empty data gracefully
@@ -399,12 +391,9 @@ def test_main_flow_no_data(mock_warning, setup_test_environment):
     assert 'No hay datos que coincidan con los filtros seleccionados' in args[0]
 
 
-@patch('discover_monitor.app.os.unlink')
-@patch('builtins.open', new_callable=mock_open)
 @patch('discover_monitor.app.st.selectbox')
 @patch('discover_monitor.app.st.success')
-@patch('discover_monitor.app.st.sidebar')
-def test_export_functions(mock_sidebar, mock_success, mock_selectbox, mock_file_open, mock_unlink, setup_test_environment, tmp_path):
+def test_export_functions(mock_success, mock_selectbox, setup_test_environment, sidebar_stub):
     """Test the export functionality."""
     # Setup test data
     test_df = TEST_DATA.copy()
@@ -415,88 +404,152 @@ def test_export_functions(mock_sidebar, mock_success, mock_selectbox, mock_file_
     
     # Create a mock for the download button
     mock_download_button = MagicMock(return_value=True)
-    mock_sidebar.download_button = mock_download_button
+    sidebar_stub.download_button = mock_download_button
     
-    # Mock the tempfile.NamedTemporaryFile
-    mock_temp_file = MagicMock()
-    mock_temp_file.name = str(tmp_path / 'temp_file')
+    # Test CSV export
+    with patch('pandas.DataFrame.to_csv') as mock_to_csv:
+        # Mock the button to return True only for CSV button
+        sidebar_stub.button.side_effect = lambda label, **kwargs: label == "Exportar a CSV"
+        
+        # Reset mocks
+        mock_download_button.reset_mock()
+        mock_success.reset_mock()
+        
+        # Call the export function
+        app.export_data(test_df)
+        
+        # Verify to_csv was called
+        mock_to_csv.assert_called_once()
+        
+        # Verify download button was called once for the download
+        assert mock_download_button.call_count == 1, f"Expected 1 call, got {mock_download_button.call_count}"
+        
+        # Verify success message was shown
+        mock_success.assert_called_with("Datos exportados a CSV exitosamente")
     
-    # Create a real temporary file for testing
-    temp_file_path = tmp_path / 'temp_file.csv'
-    temp_file_path.write_text('test data')
+    # Test Excel export
+    with patch('pandas.DataFrame.to_excel') as mock_to_excel:
+        # Mock the button to return True only for Excel button
+        sidebar_stub.button.side_effect = lambda label, **kwargs: label == "Exportar a Excel"
+        
+        # Reset mocks
+        mock_download_button.reset_mock()
+        mock_success.reset_mock()
+        
+        # Call the export function for Excel
+        app.export_data(test_df)
+        
+        # Verify to_excel was called
+        mock_to_excel.assert_called_once()
+        
+        # Verify download button was called once for the download
+        assert mock_download_button.call_count == 1, f"Expected 1 call, got {mock_download_button.call_count}"
+        
+        # Verify success message was shown
+        mock_success.assert_called_with("Datos exportados a Excel exitosamente")
     
-    # Mock the return value of NamedTemporaryFile
-    with patch('tempfile.NamedTemporaryFile', return_value=mock_temp_file) as mock_tempfile:
-        # Mock the __enter__ method to return the mock file
-        mock_tempfile.return_value.__enter__.return_value = mock_temp_file
+    # Test PDF export
+    with patch('discover_monitor.app.generate_pdf_bytes', return_value=b'%PDF') as mock_generate_pdf:
+        # Mock the button to return True only for PDF button
+        sidebar_stub.button.side_effect = lambda label, **kwargs: label == "Generar Informe PDF"
         
-        # Test CSV export
-        with patch('pandas.DataFrame.to_csv') as mock_to_csv:
-            # Mock the button to return True only for CSV button
-            mock_sidebar.button.side_effect = lambda label, **kwargs: label == "Exportar a CSV"
-            
-            # Reset mocks
-            mock_download_button.reset_mock()
-            mock_success.reset_mock()
-            
-            # Call the export function
-            app.export_data(test_df)
-            
-            # Verify to_csv was called
-            mock_to_csv.assert_called_once()
-            
-            # Verify download button was called once for the download
-            assert mock_download_button.call_count == 1, f"Expected 1 call, got {mock_download_button.call_count}"
-            
-            # Verify success message was shown
-            mock_success.assert_called_with("Datos exportados a CSV exitosamente")
+        # Reset mocks
+        mock_download_button.reset_mock()
+        mock_success.reset_mock()
         
-        # Test Excel export
-        with patch('pandas.DataFrame.to_excel') as mock_to_excel:
-            # Mock the button to return True only for Excel button
-            mock_sidebar.button.side_effect = lambda label, **kwargs: label == "Exportar a Excel"
-            
-            # Reset mocks
-            mock_download_button.reset_mock()
-            mock_success.reset_mock()
-            
-            # Call the export function for Excel
-            app.export_data(test_df)
-            
-            # Verify to_excel was called
-            mock_to_excel.assert_called_once()
-            
-            # Verify download button was called once for the download
-            assert mock_download_button.call_count == 1, f"Expected 1 call, got {mock_download_button.call_count}"
-            
-            # Verify success message was shown
-            mock_success.assert_called_with("Datos exportados a Excel exitosamente")
+        # Call the export function for PDF
+        app.export_data(test_df)
         
-        # Test PDF export
-        with patch('discover_monitor.app.generate_pdf_report') as mock_generate_pdf:
-            # Mock the button to return True only for PDF button
-            mock_sidebar.button.side_effect = lambda label, **kwargs: label == "Generar Informe PDF"
-            
-            # Reset mocks
-            mock_download_button.reset_mock()
-            mock_success.reset_mock()
-            
-            # Call the export function for PDF
-            app.export_data(test_df)
-            
-            # Verify generate_pdf_report was called
-            mock_generate_pdf.assert_called_once()
-            
-            # Verify download button was called once for the download
-            assert mock_download_button.call_count == 1, f"Expected 1 call, got {mock_download_button.call_count}"
-            
-            # Verify success message was shown
-            mock_success.assert_called_with("Informe PDF generado exitosamente")
+        # Verify the PDF was generated in memory
+        mock_generate_pdf.assert_called_once()
+        
+        # Verify download button was called once for the download
+        assert mock_download_button.call_count == 1, f"Expected 1 call, got {mock_download_button.call_count}"
+        
+        # Verify success message was shown
+        mock_success.assert_called_with("Informe PDF generado exitosamente")
+
+
+@patch('discover_monitor.app.st.success')
+def test_export_csv_in_memory(mock_success, sidebar_stub):
+    """El CSV se genera en memoria y se entrega como bytes al botón de descarga."""
+    sidebar_stub.button.side_effect = lambda label, **kwargs: label == "Exportar a CSV"
 
+    app.export_data(TEST_DATA)
+
+    data = sidebar_stub.download_button.call_args.kwargs['data']
+    assert data == TEST_DATA.to_csv(index=False).encode('utf-8')
+    mock_success.assert_called_with("Datos exportados a CSV exitosamente")
+
+
+@patch('discover_monitor.app.st.success')
+def test_export_excel_uses_xlsxwriter(mock_success, sidebar_stub):
+    """El Excel se escribe con xlsxwriter y se entrega como bytes."""
+    sidebar_stub.button.side_effect = lambda label, **kwargs: label == "Exportar a Excel"
 
+    with patch('pandas.DataFrame.to_excel', autospec=True) as mock_to_excel:
+        app.export_data(TEST_DATA)
 
+    assert mock_to_excel.call_args.kwargs['engine'] == 'xlsxwriter'
+    assert isinstance(sidebar_stub.download_button.call_args.kwargs['data'], bytes)
+    mock_success.assert_called_with("Datos exportados a Excel exitosamente")
 
-def test_setup_sidebar_filters():
+
+def test_summarize_data_counts():
+    """summarize_data calcula total y conteos una sola vez, sin categorías vacías."""
+    df = TEST_DATA.astype({'source': 'category', 'section': 'category'})
+    df['section'] = df['section'].cat.add_categories(['sin_articulos'])
+
+    summary = app.summarize_data(df)
+
+    assert summary['total'] == 2
+    assert summary['source_counts'].to_dict() == {'test_source': 2}
+    assert set(summary['section_counts'].index) == {'test_section', 'test_section_2'}
+
+    # Sin columnas de agrupación los conteos quedan vacíos
+    empty = app.summarize_data(TEST_DATA[['title']])
+    assert empty['source_counts'].empty and empty['section_counts'].empty
+
+
+def test_heavy_dependencies_imported_lazily():
+    """Importar la app no debe cargar plotly.express ni fpdf."""
+    import subprocess
+    code = (
+        "import sys; import discover_monitor.app; "
+        "print(any(m.startswith(('plotly.express', 'fpdf')) for m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=Path(__file__).resolve().parents[2])
+    assert result.stdout.strip().splitlines()[-1] == 'False'
+
+
+@patch('discover_monitor.app.st.success')
+def test_export_pdf_in_memory(mock_success, sidebar_stub):
+    """El PDF se genera en memoria y se entrega como bytes al botón de descarga."""
+    sidebar_stub.button.side_effect = lambda label, **kwargs: label == "Generar Informe PDF"
+
+    app.export_data(TEST_DATA)
+
+    data = sidebar_stub.download_button.call_args.kwargs['data']
+    assert isinstance(data, bytes)
+    assert data.startswith(b'%PDF')
+    mock_success.assert_called_with("Informe PDF generado exitosamente")
+
+
+def test_main_renders_dashboard_as_fragment():
+    """Dentro de una sesión de Streamlit el panel se ejecuta como fragmento."""
+    with patch('discover_monitor.app.get_data', return_value=TEST_DATA), \
+         patch('discover_monitor.app.get_script_run_ctx', return_value=MagicMock()), \
+         patch('discover_monitor.app._dashboard_fragment') as mock_fragment, \
+         patch('discover_monitor.app.render_dashboard') as mock_render, \
+         patch('discover_monitor.app.st'):
+        app.main()
+
+    mock_fragment.assert_called_once_with(TEST_DATA, ANY)
+    mock_render.assert_not_called()
+
+
+def test_setup_sidebar_filters(sidebar_stub):
     """Test the setup_sidebar_filters function."""
     # Create test data
     test_df = pd.DataFrame({
@@ -507,32 +560,59 @@ def test_setup_sidebar_filters():
         'url': ['http://example.com/1', 'http://example.com/2', 'http://example.com/3']
     })
     
-    # Mock st.sidebar methods
-    with patch('discover_monitor.app.st.sidebar') as mock_sidebar:
-        # Configure the mock
-        mock_sidebar.selectbox.return_value = 'Source A'
-        mock_sidebar.date_input.return_value = (
-            pd.Timestamp('2023-01-01').to_pydatetime(),
-            pd.Timestamp('2023-01-03').to_pydatetime()
-        )
-        
-        # Call the function
-        filters = app.setup_sidebar_filters(test_df)
-        
-        # Assert the expected filters were set
-        assert filters['source'] == 'Source A'
-        # Convert to datetime.date for comparison
-        start_date = pd.Timestamp(filters['start_date']).date() if not isinstance(filters['start_date'], pd.Timestamp) else filters['start_date'].date()
-        end_date = pd.Timestamp(filters['end_date']).date() if not isinstance(filters['end_date'], pd.Timestamp) else filters['end_date'].date()
-        assert start_date == pd.Timestamp('2023-01-01').date()
-        assert end_date == pd.Timestamp('2023-01-03').date()
-        
-        # Verify the selectbox was called with the correct arguments
-        mock_sidebar.selectbox.assert_called_once_with(
-            'Fuente',
-            ['Todos', 'Source A', 'Source B'],
-            index=0
-        )
+    # Configure the sidebar stub
+    sidebar_stub.selectbox.return_value = 'Source A'
+    sidebar_stub.date_input.return_value = (
+        pd.Timestamp('2023-01-01').to_pydatetime(),
+        pd.Timestamp('2023-01-03').to_pydatetime()
+    )
+    
+    # Call the function
+    filters = app.setup_sidebar_filters(test_df)
+    
+    # Assert the expected filters were set
+    assert filters['source'] == 'Source A'
+    # Convert to datetime.date for comparison
+    start_date = pd.Timestamp(filters['start_date']).date() if not isinstance(filters['start_date'], pd.Timestamp) else filters['start_date'].date()
+    end_date = pd.Timestamp(filters['end_date']).date() if not isinstance(filters['end_date'], pd.Timestamp) else filters['end_date'].date()
+    assert start_date == pd.Timestamp('2023-01-01').date()
+    assert end_date == pd.Timestamp('2023-01-03').date()
+    
+    # Verify the selectbox was called with the correct arguments
+    sidebar_stub.selectbox.assert_called_once_with(
+        'Fuente',
+        ['Todos', 'Source A', 'Source B'],
+        index=0
+    )
+
+
+def test_setup_sidebar_filters_categorical_source(sidebar_stub):
+    """Con fuente categórica las opciones salen de las categorías."""
+    test_df = TEST_DATA.copy()
+    test_df['source'] = pd.Categorical(['medio_b', 'medio_a'], categories=['medio_b', 'medio_a'])
+
+    sidebar_stub.selectbox.return_value = 'Todos'
+    sidebar_stub.date_input.return_value = ()
+    with patch.object(pd.Series, 'unique', side_effect=AssertionError("unique no debería usarse")):
+        app.setup_sidebar_filters(test_df)
+
+    sidebar_stub.selectbox.assert_called_once_with('Fuente', ['Todos', 'medio_a', 'medio_b'], index=0)
+
+
+def test_get_filter_options_cached_by_mtime():
+    """Las opciones de los filtros solo se recalculan cuando cambia el CSV."""
+    df = TEST_DATA.astype({'source': 'category'})
+
+    with patch('discover_monitor.app._filter_options', wraps=app._filter_options) as mock_options:
+        first = app.get_filter_options(1.0, df)
+        second = app.get_filter_options(1.0, df)
+        app.get_filter_options(2.0, df)
+
+    assert first == second
+    assert first['sources'] == ['test_source']
+    assert first['min_date'] == pd.Timestamp('2023-01-01').to_pydatetime()
+    assert first['max_date'] == pd.Timestamp('2023-01-02').to_pydatetime()
+    assert mock_options.call_count == 2
 
 
 def test_apply_filters():
@@ -579,3 +659,182 @@ def test_apply_filters():
 
 
 
+
+
+def test_load_data_categorical_dtypes(tmp_path):
+    """Test that load_data reads source and section as categorical columns."""
+    # Arrange
+    csv_path = tmp_path / "articles.csv"
+    TEST_DATA.to_csv(csv_path, index=False)
+
+    # Act
+    with patch('discover_monitor.app.DATA_DIR', tmp_path):
+        result = app.load_data(csv_path.stat().st_mtime)
+
+    # Assert
+    assert isinstance(result['source'].dtype, pd.CategoricalDtype)
+    assert isinstance(result['section'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(result['published_date'])
+    assert len(result) == 2
+
+    # Charts only show categories that actually have articles
+    filtered = result[result['section'] == 'test_section']
+    fig = app.generate_section_chart(filtered)
+    assert list(fig.data[0].y) == ['test_section']
+
+
+def test_load_data_uses_parquet_copy(tmp_path):
+    """Tras la primera lectura del CSV se reutiliza la copia Parquet."""
+    # Arrange
+    csv_path = tmp_path / "articles.csv"
+    TEST_DATA.iloc[::-1].assign(description='texto largo').to_csv(csv_path, index=False)
+    copy_path = tmp_path / app.PARQUET_COPY_NAME
+
+    with patch('discover_monitor.app.DATA_DIR', tmp_path):
+        # Act - la primera carga parsea el CSV y deja la copia Parquet
+        first = app.load_data(1.0)
+        assert copy_path.exists()
+        # El almacén Parquet del scraper no se toca
+        assert not (tmp_path / "articles.parquet").exists()
+
+        # La segunda carga no vuelve a leer el CSV
+        with patch('pandas.read_csv', side_effect=AssertionError("no debería leer el CSV")):
+            second = app.load_data(2.0)
+
+        # Un CSV modificado obliga a regenerarla
+        later = copy_path.stat().st_mtime + 10
+        os.utime(csv_path, (later, later))
+        with patch('pandas.read_csv', wraps=pd.read_csv) as mock_read_csv:
+            app.load_data(3.0)
+        mock_read_csv.assert_called_once()
+
+    # Assert - mismos datos, tipos y orden por fecha
+    pd.testing.assert_frame_equal(first, second)
+    assert isinstance(second['source'].dtype, pd.CategoricalDtype)
+    assert second['published_date'].is_monotonic_increasing
+    assert list(second.columns) == app.DATA_COLUMNS
+
+
+def test_load_data_discards_copy_of_csv_appended_while_reading(tmp_path):
+    """Una copia escrita después de que el CSV creciera durante la lectura no se reutiliza."""
+    # Arrange
+    csv_path = tmp_path / "articles.csv"
+    TEST_DATA.iloc[:1].to_csv(csv_path, index=False)
+    real_read_csv = pd.read_csv
+
+    def read_then_append(*args, **kwargs):
+        df = real_read_csv(*args, **kwargs)
+        # El scraper añade una fila mientras la aplicación parsea el CSV
+        TEST_DATA.iloc[1:].to_csv(csv_path, mode='a', header=False, index=False)
+        return df
+
+    with patch('discover_monitor.app.DATA_DIR', tmp_path):
+        with patch('pandas.read_csv', side_effect=read_then_append):
+            stale = app.load_data(1.0)
+        # La copia es más reciente que el CSV, pero no incluye la fila añadida
+        copy_path = tmp_path / app.PARQUET_COPY_NAME
+        later = csv_path.stat().st_mtime + 10
+        os.utime(copy_path, (later, later))
+
+        # Act
+        result = app.load_data(2.0)
+
+    # Assert
+    assert len(stale) == 1
+    assert len(result) == 2
+
+
+def test_generate_source_chart_cached():
+    """Test that the source chart figure is reused for unchanged counts."""
+    # Arrange
+    test_df = TEST_DATA.copy()
+
+    # Act
+    import plotly.graph_objects as go
+    with patch('plotly.graph_objects.Bar', wraps=go.Bar) as mock_bar:
+        fig1 = app.generate_source_chart(test_df)
+        fig2 = app.generate_source_chart(test_df)
+
+    # Assert - the figure is only built once
+    mock_bar.assert_called_once()
+    assert fig1.to_dict() == fig2.to_dict()
+
+
+def test_apply_filters_date_range_sorted_and_unsorted():
+    """Test that the searchsorted path matches the mask path for date ranges."""
+    # Arrange
+    dates = pd.to_datetime([
+        '2023-01-01 08:00', '2023-01-02 23:59', '2023-01-03 00:00',
+        '2023-01-04 12:00', None
+    ])
+    sorted_df = pd.DataFrame({
+        'title': ['A', 'B', 'C', 'D', 'E'],
+        'source': ['S'] * 5,
+        'published_date': dates
+    })
+    unsorted_df = sorted_df.iloc[[3, 0, 4, 2, 1]]
+    filters = {
+        'start_date': pd.Timestamp('2023-01-02').date(),
+        'end_date': pd.Timestamp('2023-01-03').date()
+    }
+
+    # Act
+    sorted_result = app.apply_filters(sorted_df, filters)
+    unsorted_result = app.apply_filters(unsorted_df, filters)
+
+    # Assert
+    assert sorted_result['title'].tolist() == ['B', 'C']
+    assert sorted(unsorted_result['title'].tolist()) == ['B', 'C']
+
+    # Con zona horaria los días se cuentan en la hora local de la columna
+    tz_df = sorted_df.assign(published_date=dates.tz_localize('Europe/Madrid'))
+    tz_result = app.apply_filters(tz_df, filters)
+    assert tz_result['title'].tolist() == ['B', 'C']
+
+
+def test_apply_filters_no_filters_returns_same_frame():
+    """Test that apply_filters does not copy the data when nothing is filtered."""
+    test_df = TEST_DATA.copy()
+
+    assert app.apply_filters(test_df, {'source': 'Todos'}) is test_df
+
+
+@patch('fpdf.FPDF')
+def test_generate_pdf_report_table_rows(mock_fpdf, tmp_path):
+    """Test that the PDF table rows are formatted before being written."""
+    # Arrange
+    test_df = pd.DataFrame({
+        'title': ['T' * 60, 'Short title'],
+        'source': ['Source A', 'Source B'],
+        'section': ['News', 'Sports'],
+        'published_date': pd.to_datetime(['2023-01-01 10:30', None]),
+        'url': ['http://example.com/1', 'http://example.com/2']
+    })
+    mock_pdf = MagicMock()
+    mock_fpdf.return_value = mock_pdf
+
+    # Act
+    app.generate_pdf_report(test_df, str(tmp_path / "report.pdf"))
+
+    # Assert
+    table = mock_pdf.table.return_value.__enter__.return_value
+    rows = [call.args[0] for call in table.row.call_args_list]
+    assert rows == [
+        ("Título", "Fuente", "Sección", "Fecha"),
+        ('T' * 50 + '...', 'Source A', 'News', '2023-01-01'),
+        ('Short title', 'Source B', 'Sports', ''),
+    ]
+
+
+def test_generate_pdf_report_writes_file(tmp_path):
+    """Test that generate_pdf_report writes a real PDF with Spanish punctuation."""
+    # Arrange
+    test_df = TEST_DATA.copy()
+    test_df.loc[0, 'title'] = '“Sección” — artículo de prueba'
+    output_path = tmp_path / "report.pdf"
+
+    # Act
+    app.generate_pdf_report(test_df, str(output_path))
+
+    # Assert
+    assert output_path.read_bytes().startswith(b'%PDF')
@@ -1,14 +1,10 @@
 """Additional tests to improve coverage for app.py."""
 import os
-import sys
-import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch, mock_open
 
-# Add the parent directory to the path so we can import the app module
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 import pandas as pd
 import pytest
 import streamlit as st
@@ -28,69 +24,16 @@ from discover_monitor.app import (
     main
 )
 
-# Fixtures
-
-@pytest.fixture
-def sample_data():
-    """Create sample data for testing."""
-    return pd.DataFrame({
-        'title': ['Test Article 1', 'Test Article 2'],
-        'source': ['Source A', 'Source B'],
-        'section': ['News', 'Sports'],
-        'published_date': [pd.Timestamp('2023-01-01'), pd.Timestamp('2023-01-02')],
-        'url': ['http://example.com/1', 'http://example.com/2'],
-        'description': ['Test description 1', 'Test description 2']
-    })
-import streamlit as st
-
-from discover_monitor.app import (
-    load_data,
-    get_data,
-    generate_source_chart,
-    generate_section_chart,
-    generate_pdf_report,
-    apply_filters,
-    setup_sidebar_filters,
-    export_data,
-    main
-)
-
-# Sample test data for testing
-TEST_DATA = pd.DataFrame({
-    'title': ['Article 1', 'Article 2', 'Article 3'],
-    'source': ['Source A', 'Source B', 'Source A'],
-    'section': ['Section 1', 'Section 2', 'Section 1'],
-    'published_date': [
-        (datetime.now() - timedelta(days=2)).strftime('%Y-%m-%d'),
-        (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'),
-        datetime.now().strftime('%Y-%m-%d')
-    ],
-    'url': [
-        'http://example.com/1',
-        'http://example.com/2',
-        'http://example.com/3'
-    ],
-    'description': ['Desc 1', 'Desc 2', 'Desc 3']
-})
-
-@patch('app.DATA_DIR', new_callable=tempfile.TemporaryDirectory)
-def test_load_data_cache_miss(mock_data_dir):
-    """Test load_data when cache file doesn't exist."""
-    # Create a temporary directory for DATA_DIR
-    temp_dir = Path(mock_data_dir.name)
-    data_file = temp_dir / "articles.csv"
+def test_load_data_cache_miss(monkeypatch):
+    """Test load_data when the data file doesn't exist."""
+    monkeypatch.setattr('discover_monitor.app.DATA_DIR', Path('/nonexistent-test-dir'))
+    mock_read_csv = MagicMock()
+    monkeypatch.setattr('discover_monitor.app.pd.read_csv', mock_read_csv)
     
-    # Make sure the file doesn't exist
-    if data_file.exists():
-        data_file.unlink()
+    result = load_data()
     
-    with patch('app.pd.read_csv') as mock_read_csv:
-        # Call the function
-        result = load_data()
-        
-        # Verify behavior
-        mock_read_csv.assert_not_called()  # Should not try to read non-existent file
-        assert result.empty  # Should return empty DataFrame
+    mock_read_csv.assert_not_called()  # Should not try to read non-existent file
+    assert result.empty  # Should return empty DataFrame
 
 def test_apply_filters_empty_data():
     """Test apply_filters with empty DataFrame."""
@@ -99,20 +42,16 @@ def test_apply_filters_empty_data():
     result = apply_filters(empty_df, filters)
     assert result.empty
 
-@patch('app.datetime')
-def test_setup_sidebar_filters_empty_data(mock_datetime, monkeypatch):
+@patch('discover_monitor.app.datetime')
+def test_setup_sidebar_filters_empty_data(mock_datetime, sidebar_stub):
     """Test setup_sidebar_filters with empty DataFrame."""
     # Mock datetime.now() to return a fixed date
     mock_now = datetime(2023, 1, 1)
     mock_datetime.now.return_value = mock_now
     
     # Mock the sidebar selectbox and date_input
-    mock_sidebar = MagicMock()
-    mock_sidebar.selectbox.return_value = 'Todos'
-    mock_sidebar.date_input.return_value = (mock_now - timedelta(days=30), mock_now)
-    
-    # Apply the mock
-    monkeypatch.setattr('app.st.sidebar', mock_sidebar)
+    sidebar_stub.selectbox.return_value = 'Todos'
+    sidebar_stub.date_input.return_value = (mock_now - timedelta(days=30), mock_now)
     
     # Call with empty DataFrame
     empty_df = pd.DataFrame(columns=['source', 'published_date'])
@@ -125,22 +64,20 @@ def test_setup_sidebar_filters_empty_data(mock_datetime, monkeypatch):
         'end_date': mock_now
     }
 
-def test_export_data_empty_data():
+def test_export_data_empty_data(sidebar_stub):
     """Test export_data with empty DataFrame."""
     empty_df = pd.DataFrame()
-    mock_sidebar = MagicMock()
     
-    with patch('app.st.sidebar', mock_sidebar), \
-         patch('app.st.warning') as mock_warning:
+    with patch('discover_monitor.app.st.warning') as mock_warning:
         export_data(empty_df)
         
         # Verify no export buttons were added
-        mock_sidebar.button.assert_not_called()
-        mock_sidebar.markdown.assert_not_called()
-        mock_sidebar.subheader.assert_not_called()
+        sidebar_stub.button.assert_not_called()
+        sidebar_stub.markdown.assert_not_called()
+        sidebar_stub.subheader.assert_not_called()
         mock_warning.assert_not_called()
 
-def test_main_error_handling(monkeypatch):
+def test_main_error_handling(monkeypatch, sample_data):
     """Test main function error handling."""
     # Mock the get_data function to raise an exception
     def mock_get_data():
@@ -165,38 +102,32 @@ def test_main_error_handling(monkeypatch):
     
     # Test with valid data but filter error
     def mock_get_valid_data():
-        return pd.DataFrame({
-            'title': ['Test'],
-            'source': ['Test'],
-            'section': ['Test'],
-            'published_date': [pd.Timestamp('2023-01-01')],
-            'url': ['http://example.com']
-        })
+        return sample_data
     
-    def mock_setup_sidebar_filters(df):
+    def mock_setup_sidebar_filters(df, options=None):
         raise Exception("Filter error")
     
     monkeypatch.setattr('discover_monitor.app.get_data', mock_get_valid_data)
     monkeypatch.setattr('discover_monitor.app.setup_sidebar_filters', mock_setup_sidebar_filters)
     
     main()
-    assert mock_st.error.call_count == 2  # Should have been called again for the filter error
+    mock_st.error.assert_any_call("Error al configurar los filtros: Filter error")
 
 def test_generate_source_chart_empty_data():
     """Test generate_source_chart with empty DataFrame."""
     empty_df = pd.DataFrame()
-    with patch('app.st.bar_chart') as mock_chart:
+    with patch('discover_monitor.app.st.bar_chart') as mock_chart:
         generate_source_chart(empty_df)
         mock_chart.assert_not_called()
 
 def test_generate_section_chart_empty_data():
     """Test generate_section_chart with empty DataFrame."""
     empty_df = pd.DataFrame()
-    with patch('app.st.bar_chart') as mock_chart:
+    with patch('discover_monitor.app.st.bar_chart') as mock_chart:
         generate_section_chart(empty_df)
         mock_chart.assert_not_called()
 
-@patch('discover_monitor.app.FPDF')
+@patch('fpdf.FPDF')
 def test_generate_pdf_report_empty_data(mock_fpdf):
     """Test generate_pdf_report with empty DataFrame."""
     with patch('discover_monitor.app.logger') as mock_logger:
@@ -235,132 +166,36 @@ def test_generate_pdf_report_empty_data(mock_fpdf):
             exc_info=True
         )
 
-def test_export_data_empty_warning():
+def test_export_data_empty_warning(sidebar_stub):
     """Test that export_data shows warning when DataFrame is empty."""
-    with patch('discover_monitor.app.st.sidebar.warning') as mock_warning:
-        export_data(pd.DataFrame())
-        mock_warning.assert_called_once_with("No hay datos para exportar")
+    export_data(pd.DataFrame())
+    sidebar_stub.warning.assert_called_once_with("No hay datos para exportar")
 
-def test_export_data_csv_error():
-    """Test error handling when CSV export fails."""
-    # Setup test data
-    test_df = pd.DataFrame({
-        'title': ['Test Article'],
-        'source': ['Test Source'],
-        'section': ['Test Section'],
-        'published_date': [pd.Timestamp('2023-01-01')],
-        'url': ['http://example.com']
-    })
-    
-    # Setup mocks
-    with patch('discover_monitor.app.st.sidebar') as mock_sidebar, \
-         patch('discover_monitor.app.st.error') as mock_error, \
-         patch('discover_monitor.app.logger') as mock_logger, \
-         patch('discover_monitor.app.tempfile.NamedTemporaryFile') as mock_tempfile, \
-         patch('pandas.DataFrame.to_csv') as mock_to_csv, \
-         patch('os.path.exists', return_value=True), \
-         patch('os.unlink') as mock_unlink:
-        
-        # Configure mocks
-        mock_sidebar.button.side_effect = lambda label, **kwargs: label == "Exportar a CSV"
-        mock_file = MagicMock()
-        mock_file.name = '/tmp/tempfile.csv'
-        mock_tempfile.return_value.__enter__.return_value = mock_file
-        mock_to_csv.side_effect = Exception("CSV error")
-        
-        # Call the function
-        export_data(test_df)
-        
-        # Verify error handling
-        mock_error.assert_called_once()
-        assert "Error al exportar a CSV" in mock_error.call_args[0][0]
-        mock_logger.error.assert_called_once()
-        assert "CSV error" in str(mock_logger.error.call_args[0][0])
-        mock_unlink.assert_called_once_with('/tmp/tempfile.csv')
-
-def test_export_data_excel_error():
-    """Test error handling when Excel export fails."""
-    # Setup test data
-    test_df = pd.DataFrame({
-        'title': ['Test Article'],
-        'source': ['Test Source'],
-        'section': ['Test Section'],
-        'published_date': [pd.Timestamp('2023-01-01')],
-        'url': ['http://example.com']
-    })
-    
-    # Setup mocks
-    with patch('discover_monitor.app.st.sidebar') as mock_sidebar, \
-         patch('discover_monitor.app.st.error') as mock_error, \
-         patch('discover_monitor.app.logger') as mock_logger, \
-         patch('discover_monitor.app.tempfile.NamedTemporaryFile') as mock_tempfile, \
-         patch('pandas.DataFrame.to_excel') as mock_to_excel, \
-         patch('os.path.exists', return_value=True), \
-         patch('os.unlink') as mock_unlink:
-        
-        # Configure mocks
-        mock_sidebar.button.side_effect = lambda label, **kwargs: label == "Exportar a Excel"
-        mock_file = MagicMock()
-        mock_file.name = '/tmp/tempfile.xlsx'
-        mock_tempfile.return_value.__enter__.return_value = mock_file
-        mock_to_excel.side_effect = Exception("Excel error")
-        
-        # Call the function
-        export_data(test_df)
-        
-        # Verify error handling
-        mock_error.assert_called_once()
-        assert "Error al exportar a Excel" in mock_error.call_args[0][0]
-        mock_logger.error.assert_called_once()
-        assert "Excel error" in str(mock_logger.error.call_args[0][0])
-        mock_unlink.assert_called_once_with('/tmp/tempfile.xlsx')
-
-def test_export_data_pdf_error():
-    """Test error handling when PDF generation fails."""
-    # Setup test data
-    test_df = pd.DataFrame({
-        'title': ['Test Article'],
-        'source': ['Test Source'],
-        'section': ['Test Section'],
-        'published_date': [pd.Timestamp('2023-01-01')],
-        'url': ['http://example.com']
-    })
-    
-    # Setup mocks
-    with patch('discover_monitor.app.st.sidebar') as mock_sidebar, \
-         patch('discover_monitor.app.st.error') as mock_error, \
-         patch('discover_monitor.app.logger') as mock_logger, \
-         patch('discover_monitor.app.tempfile.NamedTemporaryFile') as mock_tempfile, \
-         patch('discover_monitor.app.generate_pdf_report') as mock_generate_pdf, \
-         patch('os.path.exists', return_value=True), \
-         patch('os.unlink') as mock_unlink:
-        
-        # Configure mocks
-        mock_sidebar.button.side_effect = lambda label, **kwargs: label == "Generar Informe PDF"
-        
-        # Create a proper mock for the file object
-        mock_file = MagicMock()
-        mock_file.name = '/tmp/tempfile.pdf'
-        
-        # Set up the context manager to return our mock file
-        mock_temp_instance = MagicMock()
-        mock_temp_instance.__enter__.return_value = mock_file
-        # Make sure name attribute is accessible on the instance
-        mock_temp_instance.name = '/tmp/tempfile.pdf'
-        mock_tempfile.return_value = mock_temp_instance
-        
-        # Simulate PDF generation error
-        mock_generate_pdf.side_effect = Exception("PDF generation error")
-        
-        # Call the function
-        export_data(test_df)
-        
-        # Verify error handling
-        mock_error.assert_called_once()
-        assert "Error al generar el PDF" in mock_error.call_args[0][0]
-        mock_logger.error.assert_called_once()
-        assert "PDF generation error" in str(mock_logger.error.call_args[0][0])
-        
-        # Verify unlink was called with the temporary file's name
-        # The function calls unlink with tmp_file.name, which is the mock_temp_instance.name
-        mock_unlink.assert_called_once_with('/tmp/tempfile.pdf')
+@pytest.fixture
+def export_mocks(monkeypatch, sidebar_stub):
+    """Replace the Streamlit sidebar, st.error and the app logger with mocks.
+    
+    Exports are built in memory, so no tempfile/os mocks are needed.
+    """
+    mocks = SimpleNamespace(sidebar=sidebar_stub, error=MagicMock(), logger=MagicMock())
+    monkeypatch.setattr('discover_monitor.app.st.error', mocks.error)
+    monkeypatch.setattr('discover_monitor.app.logger', mocks.logger)
+    return mocks
+
+@pytest.mark.parametrize("label, patch_target, err_prefix", [
+    ("Exportar a CSV", "pandas.DataFrame.to_csv", "Error al exportar a CSV"),
+    ("Exportar a Excel", "pandas.DataFrame.to_excel", "Error al exportar a Excel"),
+    ("Generar Informe PDF", "discover_monitor.app.generate_pdf_bytes", "Error al generar el PDF"),
+])
+def test_export_data_error(label, patch_target, err_prefix, export_mocks, sample_data, monkeypatch):
+    """Test error handling when one of the exports fails."""
+    export_mocks.sidebar.button.side_effect = lambda button_label, **kwargs: button_label == label
+    monkeypatch.setattr(patch_target, MagicMock(side_effect=Exception(f"{label} error")))
+    
+    export_data(sample_data)
+    
+    export_mocks.error.assert_called_once()
+    assert err_prefix in export_mocks.error.call_args[0][0]
+    export_mocks.logger.error.assert_called_once()
+    assert f"{label} error" in str(export_mocks.logger.error.call_args[0][0])
+    export_mocks.sidebar.download_button.assert_not_called()
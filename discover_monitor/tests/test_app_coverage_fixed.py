@@ -39,20 +39,6 @@ class MockSessionState:
     def __getitem__(self, key):
         return self.__dict__[key]
 
-@pytest.fixture
-def sample_data():
-    """Create sample data for testing."""
-    return pd.DataFrame({
-        'title': ['Test Article 1', 'Test Article 2'],
-        'source': ['Source A', 'Source B'],
-        'section': ['News', 'Sports'],
-        'published_date': [pd.Timestamp('2023-01-01'), pd.Timestamp('2023-01-02')],
-        'url': ['http://example.com/1', 'http://example.com/2'],
-        'description': ['Test description 1', 'Test description 2'],
-        'image_url': ['http://example.com/img1.jpg', 'http://example.com/img2.jpg'],
-        'author': ['Author 1', 'Author 2']
-    })
-
 # Tests for generate_source_chart
 
 def test_generate_source_chart_empty():
@@ -67,12 +53,10 @@ def test_generate_source_chart_valid(sample_data):
     """Test generate_source_chart with valid data."""
     result = generate_source_chart(sample_data)
     assert result is not None
-    # The chart should have one trace per source (2 sources in sample data)
-    assert len(result.data) == 2  # One trace per source
-    # Check that both sources are present in the traces
-    sources_in_chart = {trace.name for trace in result.data}
-    assert 'Source A' in sources_in_chart
-    assert 'Source B' in sources_in_chart
+    # A single bar trace with one bar (and color) per source
+    assert len(result.data) == 1
+    assert set(result.data[0].x) == {'Source A', 'Source B'}
+    assert len(set(result.data[0].marker.color)) == 2
 
 # Tests for generate_section_chart
 
@@ -92,7 +76,7 @@ def test_generate_section_chart_valid(sample_data):
 
 # Tests for generate_pdf_report
 
-@patch('discover_monitor.app.FPDF')
+@patch('fpdf.FPDF')
 @patch('discover_monitor.app.datetime')
 @patch('discover_monitor.app.st')
 def test_generate_pdf_report_empty(mock_st, mock_datetime, mock_fpdf_class):
@@ -134,7 +118,7 @@ def test_generate_pdf_report_empty(mock_st, mock_datetime, mock_fpdf_class):
         mock_fpdf_class.assert_not_called()
         mock_pdf.output.assert_not_called()
             
-@patch('discover_monitor.app.FPDF')
+@patch('fpdf.FPDF')
 @patch('discover_monitor.app.datetime')
 @patch('discover_monitor.app.st')
 def test_generate_pdf_report_error(mock_st, mock_datetime, mock_fpdf_class):
@@ -179,7 +163,7 @@ def test_generate_pdf_report_error(mock_st, mock_datetime, mock_fpdf_class):
             exc_info=True
         )
 
-@patch('discover_monitor.app.FPDF')
+@patch('fpdf.FPDF')
 @patch('discover_monitor.app.st')
 @patch('discover_monitor.app.datetime')
 def test_generate_pdf_report_file_error(mock_datetime, mock_st, mock_fpdf_class):
@@ -331,20 +315,16 @@ def test_export_data_pdf_error(monkeypatch, sample_data):
     # Mock the logger
     mock_logger = MagicMock()
     
-    # Create a real temporary file
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-        tmp_path = tmp_file.name
-    
-    # Mock generate_pdf_report to raise an exception
-    def mock_generate_pdf_report(df, output_path):
+    # Mock generate_pdf_bytes to raise an exception
+    def mock_generate_pdf_bytes(df, summary=None):
         raise Exception("PDF generation error")
     
     # Apply mocks
     monkeypatch.setattr('discover_monitor.app.st', mock_st)
     
-    # Mock the logger and generate_pdf_report
+    # Mock the logger and generate_pdf_bytes
     with patch('discover_monitor.app.logger', mock_logger), \
-         patch('discover_monitor.app.generate_pdf_report', mock_generate_pdf_report):
+         patch('discover_monitor.app.generate_pdf_bytes', mock_generate_pdf_bytes):
         
         # Call the function with sample data
         export_data(sample_data)
@@ -357,17 +337,13 @@ def test_export_data_pdf_error(monkeypatch, sample_data):
             "Error al generar el PDF: PDF generation error",
             exc_info=True
         )
-    
-    # Clean up
-    if os.path.exists(tmp_path):
-        os.unlink(tmp_path)
 
 # Tests for main function
 
 def test_main_error_handling(monkeypatch):
     """Test main function error handling."""
     # Mock the load_data function to raise an exception
-    def mock_load_data():
+    def mock_load_data(mtime=None):
         raise Exception("Test error")
     
     # Mock the logger to verify error logging
@@ -402,7 +378,7 @@ def test_main_error_handling(monkeypatch):
 def test_main_filter_error(monkeypatch, sample_data):
     """Test main function with filter error."""
     # Mock load_data to return sample data
-    def mock_load_data():
+    def mock_load_data(mtime=None):
         return sample_data
         
     # Mock get_data to return sample data
@@ -410,7 +386,7 @@ def test_main_filter_error(monkeypatch, sample_data):
         return sample_data
         
     # Mock setup_sidebar_filters to raise an exception
-    def mock_setup_sidebar_filters(df):
+    def mock_setup_sidebar_filters(df, options=None):
         raise Exception("Filter error")
     
     # Mock the logger to verify error logging
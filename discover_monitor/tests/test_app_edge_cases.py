@@ -126,18 +126,13 @@ def test_display_charts_with_data(mock_section_chart, mock_source_chart, mock_ta
     assert "No hay datos para mostrar el gráfico por fuente" in warning_messages
     assert "No hay datos para mostrar el gráfico por sección" in warning_messages
 
-def test_export_data_csv_error_handling():
+def test_export_data_csv_error_handling(sidebar_stub):
     """Test error handling in CSV export."""
-    with patch('discover_monitor.app.st.sidebar') as mock_sidebar, \
-         patch('discover_monitor.app.tempfile.NamedTemporaryFile') as mock_tempfile, \
-         patch('builtins.open', side_effect=Exception("Test error")), \
+    with patch('pandas.DataFrame.to_csv', side_effect=Exception("Test error")), \
          patch('discover_monitor.app.st.error') as mock_error:
         
-        # Setup mock file
-        mock_tempfile.return_value.__enter__.return_value.name = '/tmp/test.csv'
-        
         # Simulate CSV export button click
-        mock_sidebar.button.side_effect = lambda label, **kwargs: label == "Exportar a CSV"
+        sidebar_stub.button.side_effect = lambda label, **kwargs: label == "Exportar a CSV"
         
         export_data(TEST_DATA_WITH_DATES)
         
@@ -145,18 +140,13 @@ def test_export_data_csv_error_handling():
         mock_error.assert_called_once()
         assert "Error al exportar a CSV" in str(mock_error.call_args[0][0])
 
-def test_export_data_excel_error_handling():
+def test_export_data_excel_error_handling(sidebar_stub):
     """Test error handling in Excel export."""
-    with patch('discover_monitor.app.st.sidebar') as mock_sidebar, \
-         patch('discover_monitor.app.tempfile.NamedTemporaryFile') as mock_tempfile, \
-         patch('builtins.open', side_effect=Exception("Test error")), \
+    with patch('pandas.DataFrame.to_excel', side_effect=Exception("Test error")), \
          patch('discover_monitor.app.st.error') as mock_error:
         
-        # Setup mock file
-        mock_tempfile.return_value.__enter__.return_value.name = '/tmp/test.xlsx'
-        
         # Simulate Excel export button click
-        mock_sidebar.button.side_effect = lambda label, **kwargs: label == "Exportar a Excel"
+        sidebar_stub.button.side_effect = lambda label, **kwargs: label == "Exportar a Excel"
         
         export_data(TEST_DATA_WITH_DATES)
         
@@ -164,17 +154,12 @@ def test_export_data_excel_error_handling():
         mock_error.assert_called_once()
         assert "Error al exportar a Excel" in str(mock_error.call_args[0][0])
 
-@patch('discover_monitor.app.os.path.exists', return_value=True)
-@patch('discover_monitor.app.os.unlink')
-@patch('discover_monitor.app.open', new_callable=mock_open)
-@patch('discover_monitor.app.st.sidebar')
 @patch('discover_monitor.app.st.error')
 @patch('discover_monitor.app.st.success')
 @patch('discover_monitor.app.logger')
-@patch('discover_monitor.app.generate_pdf_report')
+@patch('discover_monitor.app.generate_pdf_bytes')
 def test_export_data_pdf_error_handling(
-    mock_generate_pdf, mock_logger, mock_success, mock_error, 
-    mock_sidebar, mock_file_open, mock_os_unlink, mock_os_path_exists
+    mock_generate_pdf, mock_logger, mock_success, mock_error, sidebar_stub
 ):
     """Test error handling in PDF export."""
     # Create test data with all required columns
@@ -187,61 +172,26 @@ def test_export_data_pdf_error_handling(
     })
     
     # Configure the sidebar button to return True for the PDF export button
-    mock_sidebar.button.side_effect = lambda label, **kwargs: label == "Generar Informe PDF"
+    sidebar_stub.button.side_effect = lambda label, **kwargs: label == "Generar Informe PDF"
     
-    # Mock the download button to do nothing
-    mock_sidebar.download_button.return_value = None
+    # Make generate_pdf_bytes raise an exception
+    mock_generate_pdf.side_effect = Exception("PDF generation error")
     
-    # Configure the temp file mock
-    mock_temp_file = MagicMock()
-    mock_temp_file.name = '/tmp/test.pdf'
+    # Call the function
+    export_data(test_data)
     
-    # Mock the NamedTemporaryFile context manager
-    with patch('discover_monitor.app.tempfile.NamedTemporaryFile') as mock_tempfile:
-        mock_tempfile.return_value.__enter__.return_value = mock_temp_file
-        
-        # Make generate_pdf_report raise an exception
-        mock_generate_pdf.side_effect = Exception("PDF generation error")
-        
-        # Call the function
-        export_data(test_data)
-        
-        # Verify generate_pdf_report was called
-        assert mock_generate_pdf.call_count == 1
-        
-        # Get the actual arguments passed to generate_pdf_report
-        args, _ = mock_generate_pdf.call_args
-        called_df = args[0]  # First argument is the DataFrame
-        
-        # Verify the DataFrame contents match (using pandas testing utilities)
-        pd.testing.assert_frame_equal(called_df, test_data)
-        
-        # Verify the second argument is the mock temp file path
-        # We'll verify that the mock was called with the expected arguments
-        assert mock_generate_pdf.call_args[0][0].equals(test_data)  # Check DataFrame
-        
-        # Get the actual file path that was passed to generate_pdf_report
-        # This will be a MagicMock object, so we'll verify it's being used correctly
-        called_file_path = mock_generate_pdf.call_args[0][1]
-        
-        # Verify the mock temp file was used in the call
-        assert called_file_path is not None
-        
-        # Verify the mock temp file is being used for cleanup
-        mock_logger.error.assert_called_once()
-        assert "Error al generar el PDF" in mock_logger.error.call_args[0][0]
-        
-        # Verify success message was not shown
-        mock_success.assert_not_called()
-        
-        # Verify the mock temp file is being used for cleanup
-        # We need to use the same mock object that was passed to the function
-        # instead of accessing the name attribute directly
-        mock_os_path_exists.assert_called_once()
-        mock_os_unlink.assert_called_once()
-        
-        # Verify the same file path was used for both exists and unlink
-        assert mock_os_path_exists.call_args[0] == mock_os_unlink.call_args[0]
+    # Verify the PDF was generated from the exported DataFrame
+    assert mock_generate_pdf.call_count == 1
+    pd.testing.assert_frame_equal(mock_generate_pdf.call_args[0][0], test_data)
+    
+    # Verify the error was reported and nothing was offered for download
+    mock_logger.error.assert_called_once()
+    assert "Error al generar el PDF" in mock_logger.error.call_args[0][0]
+    mock_error.assert_called_once()
+    sidebar_stub.download_button.assert_not_called()
+    
+    # Verify success message was not shown
+    mock_success.assert_not_called()
 
 @patch('discover_monitor.app.st.set_page_config')
 @patch('discover_monitor.app.st.title')
@@ -2,8 +2,11 @@
 import os
 import sys
 import json
+import logging
+import logging.handlers
+import threading
 from pathlib import Path
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import patch, MagicMock
 
 import pytest
 import requests
@@ -13,19 +16,25 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 # Now import the module
+from discover_monitor import check_sitemaps
+from discover_monitor.config import SiteSpec
 from discover_monitor.check_sitemaps import (
     get_robots_txt,
     find_sitemap_in_robots,
+    get_sitemap_from_robots,
     check_sitemap_url,
+    create_session,
     find_sitemap,
+    is_sitemap_xml,
     save_results,
+    throttle,
     main,
     SITEMAP_PATHS,
     SITES
 )
 
 # Test data
-SAMPLE_ROBOTS_TXT = """
+SAMPLE_ROBOTS_TXT = b"""
 User-agent: *
 Disallow: /admin/
 Sitemap: https://example.com/sitemap.xml
@@ -33,6 +42,34 @@ Sitemap: https://example.com/sitemap_news.xml
 """
 
 # Fixtures
+@pytest.fixture(autouse=True)
+def log_info(caplog):
+    """Capture the module's progress messages."""
+    caplog.set_level(logging.INFO, logger='discover_monitor.check_sitemaps')
+
+@pytest.fixture(autouse=True)
+def clear_robots_cache():
+    """Start every test with an empty robots.txt cache."""
+    check_sitemaps._ROBOTS_CACHE.clear()
+    yield
+    check_sitemaps._ROBOTS_CACHE.clear()
+
+@pytest.fixture(autouse=True)
+def path_stats_file(tmp_path, monkeypatch):
+    """Keep path statistics in a temporary file and start from zero."""
+    stats_file = tmp_path / 'sitemap_path_stats.json'
+    monkeypatch.setattr(check_sitemaps, 'PATH_STATS_FILE', str(stats_file))
+    check_sitemaps._PATH_STATS.clear()
+    yield stats_file
+    check_sitemaps._PATH_STATS.clear()
+
+@pytest.fixture(autouse=True)
+def clear_host_throttle():
+    """Forget per-host request slots between tests."""
+    check_sitemaps._host_next_slot.clear()
+    yield
+    check_sitemaps._host_next_slot.clear()
+
 @pytest.fixture
 def mock_session():
     """Create a mock session for requests."""
@@ -45,7 +82,7 @@ def test_get_robots_txt_success(mock_session):
     # Setup
     mock_response = MagicMock()
     mock_response.status_code = 200
-    mock_response.text = SAMPLE_ROBOTS_TXT
+    mock_response.content = SAMPLE_ROBOTS_TXT
     mock_response.headers = {'content-type': 'text/plain'}
     mock_session.get.return_value = mock_response
     
@@ -68,6 +105,27 @@ def test_get_robots_txt_error(mock_session):
     assert result is None
 
 
+def test_get_robots_txt_not_found(mock_session, caplog):
+    """A non-200 robots.txt is a quiet miss."""
+    mock_session.get.return_value.status_code = 404
+
+    assert get_robots_txt(mock_session, "https://example.com") is None
+    mock_session.get.return_value.raise_for_status.assert_not_called()
+    assert "Error al obtener robots.txt" not in caplog.text
+
+def test_throttle_spaces_requests_per_host():
+    """Only consecutive requests to the same host are delayed."""
+    with patch('discover_monitor.check_sitemaps.time.monotonic', return_value=100.0), \
+         patch('discover_monitor.check_sitemaps.time.sleep') as mock_sleep:
+        throttle("https://example.com/robots.txt", min_interval=1.0)
+        throttle("https://other.com/sitemap.xml", min_interval=1.0)
+        mock_sleep.assert_not_called()
+
+        throttle("https://example.com/sitemap.xml", min_interval=1.0)
+        throttle("https://example.com/sitemap_index.xml", min_interval=1.0)
+
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [1.0, 2.0]
+
 def test_find_sitemap_in_robots_found():
     """Test finding sitemap URL in robots.txt."""
     # Execute
@@ -76,48 +134,111 @@ def test_find_sitemap_in_robots_found():
     # Verify
     assert result == "https://example.com/sitemap.xml"
 
+def test_find_sitemap_in_robots_case_and_whitespace():
+    """The Sitemap directive is matched case-insensitively, text or bytes."""
+    content = "User-agent: *\n  SITEMAP :  https://example.com/news.xml  \n"
+
+    assert find_sitemap_in_robots(content) == "https://example.com/news.xml"
+    assert find_sitemap_in_robots(content.encode()) == "https://example.com/news.xml"
+
 def test_find_sitemap_in_robots_not_found():
     """Test when no sitemap is found in robots.txt."""
     # Execute
-    result = find_sitemap_in_robots("User-agent: *\nDisallow: /admin/")
+    result = find_sitemap_in_robots(b"User-agent: *\nDisallow: /admin/")
     
     # Verify
     assert result is None
 
+def test_get_sitemap_from_robots_is_cached_per_origin(mock_session):
+    """robots.txt is fetched once per origin while the cache entry is fresh."""
+    with patch('discover_monitor.check_sitemaps.get_robots_txt',
+               return_value=SAMPLE_ROBOTS_TXT) as mock_get_robots:
+        first = get_sitemap_from_robots(mock_session, "https://Example.com/news/")
+        second = get_sitemap_from_robots(mock_session, "https://example.com")
+
+    assert first == second == "https://example.com/sitemap.xml"
+    mock_get_robots.assert_called_once()
+    assert check_sitemaps._ROBOTS_CACHE["https://example.com"][1] == first
+
+def test_get_sitemap_from_robots_refetches_after_ttl(mock_session):
+    """Expired entries and failed fetches are not served from the cache."""
+    with patch('discover_monitor.check_sitemaps.get_robots_txt',
+               side_effect=[None, SAMPLE_ROBOTS_TXT, SAMPLE_ROBOTS_TXT]) as mock_get_robots, \
+         patch('discover_monitor.check_sitemaps.time.monotonic',
+               side_effect=[0, 10_000, 10_000]):
+        assert get_sitemap_from_robots(mock_session, "https://example.com") is None
+        assert get_sitemap_from_robots(mock_session, "https://example.com") == "https://example.com/sitemap.xml"
+        assert get_sitemap_from_robots(mock_session, "https://example.com") == "https://example.com/sitemap.xml"
+
+    assert mock_get_robots.call_count == 3
+
 def test_check_sitemap_url_valid(mock_session):
-    """Test checking a valid sitemap URL."""
+    """Test checking a valid sitemap URL with a single ranged GET."""
     # Setup
-    mock_session.head.return_value.status_code = 200
-    mock_session.head.return_value.headers = {'content-type': 'application/xml'}
+    mock_session.get.return_value.status_code = 206
+    mock_session.get.return_value.raw.read.return_value = b'<?xml version="1.0"?>\n<urlset>'
     
     # Execute
-    result = check_sitemap_url(mock_session, "https://example.com", "/sitemap.xml")
+    result = check_sitemap_url(mock_session, "https://example.com/sitemap.xml")
     
     # Verify
     assert result == "https://example.com/sitemap.xml"
-    mock_session.head.assert_called_once()
+    mock_session.get.assert_called_once_with(
+        "https://example.com/sitemap.xml",
+        timeout=8,
+        allow_redirects=True,
+        stream=True,
+        headers={'Range': 'bytes=0-4095'}
+    )
+    mock_session.head.assert_not_called()
+    mock_session.get.return_value.close.assert_called_once()
 
-def test_check_sitemap_url_falls_back_to_get(mock_session):
-    """Test that GET is used when HEAD fails."""
+def test_check_sitemap_url_rejects_non_xml(mock_session):
+    """Test that a 200 response without XML markers is not a sitemap."""
     # Setup
-    mock_session.head.side_effect = requests.RequestException("HEAD failed")
     mock_session.get.return_value.status_code = 200
-    mock_session.get.return_value.raw.read.return_value = b'<?xml version="1.0"?>\n<urlset>'
+    mock_session.get.return_value.raw.read.return_value = b'<!DOCTYPE html><html>'
     
     # Execute
-    result = check_sitemap_url(mock_session, "https://example.com", "/sitemap.xml")
+    result = check_sitemap_url(mock_session, "https://example.com/sitemap.xml")
     
     # Verify
-    assert result == "https://example.com/sitemap.xml"
-    mock_session.get.assert_called_once()
+    assert result is None
+    mock_session.get.return_value.close.assert_called_once()
+
+@pytest.mark.parametrize("data, expected", [
+    (b'<?xml version="1.0"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"><url>', True),
+    (b'\xef\xbb\xbf<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">', True),
+    (b'\n  <?xml version="1.0"?><rss version="2.0"><channel>', True),
+    (b'<?xml version="1.0"?><html><body>', False),
+    (b'<!DOCTYPE html><html lang="es">', False),
+    (b'not xml at all', False),
+    (b'', False),
+])
+def test_is_sitemap_xml(data, expected):
+    """Only the root element of the (possibly truncated) document is checked."""
+    assert is_sitemap_xml(data) is expected
+
+def test_is_sitemap_xml_skips_parser_for_html():
+    """Documents without a sitemap tag are rejected before parsing."""
+    with patch('discover_monitor.check_sitemaps.ET.iterparse') as mock_iterparse:
+        assert is_sitemap_xml(b'<!DOCTYPE html><html><head><title>404</title>') is False
+    mock_iterparse.assert_not_called()
+
+def test_check_sitemap_url_request_error(mock_session):
+    """Test that request errors are reported and treated as a miss."""
+    mock_session.get.side_effect = requests.RequestException("boom")
+    
+    assert check_sitemap_url(mock_session, "https://example.com/sitemap.xml") is None
 
 def test_find_sitemap_known_good(mock_session):
     """Test finding sitemap when a known good URL is provided."""
     # Setup
-    site_info = {
-        'url': 'https://example.com',
-        'sitemap': 'https://example.com/sitemap.xml'
-    }
+    site_info = SiteSpec(
+        name='Example',
+        url='https://example.com',
+        sitemap='https://example.com/sitemap.xml'
+    )
     
     with patch('discover_monitor.check_sitemaps.check_sitemap_url') as mock_check:
         mock_check.return_value = 'https://example.com/sitemap.xml'
@@ -127,13 +248,12 @@ def test_find_sitemap_known_good(mock_session):
         
         # Verify
         assert result == 'https://example.com/sitemap.xml'
-        mock_check.assert_called_once_with(mock_session, 'https://example.com', 
-                                         'https://example.com/sitemap.xml')
+        mock_check.assert_called_once_with(mock_session, 'https://example.com/sitemap.xml')
 
-def test_find_sitemap_via_robots(mock_session, capsys):
+def test_find_sitemap_via_robots(mock_session, caplog):
     """Test finding sitemap via robots.txt."""
     # Setup
-    site_info = {'url': 'https://example.com'}
+    site_info = SiteSpec(name='Example', url='https://example.com')
     
     with patch('discover_monitor.check_sitemaps.get_robots_txt') as mock_get_robots, \
          patch('discover_monitor.check_sitemaps.find_sitemap_in_robots') as mock_find, \
@@ -149,10 +269,9 @@ def test_find_sitemap_via_robots(mock_session, capsys):
         result = find_sitemap(mock_session, site_info)
         
         # Verify
-        captured = capsys.readouterr()
-        assert "Buscando sitemap para: https://example.com" in captured.out
-        assert "Buscando en robots.txt..." in captured.out
-        assert "Encontrado en robots.txt: https://example.com/sitemap.xml" in captured.out
+        assert "Buscando sitemap para: https://example.com" in caplog.text
+        assert "Buscando en robots.txt..." in caplog.text
+        assert "Encontrado en robots.txt: https://example.com/sitemap.xml" in caplog.text
         assert result == 'https://example.com/sitemap.xml'
         mock_get_robots.assert_called_once_with(mock_session, 'https://example.com')
         mock_find.assert_called_once_with(SAMPLE_ROBOTS_TXT)
@@ -163,10 +282,10 @@ def test_find_sitemap_via_robots(mock_session, capsys):
 @patch('discover_monitor.check_sitemaps.find_sitemap_in_robots')
 @patch('discover_monitor.check_sitemaps.get_robots_txt')
 @patch('discover_monitor.check_sitemaps.SITEMAP_PATHS', ['/sitemap_index.xml'])
-def test_find_sitemap_common_paths(mock_get_robots, mock_find, mock_check, mock_session, capsys):
+def test_find_sitemap_common_paths(mock_get_robots, mock_find, mock_check, mock_session, caplog):
     """Test finding sitemap by checking common paths."""
     # Setup
-    site_info = {'url': 'https://example.com'}
+    site_info = SiteSpec(name='Example', url='https://example.com')
     
     # Setup mocks
     mock_get_robots.return_value = None  # No robots.txt
@@ -180,19 +299,40 @@ def test_find_sitemap_common_paths(mock_get_robots, mock_find, mock_check, mock_
     assert result == 'https://example.com/sitemap_index.xml'
     
     # Verify the output messages
-    captured = capsys.readouterr()
-    assert "Buscando sitemap para: https://example.com" in captured.out
-    assert "Buscando en robots.txt..." in captured.out
-    assert "Probando rutas comunes de sitemaps..." in captured.out
-    assert "Sitemap encontrado: https://example.com/sitemap_index.xml" in captured.out
+    assert "Buscando sitemap para: https://example.com" in caplog.text
+    assert "Buscando en robots.txt..." in caplog.text
+    assert "Probando rutas comunes de sitemaps..." in caplog.text
+    assert "Sitemap encontrado: https://example.com/sitemap_index.xml" in caplog.text
     
     # Verify check_sitemap_url was called with the correct arguments
     mock_check.assert_called_once_with(
         mock_session, 
-        'https://example.com', 
-        '/sitemap_index.xml'
+        'https://example.com/sitemap_index.xml'
     )
 
+@patch('discover_monitor.check_sitemaps.find_sitemap_in_robots', return_value=None)
+@patch('discover_monitor.check_sitemaps.get_robots_txt', return_value=None)
+def test_find_sitemap_stops_probing_after_first_hit(mock_get_robots, mock_find, mock_session):
+    """Pending path probes are cancelled once a sitemap has been found."""
+    release = threading.Event()
+
+    def fake_check(session, sitemap_url):
+        if sitemap_url == 'https://example.com' + SITEMAP_PATHS[0]:
+            return sitemap_url
+        release.wait(5)
+        return None
+
+    try:
+        with patch('discover_monitor.check_sitemaps.check_sitemap_url',
+                   side_effect=fake_check) as mock_check:
+            result = find_sitemap(mock_session, SiteSpec(name='Example', url='https://example.com'))
+            calls = mock_check.call_count
+    finally:
+        release.set()
+
+    assert result == 'https://example.com' + SITEMAP_PATHS[0]
+    assert calls < len(SITEMAP_PATHS)
+
 def test_save_results_success(tmp_path):
     """Test successful saving of results."""
     # Setup
@@ -205,12 +345,41 @@ def test_save_results_success(tmp_path):
     
     # Execute
     with patch('os.makedirs'), \
-         patch('builtins.open', mock_open()) as mock_file:
+         patch('discover_monitor.check_sitemaps._write_bytes') as mock_write:
         result = save_results(results)
     
     # Verify
     assert result is True
-    assert mock_file.call_count == 2  # Called for txt and json files
+    assert mock_write.call_count == 2  # Called for txt and json files
+    txt_path, txt_data = mock_write.call_args_list[0][0]
+    assert txt_path.endswith('sitemap_results.txt')
+    assert txt_data.endswith(b"https://example1.com: https://example1.com/sitemap.xml\n"
+                             b"https://example2.com: None\n")
+
+def test_save_results_error():
+    """Errors while writing are reported and return False."""
+    with patch('os.makedirs'), \
+         patch('discover_monitor.check_sitemaps._write_bytes', side_effect=OSError("disk full")):
+        assert save_results([]) is False
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_save_results_writes_utf8_json(tmp_path, monkeypatch, use_orjson):
+    """The JSON output is indented UTF-8 with or without orjson."""
+    if not use_orjson:
+        monkeypatch.setattr(check_sitemaps, 'orjson', None)
+    elif check_sitemaps.orjson is None:
+        pytest.skip("orjson no está instalado")
+    monkeypatch.chdir(tmp_path)
+    results = [{'url': 'https://www.publico.es', 'sitemap': None, 'name': 'Público'}]
+
+    assert save_results(results) is True
+
+    txt = (tmp_path / 'data' / 'sitemap_results.txt').read_text(encoding='utf-8')
+    assert txt == "=== Resultados de búsqueda de sitemaps ===\n\nhttps://www.publico.es: None\n"
+    raw = (tmp_path / 'data' / 'sitemaps.json').read_bytes()
+    assert 'Público'.encode('utf-8') in raw
+    assert raw.startswith(b'[\n  {')
+    assert json.loads(raw) == results
 
 def test_main_success(mock_session, tmp_path):
     """Test main function execution."""
@@ -220,7 +389,7 @@ def test_main_success(mock_session, tmp_path):
     with patch('sys.argv', test_args), \
          patch('discover_monitor.check_sitemaps.requests.Session') as mock_sess, \
          patch('discover_monitor.check_sitemaps.find_sitemap') as mock_find, \
-         patch('json.dump') as mock_json_dump:
+         patch('discover_monitor.check_sitemaps.save_results') as mock_save:
         
         # Configure mocks
         mock_sess.return_value = mock_session
@@ -231,14 +400,200 @@ def test_main_success(mock_session, tmp_path):
         
         # Verify
         assert mock_find.call_count == len(SITES)
-        assert mock_json_dump.called
+        assert len(mock_save.call_args[0][0]) == len(SITES)
+
+def test_create_session_mounts_pooled_adapter():
+    """The shared session reuses a large connection pool with retries."""
+    session = create_session()
+
+    adapter = session.get_adapter('https://example.com/sitemap.xml')
+    assert adapter is session.get_adapter('http://example.com/sitemap.xml')
+    assert adapter._pool_maxsize == 32
+    assert adapter.max_retries.total == 2
+    assert 502 in adapter.max_retries.status_forcelist
+    assert session.headers['Connection'] == 'keep-alive'
+    assert session.max_redirects == 3
+
+def test_create_session_uses_http_cache_when_available(monkeypatch):
+    """With requests-cache installed, the session is an on-disk cached one."""
+    fake_cache = MagicMock()
+    fake_cache.CachedSession.return_value = requests.Session()
+    monkeypatch.setattr('discover_monitor.http_cache.requests_cache', fake_cache)
+
+    session = create_session()
+
+    assert session is fake_cache.CachedSession.return_value
+    args, kwargs = fake_cache.CachedSession.call_args
+    assert args == (check_sitemaps.HTTP_CACHE_FILE,)
+    assert kwargs['backend'] == 'sqlite'
+    assert kwargs['allowable_codes'] == (200, 206)
+    assert kwargs['match_headers'] == ['Range']
+    assert kwargs['filter_fn'] is check_sitemaps.is_cacheable_response
+    assert session.get_adapter('https://example.com')._pool_maxsize == 32
+
+def test_create_session_without_http_cache(monkeypatch):
+    """Without requests-cache a plain session is used."""
+    monkeypatch.setattr('discover_monitor.http_cache.requests_cache', None)
+
+    assert type(create_session()) is requests.Session
+
+@pytest.mark.parametrize("status, headers, expected", [
+    (206, {'content-length': '4096'}, True),
+    (206, {}, True),
+    (200, {'content-length': '300'}, True),
+    (200, {'content-length': str(5 * 1024 * 1024)}, False),
+    (200, {}, False),
+    (206, {'content-length': 'nope'}, True),
+])
+def test_is_cacheable_response(status, headers, expected):
+    """Only range probes and small full responses go into the HTTP cache."""
+    response = MagicMock(status_code=status, headers=headers)
+
+    assert check_sitemaps.is_cacheable_response(response) is expected
+
+def test_main_keeps_site_order_and_skips_failures(mock_session):
+    """main() processes sites concurrently but keeps the SITES order."""
+    sites = (
+        SiteSpec('Uno', 'https://www.uno.es', 'https://www.uno.es/sitemap.xml'),
+        SiteSpec('Dos', 'https://dos.com/'),
+        SiteSpec('Tres', 'https://www.tres.es', 'https://www.tres.es/sitemap.xml'),
+    )
+
+    def fake_find(session, site_info):
+        if site_info.url == 'https://dos.com/':
+            raise RuntimeError("boom")
+        return site_info.sitemap
+
+    with patch('discover_monitor.check_sitemaps.SITES', sites), \
+         patch('discover_monitor.check_sitemaps.find_sitemap', side_effect=fake_find), \
+         patch('discover_monitor.check_sitemaps.save_results') as mock_save:
+        main()
+
+    results = mock_save.call_args[0][0]
+    assert results == [
+        {'url': 'https://www.uno.es', 'sitemap': 'https://www.uno.es/sitemap.xml', 'name': 'Uno'},
+        {'url': 'https://www.tres.es', 'sitemap': 'https://www.tres.es/sitemap.xml', 'name': 'Tres'},
+    ]
+
+def test_main_routes_worker_logs_through_queue(mock_session):
+    """Worker log records go through a QueueHandler that main() removes afterwards."""
+    seen = []
+
+    def fake_find(session, site_info):
+        seen.extend(type(h).__name__ for h in check_sitemaps.logger.handlers)
+        return None
+
+    with patch('discover_monitor.check_sitemaps.SITES', (SiteSpec('Example', 'https://example.com'),)), \
+         patch('discover_monitor.check_sitemaps.find_sitemap', side_effect=fake_find), \
+         patch('discover_monitor.check_sitemaps.save_results'):
+        main()
+
+    assert 'QueueHandler' in seen
+    assert not any(isinstance(h, logging.handlers.QueueHandler)
+                   for h in check_sitemaps.logger.handlers)
+
+def test_path_stats_reorder_probes_and_persist(path_stats_file, mock_session):
+    """Paths that hit in earlier runs are probed first and counts are saved."""
+    path_stats_file.write_text(json.dumps({'/sitemap.xml': 3, '/mapas/sitemap-index.xml': 5,
+                                           '/unknown.xml': 9, '/sitemap_news.xml': 'x'}))
+    submitted = []
+
+    def fake_find(session, site_info):
+        submitted.extend(check_sitemaps.ordered_sitemap_paths()[:3])
+        check_sitemaps.record_path_hit(site_info.url, site_info.url + '/sitemap.xml')
+        return site_info.url + '/sitemap.xml'
+
+    with patch('discover_monitor.check_sitemaps.SITES', (SiteSpec('Example', 'https://example.com'),)), \
+         patch('discover_monitor.check_sitemaps.find_sitemap', side_effect=fake_find), \
+         patch('discover_monitor.check_sitemaps.save_results'):
+        main()
+
+    assert submitted == ['/mapas/sitemap-index.xml', '/sitemap.xml', '/sitemap_index.xml']
+    assert json.loads(path_stats_file.read_text()) == {'/sitemap.xml': 4, '/mapas/sitemap-index.xml': 5}
+
+def test_main_progress_bar_only_counts_sites(mock_session):
+    """The progress bar is rate-limited and is not redrawn with per-site text."""
+    with patch('discover_monitor.check_sitemaps.tqdm') as mock_tqdm, \
+         patch('discover_monitor.check_sitemaps.find_sitemap', return_value=None), \
+         patch('discover_monitor.check_sitemaps.save_results'):
+        main()
+
+    assert mock_tqdm.call_args.kwargs['mininterval'] == 0.5
+    pbar = mock_tqdm.return_value.__enter__.return_value
+    assert pbar.update.call_count == len(SITES)
+    pbar.set_description.assert_not_called()
+
+def test_process_site_prefers_configured_name(mock_session):
+    """The SiteSpec name is used as is and only derived when missing."""
+    with patch('discover_monitor.check_sitemaps.find_sitemap', return_value=None):
+        named = check_sitemaps.process_site(mock_session, SiteSpec('El País', 'https://elpais.com/'))
+        unnamed = check_sitemaps.process_site(mock_session, SiteSpec('', 'https://www.elmundo.es'))
+
+    assert named == {'url': 'https://elpais.com', 'sitemap': None, 'name': 'El País'}
+    assert unnamed['name'] == 'Elmundo'
+    assert check_sitemaps.site_name_from_url('https://okdiario.com/www.x') == 'Okdiario'
+
+def test_build_config_snippet():
+    """The generated WEBSITES block is valid Python building SiteSpec entries."""
+    results = [
+        {'url': 'https://theobjective.com', 'sitemap': 'https://theobjective.com/sitemap_index.xml',
+         'name': 'The Objective'},
+        {'url': 'https://elpais.com', 'sitemap': None, 'name': "El País"},
+    ]
+
+    snippet = check_sitemaps.build_config_snippet(results)
+
+    namespace = {'SiteSpec': SiteSpec}
+    exec(snippet, namespace)
+    assert namespace['WEBSITES'] == (
+        SiteSpec('The Objective', 'https://theobjective.com',
+                 'https://theobjective.com/sitemap_index.xml', is_own_site=True),
+        SiteSpec('El País', 'https://elpais.com', None),
+    )
+    assert snippet.endswith(")\n")
+
+def test_record_path_hit_ignores_other_urls():
+    """Only sitemaps at one of the site's SITEMAP_PATHS are counted."""
+    check_sitemaps.record_path_hit('https://www.infobae.com/espana/', 'https://www.infobae.com/sitemap.xml')
+    check_sitemaps.record_path_hit('https://example.com', 'https://example.com/custom-sitemap.xml')
+    check_sitemaps.record_path_hit('https://example.com', 'https://cdn.example.net/sitemap.xml')
+
+    assert check_sitemaps._PATH_STATS == {'/sitemap.xml': 1}
+
+def test_load_path_stats_missing_or_corrupt(path_stats_file):
+    """A missing or unreadable stats file means no history."""
+    assert check_sitemaps.load_path_stats() == {}
+    path_stats_file.write_text('not json')
+    assert check_sitemaps.load_path_stats() == {}
 
 # Test edge cases
 def test_check_sitemap_url_none_path(mock_session):
-    """Test check_sitemap_url with None path."""
-    assert check_sitemap_url(mock_session, "https://example.com", None) is None
+    """Test check_sitemap_url with None URL."""
+    assert check_sitemap_url(mock_session, None) is None
+    mock_session.get.assert_not_called()
+
+@patch('discover_monitor.check_sitemaps.get_sitemap_from_robots', return_value=None)
+@patch('discover_monitor.check_sitemaps.SITEMAP_PATHS', ['/sitemap.xml', '/sitemap_news.xml'])
+def test_find_sitemap_candidates_use_site_origin(mock_robots, mock_session):
+    """Candidate URLs hang from the site origin, as urljoin did."""
+    with patch('discover_monitor.check_sitemaps.check_sitemap_url', return_value=None) as mock_check:
+        find_sitemap(mock_session, SiteSpec('Infobae', 'https://www.infobae.com/espana/'))
+
+    checked = sorted(call.args[1] for call in mock_check.call_args_list)
+    assert checked == [
+        'https://www.infobae.com/sitemap.xml',
+        'https://www.infobae.com/sitemap_news.xml',
+    ]
 
 def test_find_sitemap_empty_site_info(mock_session):
-    """Test find_sitemap with empty site info."""
-    with pytest.raises(KeyError):
+    """Test find_sitemap with something that is not a SiteSpec."""
+    with pytest.raises(AttributeError):
         find_sitemap(mock_session, {})
+
+def test_site_spec_is_frozen():
+    """SITES entries are immutable slotted records."""
+    site = SITES[0]
+    with pytest.raises(AttributeError):
+        site.url = 'https://example.com'
+    assert not hasattr(site, '__dict__')
+    assert isinstance(SITES, tuple)
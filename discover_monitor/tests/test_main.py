@@ -11,6 +11,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 # Now import the module
+from discover_monitor.config import SiteSpec
 from discover_monitor.main import check_requirements, parse_arguments, main
 from discover_monitor.scraper import DiscoverMonitor
 
@@ -43,12 +44,12 @@ def setup_environment(monkeypatch, tmp_path):
     monkeypatch.chdir(test_dir)
     
     # Mock WEBSITES in config
-    with patch('discover_monitor.config.WEBSITES', [{
-        'name': 'Test Site',
-        'url': 'https://example.com',
-        'sitemap': 'https://example.com/sitemap.xml',
-        'is_own_site': True
-    }]):
+    with patch('discover_monitor.config.WEBSITES', (SiteSpec(
+        name='Test Site',
+        url='https://example.com',
+        sitemap='https://example.com/sitemap.xml',
+        is_own_site=True
+    ),)):
         yield test_dir, creds_file, data_dir
 
 # Test cases for check_requirements
@@ -124,6 +125,7 @@ def test_main_success(mock_parse_args, mock_monitor_class, setup_environment, ca
     
     # Create a mock for the DiscoverMonitor instance
     mock_monitor = MagicMock()
+    mock_monitor.__enter__.return_value = mock_monitor
     mock_monitor_class.return_value = mock_monitor
     
     # Call the main function
@@ -133,6 +135,7 @@ def test_main_success(mock_parse_args, mock_monitor_class, setup_environment, ca
     # Verify the monitor was called
     mock_monitor_class.assert_called_once()
     mock_monitor.run.assert_called_once()
+    mock_monitor.__exit__.assert_called_once()
     
     # Verify output
     captured = capsys.readouterr()
@@ -152,6 +155,7 @@ def test_main_keyboard_interrupt(mock_parse_args, mock_monitor_class, setup_envi
     # Make the monitor.run() raise KeyboardInterrupt
     mock_monitor = MagicMock()
     mock_monitor.run.side_effect = KeyboardInterrupt()
+    mock_monitor.__enter__.return_value = mock_monitor
     mock_monitor_class.return_value = mock_monitor
     
     # Call the main function and check exit code
@@ -177,6 +181,7 @@ def test_main_unexpected_error(mock_parse_args, mock_monitor_class, setup_enviro
     # Make the monitor.run() raise an unexpected exception
     mock_monitor = MagicMock()
     mock_monitor.run.side_effect = Exception("Test error")
+    mock_monitor.__enter__.return_value = mock_monitor
     mock_monitor_class.return_value = mock_monitor
     
     # Call the main function and check exit code
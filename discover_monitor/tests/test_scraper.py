@@ -16,7 +16,8 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 # Now import the module
-from discover_monitor.scraper import Article, _parse_date, DiscoverMonitor, DATA_DIR, ARTICLES_FILE
+from discover_monitor.config import SiteSpec
+from discover_monitor.scraper import Article, _parse_date, DiscoverMonitor, DATA_DIR, ARTICLES_FILE, MAX_WORKERS
 
 # Test data
 TEST_ARTICLE = Article(
@@ -77,6 +78,14 @@ def test_article_to_dict_with_none_dates(sample_article):
     assert result["last_modified"] is None
     assert result["image_url"] is None
 
+def test_article_uses_slots(sample_article):
+    """Article instances are slotted but their fields stay writable."""
+    assert not hasattr(sample_article, '__dict__')
+    sample_article.source = "other.com"
+    assert sample_article.source == "other.com"
+    with pytest.raises(AttributeError):
+        sample_article.unknown_field = "value"
+
 # Test cases for _parse_date function
 def test_parse_date_iso_with_timezone():
     """Test _parse_date with ISO 8601 format with timezone."""
@@ -120,12 +129,32 @@ def test_parse_date_rfc2822():
     assert result.replace(tzinfo=None) == datetime(2023, 1, 1, 12, 30, 45)
     assert result.tzinfo == timezone.utc
 
+@pytest.mark.parametrize("date_str, expected", [
+    ("Mon, 01 Jan 2023 12:30:45", datetime(2023, 1, 1, 12, 30, 45)),
+    ("Mon Jan 02 10:00:00 2023", datetime(2023, 1, 2, 10, 0, 0)),
+    ("25/12/2023", datetime(2023, 12, 25)),
+    ("12/25/2023", datetime(2023, 12, 25)),
+    ("January 5, 2023", datetime(2023, 1, 5)),
+])
+def test_parse_date_format_dispatch(date_str, expected):
+    """Test that the prefilter picks the right format and falls back to dateutil."""
+    assert _parse_date(date_str) == expected
+
 def test_parse_date_invalid():
     """Test _parse_date with invalid date string."""
     assert _parse_date("not a date") is None
     assert _parse_date("") is None
     assert _parse_date(None) is None
 
+def test_parse_date_iso_zulu_fast_path():
+    """Test _parse_date with a trailing 'Z' and that repeated strings are cached."""
+    from datetime import timezone
+    with patch('discover_monitor.scraper.date_parser.parse') as mock_parse:
+        result = _parse_date(" 2023-01-01T12:30:45Z ")
+        assert _parse_date("2023-01-01T12:30:45Z") is result
+    assert result == datetime(2023, 1, 1, 12, 30, 45, tzinfo=timezone.utc)
+    mock_parse.assert_not_called()
+
 # Test cases for DiscoverMonitor class
 class TestDiscoverMonitor:
     """Test cases for the DiscoverMonitor class."""
@@ -135,6 +164,8 @@ class TestDiscoverMonitor:
         """Setup method that runs before each test."""
         self.output_file = str(tmp_path / 'test_articles.csv')
         self.monitor = DiscoverMonitor(self.output_file)
+        yield
+        self.monitor.close()
         
     @pytest.fixture
     def monitor(self):
@@ -144,11 +175,70 @@ class TestDiscoverMonitor:
     def test_init(self, monitor):
         """Test DiscoverMonitor initialization."""
         assert monitor.output_file == self.output_file
-        assert monitor.max_workers == 5  # Default max workers
+        assert monitor.max_workers == MAX_WORKERS  # Default max workers
         assert isinstance(monitor.articles, list)
         assert isinstance(monitor.processed_urls, set)
         assert 'User-Agent' in monitor.session.headers
     
+    def test_create_session_uses_requests_cache_when_available(self):
+        """The on-disk HTTP cache is used only when requests-cache is installed."""
+        fake_cache = MagicMock()
+        fake_cache.CachedSession.return_value = requests.Session()
+        with patch('discover_monitor.http_cache.requests_cache', fake_cache):
+            session = DiscoverMonitor._create_session()
+        assert session is fake_cache.CachedSession.return_value
+        _, kwargs = fake_cache.CachedSession.call_args
+        assert kwargs['backend'] == 'sqlite'
+        assert kwargs['cache_control'] is True
+        assert kwargs['filter_fn'] == DiscoverMonitor._is_cacheable_sitemap
+        
+        with patch('discover_monitor.http_cache.requests_cache', None):
+            assert type(DiscoverMonitor._create_session()) is requests.Session
+    
+    @pytest.mark.parametrize("headers, expected", [
+        ({'content-type': 'application/xml; charset=utf-8'}, True),
+        ({'content-type': 'text/xml', 'content-length': '2048'}, True),
+        ({'content-type': 'text/xml', 'content-length': str(50 * 1024 * 1024)}, False),
+        ({'content-type': 'text/html; charset=utf-8'}, False),
+        ({'content-type': 'application/pdf', 'content-length': '1024'}, False),
+        ({}, False),
+    ])
+    def test_only_sitemaps_are_cacheable(self, headers, expected):
+        """Article pages and non-XML responses never go through the HTTP cache."""
+        response = MagicMock(headers=headers)
+        assert DiscoverMonitor._is_cacheable_sitemap(response) is expected
+    
+    def test_close_shuts_down_shared_pool(self, tmp_path):
+        """Test that close() (and leaving the with block) stops the worker threads."""
+        import threading
+        
+        started = threading.Event()
+        release = threading.Event()
+        
+        def block():
+            started.set()
+            release.wait(5)
+        
+        with DiscoverMonitor(str(tmp_path / "articles.csv"), max_workers=1) as monitor:
+            running = monitor._executor.submit(block)
+            started.wait(5)
+            queued = monitor._executor.submit(lambda: None)
+            # Let the running task finish only once shutdown has cancelled the queue
+            threading.Timer(0.1, release.set).start()
+        
+        assert running.done()
+        assert queued.cancelled()
+        with pytest.raises(RuntimeError):
+            monitor._executor.submit(lambda: None)
+    
+    def test_session_uses_pooled_adapter(self, monitor):
+        """The session mounts one pooled adapter with retries for http and https."""
+        adapter = monitor.session.get_adapter('https://example.com')
+        assert monitor.session.get_adapter('http://example.com') is adapter
+        assert adapter._pool_maxsize >= monitor.max_workers
+        assert adapter.max_retries.total == 3
+        assert 502 in adapter.max_retries.status_forcelist
+    
     def test_setup_directories(self, monitor, tmp_path):
         """Test that setup_directories creates the output directory."""
         output_dir = os.path.dirname(monitor.output_file)
@@ -214,6 +304,7 @@ class TestDiscoverMonitor:
         
         mock_response = MagicMock()
         mock_response.text = sample_html
+        mock_response.content = mock_response.text.encode('utf-8')
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
         
@@ -266,6 +357,7 @@ class TestDiscoverMonitor:
         # Setup mock response with invalid HTML
         mock_response = MagicMock()
         mock_response.text = "<html><body><p>Invalid HTML fragment"
+        mock_response.content = mock_response.text.encode('utf-8')
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
 
@@ -298,6 +390,7 @@ class TestDiscoverMonitor:
         <!DOCTYPE html>
         <html><head><title>Final Destination</title></head></html>
         """
+        mock_response.content = mock_response.text.encode('utf-8')
         mock_response.url = "https://example.com/final-destination"
         mock_response.history = [MagicMock(status_code=301, url="https://example.com/old-url")]
         mock_response.raise_for_status.return_value = None
@@ -353,6 +446,7 @@ class TestDiscoverMonitor:
         """Test handling of non-HTML responses."""
         mock_response = MagicMock()
         mock_response.text = '{"error": "Not found"}'
+        mock_response.content = mock_response.text.encode('utf-8')
         mock_response.headers = {'content-type': 'application/json'}
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
@@ -381,6 +475,7 @@ class TestDiscoverMonitor:
         
         mock_response = MagicMock()
         mock_response.text = malicious_html
+        mock_response.content = mock_response.text.encode('utf-8')
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
         
@@ -395,6 +490,7 @@ class TestDiscoverMonitor:
         """Test handling of empty or whitespace-only responses."""
         mock_response = MagicMock()
         mock_response.text = "   \n\t\r\n"
+        mock_response.content = mock_response.text.encode('utf-8')
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
         
@@ -405,6 +501,51 @@ class TestDiscoverMonitor:
         assert article.description == ""
         assert article.section == "General"
     
+    @patch('discover_monitor.scraper.requests.Session.get')
+    def test_parse_article_from_url_uses_bytes_and_declared_charset(self, mock_get, monitor):
+        """The page bytes are decoded with the charset from the header or the page."""
+        mock_response = MagicMock()
+        mock_response.content = "<html><head><title>Política y economía</title></head></html>".encode('latin-1')
+        mock_response.headers = {'content-type': 'text/html; charset=ISO-8859-1'}
+        mock_response.encoding = 'ISO-8859-1'
+        mock_get.return_value = mock_response
+
+        assert monitor._parse_article_from_url("https://example.com/a").title == "Política y economía"
+
+        mock_response.content = ('<html><head><meta charset="utf-8">'
+                                 '<title>Política y economía</title></head></html>').encode('utf-8')
+        mock_response.headers = {'content-type': 'text/html'}
+        mock_response.encoding = 'ISO-8859-1'  # requests' default for text/* without charset
+
+        assert monitor._parse_article_from_url("https://example.com/b").title == "Política y economía"
+
+    @patch('discover_monitor.scraper.requests.Session.get')
+    def test_parse_article_from_url_candidate_priorities(self, mock_get, monitor):
+        """Each field takes its highest-priority non-empty candidate from one pass."""
+        html = """
+        <html><head>
+            <meta name="twitter:image" content="https://example.com/twitter.jpg">
+            <meta property="og:title" content="  OG Title  ">
+            <meta name="description" content="">
+        </head><body>
+            <div class="entry-content"><p>Entry paragraph</p></div>
+            <p class="lead article-summary">Summary text</p>
+            <figure><img src="https://example.com/figure.jpg"></figure>
+            <h1>   </h1>
+        </body></html>
+        """
+        mock_response = MagicMock()
+        mock_response.content = html.encode('utf-8')
+        mock_response.headers = {'content-type': 'text/html'}
+        mock_get.return_value = mock_response
+
+        article = monitor._parse_article_from_url("https://example.com/news/story")
+
+        assert article.title == "OG Title"
+        assert article.description == "Summary text"
+        assert article.image_url == "https://example.com/twitter.jpg"
+        assert article.section == "News"
+
     def test_parse_sitemap_index_with_namespace(self, monitor, caplog):
         """Test parsing a sitemap index with XML namespace."""
         # Sample sitemap index with namespace
@@ -465,6 +606,22 @@ class TestDiscoverMonitor:
         # Verify error was logged
         assert any("Error de parseo XML" in str(record.message) for record in caplog.records)
     
+    def test_parse_sitemap_index_recovers_malformed_xml(self, monitor, caplog):
+        """Locs before a syntax error are still recovered by lxml."""
+        xml_content = b"""<?xml version="1.0" encoding="UTF-8"?>
+        <sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+            <sitemap><loc>https://example.com/sitemap1.xml</loc></sitemap>
+            <sitemap><loc>/relative.xml</loc></sitemap>
+            <sitemap><loc>https://example.com/sitemap2.xml</loc></sitemap>
+            <sitemap><loc>https://example.com/broken.xml</sitemap>"""
+        
+        with caplog.at_level('WARNING'):
+            urls = monitor._parse_sitemap_index(xml_content)
+        
+        assert urls[:2] == ["https://example.com/sitemap1.xml", "https://example.com/sitemap2.xml"]
+        assert "Error de parseo XML" in caplog.text
+        assert "URL relativa encontrada en sitemap: /relative.xml" in caplog.text
+    
     def test_parse_sitemap_index_empty(self, monitor):
         """Test parsing an empty sitemap index."""
         # Empty sitemap index
@@ -723,6 +880,45 @@ class TestDiscoverMonitor:
         # The current implementation doesn't log a specific message for missing loc tags
         # but we know it skips these entries because the articles list is empty
         
+    def test_parse_standard_sitemap_direct_tags_win_over_nested(self, monitor):
+        """A nested <image:loc> listed first does not replace the entry's own <loc>."""
+        xml_content = b"""<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+                xmlns:image="http://www.google.com/schemas/sitemap-image/1.1"
+                xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">
+            <url>
+                <image:image><image:loc>https://example.com/img.jpg</image:loc></image:image>
+                <!-- comment -->
+                <loc> https://example.com/politica/story </loc>
+                <news:news><news:title>Nested title</news:title></news:news>
+                <lastmod>2023-05-06</lastmod>
+            </url>
+        </urlset>"""
+        
+        articles = monitor._parse_standard_sitemap(xml_content)
+        
+        assert len(articles) == 1
+        assert articles[0].url == "https://example.com/politica/story"
+        assert articles[0].section == "politica"
+        assert articles[0].title == "Nested title"
+        assert articles[0].last_modified == datetime(2023, 5, 6)
+    
+    def test_parse_standard_sitemap_declared_encoding(self, monitor):
+        """Test that the declared encoding is honoured for bytes and ignored for text."""
+        xml_content = """<?xml version="1.0" encoding="ISO-8859-1"?>
+        <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+            <url>
+                <loc>https://example.com/espana/noticia</loc>
+                <title>Título en España</title>
+            </url>
+        </urlset>"""
+        
+        from_bytes = monitor._parse_standard_sitemap(xml_content.encode('iso-8859-1'))
+        from_text = monitor._parse_standard_sitemap(xml_content)
+        
+        assert [a.title for a in from_bytes] == ["Título en España"]
+        assert [a.title for a in from_text] == ["Título en España"]
+        assert from_bytes[0].section == "espana"
+        
     def test_run_success(self, monitor, caplog, tmp_path):
         """Test the run method with successful execution."""
         # Set up test data
@@ -781,6 +977,7 @@ class TestDiscoverMonitor:
                 <priority>0.8</priority>
             </url>
         </urlset>"""
+        mock_response.content = mock_response.text.encode('utf-8')
         mock_response.headers = {'content-type': 'application/xml'}
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
@@ -802,6 +999,76 @@ class TestDiscoverMonitor:
         assert any("Detected standard sitemap" in msg for msg in log_messages), \
             f"Expected log message not found. Logs: {log_messages}"
         
+    @patch('discover_monitor.scraper.requests.Session.get')
+    def test_fetch_sitemap_conditional_get(self, mock_get, monitor, caplog):
+        """Test that sitemap validators are persisted and a 304 skips the sitemap."""
+        sitemap_url = "https://example.com/sitemap.xml"
+        first = MagicMock(status_code=200)
+        first.content = b"""<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+            <url><loc>https://example.com/page1</loc></url>
+        </urlset>"""
+        first.headers = {'content-type': 'application/xml', 'ETag': '"abc"',
+                         'Last-Modified': 'Sun, 01 Jan 2023 00:00:00 GMT'}
+        mock_get.return_value = first
+        
+        assert len(monitor.fetch_sitemap(sitemap_url)) == 1
+        assert 'headers' not in mock_get.call_args.kwargs
+        monitor._save_sitemap_meta()
+        
+        # A new monitor reads the validators back and sends a conditional GET
+        mock_get.reset_mock()
+        mock_get.return_value = MagicMock(status_code=304)
+        other = DiscoverMonitor(monitor.output_file)
+        with caplog.at_level(logging.INFO):
+            assert other.fetch_sitemap(sitemap_url) == []
+        
+        assert mock_get.call_args.kwargs['headers'] == {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Sun, 01 Jan 2023 00:00:00 GMT',
+        }
+        assert "Sitemap sin cambios" in caplog.text
+        
+        # Forgetting the validators makes the next fetch unconditional again
+        other._forget_sitemap_meta(sitemap_url)
+        mock_get.return_value = first
+        other.fetch_sitemap(sitemap_url)
+        assert 'headers' not in mock_get.call_args.kwargs
+    
+    @patch('discover_monitor.scraper.requests.Session.get')
+    def test_fetch_sitemap_unchanged_index_still_fetches_children(self, mock_get, monitor):
+        """Test that a 304 for an index still fetches its stored child sitemaps."""
+        index_url = "https://example.com/index.xml"
+        child_url = "https://example.com/news.xml"
+        index = MagicMock(status_code=200)
+        index.content = f"""<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+            <sitemap><loc>{child_url}</loc></sitemap>
+        </sitemapindex>""".encode()
+        index.headers = {'content-type': 'application/xml', 'ETag': '"index"'}
+        
+        def child(page):
+            response = MagicMock(status_code=200)
+            response.content = f"""<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+                <url><loc>https://example.com/{page}</loc></url>
+            </urlset>""".encode()
+            response.headers = {'content-type': 'application/xml', 'ETag': f'"{page}"'}
+            return response
+        
+        responses = {index_url: index, child_url: child("page1")}
+        mock_get.side_effect = lambda url, **kwargs: responses[url]
+        assert [a.url for a in monitor.fetch_sitemap(index_url)] == ["https://example.com/page1"]
+        monitor._save_sitemap_meta()
+        
+        # The index is byte-identical, but its child has a new article
+        responses = {index_url: MagicMock(status_code=304), child_url: child("page2")}
+        mock_get.reset_mock()
+        other = DiscoverMonitor(monitor.output_file)
+        articles = other.fetch_sitemap(index_url)
+        
+        assert [a.url for a in articles] == ["https://example.com/page2"]
+        headers = {call.args[0]: call.kwargs['headers'] for call in mock_get.call_args_list}
+        assert headers == {index_url: {'If-None-Match': '"index"'},
+                           child_url: {'If-None-Match': '"page1"'}}
+    
     @patch('discover_monitor.scraper.requests.Session.get')
     def test_fetch_news_sitemap(self, mock_get, monitor, caplog):
         """Test fetch_sitemap with a news sitemap."""
@@ -822,6 +1089,7 @@ class TestDiscoverMonitor:
                 </news:news>
             </url>
         </urlset>"""
+        mock_response.content = mock_response.text.encode('utf-8')
         mock_response.headers = {'content-type': 'application/xml'}
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
@@ -841,8 +1109,10 @@ class TestDiscoverMonitor:
         assert len(articles) == 1
         assert articles[0].url == "https://example.com/news1"
         assert articles[0].title == "Test News Article"
-        assert any("Detected standard sitemap:" in msg for msg in log_messages), \
-            f"Expected standard sitemap log message not found. Logs: {log_messages}"
+        # The sitemap-news namespace in the document head marks it as a news sitemap
+        assert any("Detected news sitemap:" in msg for msg in log_messages), \
+            f"Expected news sitemap log message not found. Logs: {log_messages}"
+        assert articles[0].published_date == datetime(2023, 1, 1, 12, 0, tzinfo=timezone.utc)
         
     @patch('discover_monitor.scraper.requests.Session.get')
     def test_fetch_standard_sitemap(self, mock_get, monitor, caplog):
@@ -858,6 +1128,7 @@ class TestDiscoverMonitor:
                 <priority>0.8</priority>
             </url>
         </urlset>"""
+        mock_response.content = mock_response.text.encode('utf-8')
         mock_response.headers = {'content-type': 'application/xml'}
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
@@ -879,6 +1150,154 @@ class TestDiscoverMonitor:
         assert any("Detected standard sitemap" in msg for msg in log_messages), \
             f"Expected log message not found. Logs: {log_messages}"
         
+    def test_fetch_sitemap_nested_index_shared_pool(self, tmp_path, caplog):
+        """Test nested sitemap indexes on a single small pool, with the per-index limit."""
+        def index(*locs):
+            entries = ''.join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs)
+            return ('<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                    f'{entries}</sitemapindex>')
+        
+        def urlset(loc):
+            return ('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                    f'<url><loc>{loc}</loc></url></urlset>')
+        
+        pages = {
+            "https://example.com/index.xml": index("https://example.com/sub-index.xml",
+                                                   "https://example.com/a.xml"),
+            "https://example.com/sub-index.xml": index("https://example.com/b.xml",
+                                                       "https://example.com/index.xml",
+                                                       "https://example.com/c.xml"),
+            "https://example.com/a.xml": urlset("https://example.com/a"),
+            "https://example.com/b.xml": urlset("https://example.com/b"),
+            "https://example.com/c.xml": urlset("https://example.com/c"),
+        }
+        
+        def fake_get(url, timeout):
+            response = MagicMock()
+            response.content = pages[url].encode('utf-8')
+            response.headers = {'content-type': 'application/xml'}
+            return response
+        
+        monitor = DiscoverMonitor(output_file=str(tmp_path / "articles.csv"),
+                                  max_workers=1, max_index_sitemaps=2)
+        with patch.object(monitor.session, 'get', side_effect=fake_get) as mock_get:
+            with caplog.at_level(logging.INFO):
+                articles = monitor.fetch_sitemap("https://example.com/index.xml")
+        
+        # c.xml is beyond the limit of the sub-index; the loop back to index.xml is not followed
+        assert sorted(a.url for a in articles) == ["https://example.com/a", "https://example.com/b"]
+        assert mock_get.call_count == 4
+        assert "solo se procesan los primeros 2" in caplog.text
+    
+    def test_extract_articles_bulk_caps_requests_per_host(self, tmp_path):
+        """Test that bulk extraction keeps at most MAX_REQUESTS_PER_HOST in flight per host."""
+        import threading
+        import time
+        
+        lock = threading.Lock()
+        in_flight = {}
+        peak = {}
+        
+        def fake_extract(article):
+            host = article.url.split('/')[2]
+            with lock:
+                in_flight[host] = in_flight.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), in_flight[host])
+            time.sleep(0.02)
+            with lock:
+                in_flight[host] -= 1
+            return article
+        
+        articles = [
+            Article(url=f"https://{host}/{i}", title="", section="", description="",
+                    source="", is_own_site=False)
+            for host in ("a.example.com", "b.example.com") for i in range(6)
+        ]
+        monitor = DiscoverMonitor(output_file=str(tmp_path / "articles.csv"), max_workers=12)
+        with patch('discover_monitor.scraper.MAX_REQUESTS_PER_HOST', 2), \
+             patch.object(monitor, 'extract_article_info', side_effect=fake_extract):
+            futures = monitor.extract_articles_bulk(articles)
+            results = [future.result() for future in futures]
+        
+        assert sorted(a.url for a in results) == sorted(a.url for a in articles)
+        assert list(futures.values()) == articles
+        assert peak == {"a.example.com": 2, "b.example.com": 2}
+    
+    def test_extract_articles_bulk_host_backlog_does_not_block_pool(self, tmp_path):
+        """Articles waiting for a host slot stay out of the pool, so other tasks start at once."""
+        import threading
+        
+        release = threading.Event()
+        started = []
+        
+        def fake_extract(article):
+            started.append(article.url)
+            release.wait(5)
+            return article
+        
+        articles = [
+            Article(url=f"https://a.example.com/{i}", title="", section="", description="",
+                    source="", is_own_site=False)
+            for i in range(10)
+        ]
+        monitor = DiscoverMonitor(output_file=str(tmp_path / "articles.csv"), max_workers=4)
+        with patch('discover_monitor.scraper.MAX_REQUESTS_PER_HOST', 2), \
+             patch.object(monitor, 'extract_article_info', side_effect=fake_extract):
+            futures = monitor.extract_articles_bulk(articles)
+            other = monitor._executor.submit(lambda: "otro sitio")
+            try:
+                # Only two workers are busy with the host; the rest are free
+                assert other.result(timeout=1) == "otro sitio"
+                assert len(started) == 2
+            finally:
+                release.set()
+            results = [future.result(timeout=5) for future in futures]
+        
+        assert results == articles
+        assert monitor._host_queues == {} and monitor._host_active == {}
+    
+    @patch('discover_monitor.scraper.requests.Session.get')
+    def test_extract_article_info_skips_oversized_pages(self, mock_get, monitor, caplog):
+        """Pages above MAX_PAGE_BYTES are rejected by header or while streaming."""
+        declared_article, streamed_article = (
+            Article(url=f"https://example.com/{name}", title="", section="", description="",
+                    source="", is_own_site=False)
+            for name in ("huge", "huge-streamed")
+        )
+        declared = MagicMock()
+        declared.headers = {'content-type': 'text/html', 'content-length': '5000'}
+        streamed = MagicMock()
+        streamed.headers = {'content-type': 'text/html'}
+        streamed.iter_content.return_value = [b"<html>" + b"x" * 600, b"y" * 600]
+        mock_get.side_effect = [declared, streamed]
+        
+        with patch('discover_monitor.scraper.MAX_PAGE_BYTES', 1000):
+            assert monitor.extract_article_info(declared_article) is None
+            assert monitor.extract_article_info(streamed_article) is None
+        
+        declared.iter_content.assert_not_called()
+        declared.close.assert_called_once()
+        streamed.close.assert_called_once()
+        assert mock_get.call_args.kwargs['stream'] is True
+        assert "Skipping page larger than 1000 bytes" in caplog.text
+    
+    def test_parse_article_html_date_falls_through_selectors(self, monitor):
+        """Unparseable date candidates are skipped; text dates use _parse_date formats."""
+        html = """<html><head>
+            <meta property="article:published_time" content="sometime last week">
+        </head><body>
+            <time class="entry-date">25/12/2023 08:30:00</time>
+        </body></html>"""
+        response = MagicMock()
+        response.content = html.encode('utf-8')
+        response.headers = {'content-type': 'text/html'}
+        article = Article(url="https://example.com/a", title="T", section="", description="",
+                          source="", is_own_site=False)
+        
+        monitor._parse_article_html(article, response)
+        
+        assert article.published_date == datetime(2023, 12, 25, 8, 30)
+    
     @patch('discover_monitor.scraper.requests.Session.get')
     def test_fetch_sitemap_request_error(self, mock_get, monitor, caplog):
         """Test fetch_sitemap with a request error."""
@@ -899,6 +1318,7 @@ class TestDiscoverMonitor:
         # Mock the response with invalid XML
         mock_response = MagicMock()
         mock_response.text = "<invalid>xml"
+        mock_response.content = b"<invalid>xml"
         mock_response.headers = {'content-type': 'application/xml'}
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
@@ -953,6 +1373,8 @@ class TestDiscoverMonitor:
         </body>
         </html>
         """
+        mock_response.content = mock_response.text.encode('utf-8')
+        mock_response.iter_content.return_value = [mock_response.content]
         mock_response.headers = {'content-type': 'text/html'}
         mock_response.raise_for_status.return_value = None
         mock_response.url = "https://example.com/article1"  # Ensure the URL is set for urljoin
@@ -1014,6 +1436,8 @@ class TestDiscoverMonitor:
         </body>
         </html>
         """
+        mock_response.content = mock_response.text.encode('utf-8')
+        mock_response.iter_content.return_value = [mock_response.content]
         mock_response.headers = {'content-type': 'text/html'}
         mock_response.raise_for_status.return_value = None
         mock_response.url = "https://example.com"  # Base URL for relative image URLs
@@ -1126,6 +1550,7 @@ class TestDiscoverMonitor:
         # Mock a non-HTML response
         mock_response = MagicMock()
         mock_response.text = "This is not HTML"
+        mock_response.content = mock_response.text.encode('utf-8')
         mock_response.headers = {'content-type': 'text/plain'}
         mock_response.raise_for_status.return_value = None
         mock_response.url = "https://example.com/article4"
@@ -1145,6 +1570,11 @@ class TestDiscoverMonitor:
         log_messages = [record.message for record in caplog.records]
         assert any("Skipping non-HTML content" in msg for msg in log_messages), \
             f"Expected non-HTML warning not found. Logs: {log_messages}"
+        
+        # The rejection is remembered: the URL is not requested again
+        mock_get.reset_mock()
+        assert monitor.extract_article_info(article) is None
+        mock_get.assert_not_called()
     
     @patch('discover_monitor.scraper.DiscoverMonitor.load_existing_data')
     @patch('discover_monitor.scraper.DiscoverMonitor.save_articles')
@@ -1189,6 +1619,131 @@ class TestDiscoverMonitor:
         assert any("Procesando sitio: " in msg for msg in log_messages)
         assert any("Monitoreo completado" in msg for msg in log_messages)
     
+    @patch('discover_monitor.scraper.WEBSITES', (
+        SiteSpec(name='Site A', url='https://a.example.com', sitemap='https://a.example.com/sitemap.xml'),
+        SiteSpec(name='Site B', url='https://b.example.com', sitemap='https://b.example.com/sitemap.xml'),
+    ))
+    @patch('discover_monitor.scraper.DiscoverMonitor.load_existing_data')
+    @patch('discover_monitor.scraper.DiscoverMonitor.save_articles')
+    @patch('discover_monitor.scraper.DiscoverMonitor.extract_article_info')
+    @patch('discover_monitor.scraper.DiscoverMonitor.fetch_sitemap')
+    def test_monitor_websites_saves_once_per_run(self, mock_fetch_sitemap, mock_extract_article_info,
+                                                 mock_save_articles, mock_load_existing_data, monitor):
+        """Test that articles from every site are written with a single save_articles call."""
+        mock_load_existing_data.return_value = pd.DataFrame(columns=['url'])
+        mock_fetch_sitemap.side_effect = lambda sitemap: [
+            Article(url=sitemap.replace('sitemap.xml', 'article'), title="Article", section="news",
+                    description="", source="", is_own_site=False)
+        ]
+        mock_extract_article_info.side_effect = lambda x: x
+        
+        monitor.monitor_websites()
+        
+        mock_save_articles.assert_called_once()
+        saved_articles = mock_save_articles.call_args[0][0]
+        assert sorted(article.url for article in saved_articles) == [
+            'https://a.example.com/article', 'https://b.example.com/article'
+        ]
+        assert sorted(article.source for article in saved_articles) == ['Site A', 'Site B']
+    
+    @patch('discover_monitor.scraper.WEBSITES', (
+        SiteSpec(name='Site A', url='https://a.example.com', sitemap='https://a.example.com/sitemap.xml',
+                 is_own_site=True),
+    ))
+    @patch('discover_monitor.scraper.DiscoverMonitor.load_existing_data')
+    @patch('discover_monitor.scraper.DiscoverMonitor.save_articles')
+    @patch('discover_monitor.scraper.DiscoverMonitor.extract_article_info')
+    @patch('discover_monitor.scraper.DiscoverMonitor.fetch_sitemap')
+    def test_monitor_websites_limit_per_site(self, mock_fetch_sitemap, mock_extract_article_info,
+                                             mock_save_articles, mock_load_existing_data, monitor):
+        """Test that only max_articles_per_site new articles are tagged and fetched."""
+        mock_load_existing_data.return_value = pd.DataFrame({'url': ['https://a.example.com/1']})
+        articles = [
+            Article(url=f"https://a.example.com/{i}", title=str(i), section="news",
+                    description="", source="", is_own_site=False)
+            for i in range(1, 5)
+        ]
+        mock_fetch_sitemap.return_value = articles
+        mock_extract_article_info.side_effect = lambda x: x
+        
+        with patch.object(monitor, '_forget_sitemap_meta') as mock_forget:
+            monitor.monitor_websites(max_articles_per_site=2)
+        
+        saved_articles = mock_save_articles.call_args[0][0]
+        assert sorted(article.url for article in saved_articles) == [
+            'https://a.example.com/2', 'https://a.example.com/3'
+        ]
+        assert [article.is_own_site for article in articles] == [False, True, True, False]
+        mock_forget.assert_called_once_with('https://a.example.com/sitemap.xml')
+    
+    @patch('discover_monitor.scraper.WEBSITES', (
+        SiteSpec(name='Site A', url='https://a.example.com', sitemap='https://a.example.com/sitemap.xml',
+                 is_own_site=False),
+        SiteSpec(name='Site B', url='https://b.example.com', sitemap='https://b.example.com/sitemap.xml',
+                 is_own_site=False),
+        SiteSpec(name='Site C', url='https://c.example.com', sitemap='https://c.example.com/sitemap.xml',
+                 is_own_site=False),
+    ))
+    @patch('discover_monitor.scraper.DiscoverMonitor.load_existing_data')
+    @patch('discover_monitor.scraper.DiscoverMonitor.save_articles')
+    @patch('discover_monitor.scraper.DiscoverMonitor.extract_article_info')
+    @patch('discover_monitor.scraper.DiscoverMonitor.fetch_sitemap')
+    def test_monitor_websites_forgets_sitemaps_with_failed_articles(
+            self, mock_fetch_sitemap, mock_extract_article_info, mock_save_articles,
+            mock_load_existing_data, monitor):
+        """Test that sitemaps with unextracted articles are fetched in full next run."""
+        mock_load_existing_data.return_value = pd.DataFrame()
+        mock_fetch_sitemap.side_effect = lambda sitemap: [
+            Article(url=sitemap.replace('sitemap.xml', str(i)), title=str(i), section="news",
+                    description="", source="", is_own_site=False)
+            for i in range(2)
+        ]
+        
+        def extract(article):
+            if article.url == 'https://a.example.com/1':
+                return None
+            if article.url == 'https://b.example.com/0':
+                raise RuntimeError("boom")
+            return article
+        mock_extract_article_info.side_effect = extract
+        
+        with patch.object(monitor, '_forget_sitemap_meta') as mock_forget:
+            monitor.monitor_websites()
+        
+        assert sorted(call.args[0] for call in mock_forget.call_args_list) == [
+            'https://a.example.com/sitemap.xml', 'https://b.example.com/sitemap.xml'
+        ]
+        assert sorted(a.url for a in mock_save_articles.call_args[0][0]) == [
+            'https://a.example.com/0', 'https://b.example.com/1',
+            'https://c.example.com/0', 'https://c.example.com/1',
+        ]
+    
+    @patch('discover_monitor.scraper.WEBSITES', (
+        SiteSpec(name='Site A', url='https://a.example.com', sitemap='https://a.example.com/sitemap.xml',
+                 is_own_site=False),
+        SiteSpec(name='Site B', url='https://b.example.com', sitemap='https://b.example.com/sitemap.xml',
+                 is_own_site=False),
+    ))
+    @patch('discover_monitor.scraper.requests.Session.get')
+    def test_monitor_websites_unchanged_sitemap_is_not_a_warning(self, mock_get, monitor, caplog):
+        """Test that a site whose sitemap returned 304 is logged at info, not as a warning."""
+        empty = MagicMock(status_code=200)
+        empty.content = b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"></urlset>'
+        empty.headers = {'content-type': 'application/xml'}
+        responses = {
+            'https://a.example.com/sitemap.xml': MagicMock(status_code=304),
+            'https://b.example.com/sitemap.xml': empty,
+        }
+        mock_get.side_effect = lambda url, **kwargs: responses[url]
+        monitor._sitemap_meta = {'https://a.example.com/sitemap.xml': {'etag': '"a"'}}
+        
+        with caplog.at_level(logging.INFO):
+            monitor.monitor_websites()
+        
+        warnings = [r.message for r in caplog.records if r.levelno == logging.WARNING]
+        assert warnings == ["No se encontraron artículos en el sitemap de Site B"]
+        assert "Sitemap de Site A sin cambios desde la última ejecución" in caplog.text
+    
     @patch('discover_monitor.scraper.DiscoverMonitor.load_existing_data')
     @patch('discover_monitor.scraper.DiscoverMonitor.save_articles')
     @patch('discover_monitor.scraper.DiscoverMonitor.fetch_sitemap')
@@ -1234,9 +1789,9 @@ class TestDiscoverMonitor:
         assert any("No hay artículos nuevos" in msg for msg in log_messages)
     
     @patch('discover_monitor.scraper.os.makedirs')
-    @patch('discover_monitor.scraper.WEBSITES', [
-        {'name': 'Test Site', 'sitemap': 'https://example.com/sitemap.xml', 'is_own_site': False}
-    ])
+    @patch('discover_monitor.scraper.WEBSITES', (
+        SiteSpec(name='Test Site', url='https://example.com', sitemap='https://example.com/sitemap.xml'),
+    ))
     @patch('discover_monitor.scraper.DiscoverMonitor.load_existing_data')
     @patch('discover_monitor.scraper.DiscoverMonitor.save_articles')
     @patch('discover_monitor.scraper.DiscoverMonitor.extract_article_info')
@@ -1358,7 +1913,7 @@ def test_load_existing_data_corrupted_file(monkeypatch, tmp_path, caplog):
     
     # Verify the results
     mock_exists.assert_called_once_with(str(temp_file))
-    mock_read_csv.assert_called_once_with(str(temp_file))
+    mock_read_csv.assert_called_once_with(str(temp_file), usecols=None)
     
     # Verify an empty DataFrame is returned
     assert isinstance(result, pd.DataFrame), "Should return a pandas DataFrame"
@@ -1370,423 +1925,238 @@ def test_load_existing_data_corrupted_file(monkeypatch, tmp_path, caplog):
     assert error_found, f"Expected error log message for corrupted file. Logs: {[r.message for r in caplog.records]}"
     
     # Verify the mock was called correctly
-    mock_read_csv.assert_called_once_with(str(temp_file))
+    mock_read_csv.assert_called_once_with(str(temp_file), usecols=None)
 
-def test_save_articles_new_file(monkeypatch, tmp_path, caplog):
-    """Test saving articles to a new file."""
-    from unittest.mock import MagicMock
-    import pandas as pd
-    from discover_monitor.scraper import Article, DiscoverMonitor
-    
-    # Create a temporary file path
-    temp_file = tmp_path / 'test_articles.csv'
-    
-    # Create mock functions
-    mock_exists = MagicMock(return_value=False)  # File doesn't exist
-    mock_makedirs = MagicMock()
-    
-    # Create a mock DataFrame that will be returned by read_csv
-    mock_df = MagicMock()
-    mock_read_csv = MagicMock(return_value=mock_df)  # Return our mock DataFrame
-    
-    # Mock for to_csv
-    mock_to_csv = MagicMock()
-    mock_df.to_csv = mock_to_csv
-    
-    # Mock for DataFrame operations
-    mock_concat = MagicMock(return_value=mock_df)
-    
-    # Create a mock DataFrame class that captures the to_csv call
-    class MockDataFrame(pd.DataFrame):
-        def to_csv(self, *args, **kwargs):
-            mock_to_csv(*args, **kwargs)
-            return None
-        
-        @classmethod
-        def concat(cls, *args, **kwargs):
-            return mock_concat(*args, **kwargs)
-    
-    # Apply the monkeypatches
-    monkeypatch.setattr('os.path.exists', mock_exists)
-    monkeypatch.setattr('os.makedirs', mock_makedirs)
-    monkeypatch.setattr('pandas.read_csv', mock_read_csv)
-    monkeypatch.setattr('pandas.DataFrame', MockDataFrame)
-    monkeypatch.setattr('pandas.concat', mock_concat)
-    
-    # Create a monitor instance with the test file path
+def _csv_article(i, **overrides):
+    """Build a sample Article for the save_articles tests."""
+    fields = dict(
+        url=f'http://example.com/{i}',
+        title=f'Test {i}',
+        section='Test',
+        description='Test description',
+        source='Test Source',
+        is_own_site=bool(i % 2),
+        published_date=datetime(2023, 1, i),
+        last_modified=datetime(2023, 1, i),
+        image_url=f'http://example.com/image{i}.jpg'
+    )
+    fields.update(overrides)
+    return Article(**fields)
+
+def test_save_articles_new_file(tmp_path, caplog):
+    """Test saving articles to a new file writes the header and the rows."""
+    temp_file = tmp_path / 'nested' / 'test_articles.csv'
     monitor = DiscoverMonitor(output_file=str(temp_file))
     
-    # Create test articles with datetime objects
-    from datetime import datetime
-    articles = [
-        Article(
-            url='http://example.com/1',
-            title='Test 1',
-            section='Test',
-            description='Test description',
-            source='Test Source',
-            is_own_site=True,
-            published_date=datetime.fromisoformat('2023-01-01T00:00:00'),
-            last_modified=datetime.fromisoformat('2023-01-01T00:00:00'),
-            image_url='http://example.com/image1.jpg'
-        ),
-        Article(
-            url='http://example.com/2',
-            title='Test 2',
-            section='Test',
-            description='Another test',
-            source='Test Source',
-            is_own_site=False,
-            published_date=datetime.fromisoformat('2023-01-02T00:00:00'),
-            last_modified=datetime.fromisoformat('2023-01-02T00:00:00'),
-            image_url='http://example.com/image2.jpg'
-        )
-    ]
-    
-    # Call the method
     with caplog.at_level(logging.INFO):
-        monitor.save_articles(articles)
-    
-    # Verify the results
-    mock_exists.assert_called_once_with(str(temp_file))
+        monitor.save_articles([_csv_article(1), _csv_article(2)])
     
-    # Check that makedirs was called with the correct arguments
-    # The first call is from the DiscoverMonitor constructor (to create 'data' directory)
-    # The second call is from save_articles (to create the output directory)
-    assert mock_makedirs.call_count >= 1, "Expected at least 1 call to makedirs"
-    
-    # The call should be for the directory containing our temp file
-    expected_dir = os.path.dirname(os.path.abspath(str(temp_file)))
-    mock_makedirs.assert_any_call(expected_dir, exist_ok=True)
-    
-    # Verify to_csv was called with the expected data
-    assert mock_to_csv.called, "DataFrame.to_csv() was not called"
-    
-    # Get the arguments passed to to_csv
-    args, kwargs = mock_to_csv.call_args
-    
-    # The first positional argument should be the file path
-    assert len(args) > 0, "Expected at least one positional argument (file path) to to_csv"
-    assert str(temp_file) in str(args[0]), \
-        f"Expected to save to a path containing {temp_file}, got {args[0] if args else 'no args'}"
-    
-    # Verify the mode is set to write (not append) - could be passed as kwarg or positional
-    mode = kwargs.get('mode', 'w' if len(args) < 2 else args[1] if len(args) >= 2 else 'w')
-    assert mode == 'w', f"Expected mode='w' for new file, got {mode}"
-    
-    # Verify index is set to False
-    index = kwargs.get('index', False)
-    assert index is False, f"Expected index=False, got {index}"
-    
-    # Since we're using a mock DataFrame, we can't directly check its contents
-    # Instead, we'll verify that to_csv was called with the expected arguments
-    # and that our mock DataFrame was used correctly
-    
-    # Verify the success message was logged
+    df = pd.read_csv(temp_file)
+    assert list(df.columns) == list(_csv_article(1).to_dict())
+    assert df['url'].tolist() == ['http://example.com/1', 'http://example.com/2']
+    assert df['published_date'].tolist() == ['2023-01-01T00:00:00', '2023-01-02T00:00:00']
+    assert df['is_own_site'].tolist() == [True, False]
     assert any("Saved 2 articles to" in record.message for record in caplog.records), \
         "Expected success log message when saving articles"
 
 def test_save_articles_append_to_existing(monkeypatch, tmp_path, caplog):
-    """Test appending articles to an existing file."""
-    from unittest.mock import MagicMock
-    import pandas as pd
-    from discover_monitor.scraper import Article, DiscoverMonitor
-    
-    # Create a temporary file path
+    """Test that only the new rows are appended, without re-reading the CSV."""
     temp_file = tmp_path / 'test_articles.csv'
+    monitor = DiscoverMonitor(output_file=str(temp_file))
+    monitor.save_articles([_csv_article(1)])
     
-    # Setup test data for existing articles
-    existing_articles = pd.DataFrame([
-        {
-            'url': 'https://example.com/existing',
-            'title': 'Existing Article',
-            'section': 'news',
-            'description': 'Existing description',
-            'source': 'example.com',
-            'is_own_site': True,
-            'published_date': '2023-01-01T00:00:00',
-            'last_modified': '2023-01-01T00:00:00',
-            'image_url': 'https://example.com/existing.jpg'
-        }
-    ])
-    
-    # New articles to append
-    new_articles = [
-        {
-            'title': 'New Article',
-            'url': 'https://example.com/new',
-            'section': 'news',
-            'description': 'New description',
-            'source': 'example.com',
-            'is_own_site': True,
-            'published_date': '2023-01-02T00:00:00',
-            'last_modified': '2023-01-02T00:00:00',
-            'image_url': 'https://example.com/new.jpg'
-        }
-    ]
-    
-    # Create a mock for pd.read_csv
-    mock_read_csv = MagicMock(return_value=existing_articles)
+    mock_read_csv = MagicMock(side_effect=AssertionError("existing CSV must not be re-read"))
     monkeypatch.setattr('pandas.read_csv', mock_read_csv)
     
-    # Create a mock for os.path.exists
-    mock_exists = MagicMock(return_value=True)
-    monkeypatch.setattr('os.path.exists', mock_exists)
-    
-    # Create a mock for pd.concat
-    combined_df = pd.concat([existing_articles, pd.DataFrame(new_articles)])
-    mock_concat = MagicMock(return_value=combined_df)
-    monkeypatch.setattr('pandas.concat', mock_concat)
-    
-    # Create a mock for DataFrame.to_csv
-    mock_to_csv = MagicMock()
-    monkeypatch.setattr('pandas.DataFrame.to_csv', mock_to_csv)
-    
-    # Create a mock for os.makedirs
-    mock_makedirs = MagicMock()
-    monkeypatch.setattr('os.makedirs', mock_makedirs)
-    
-    # Create a monitor instance with the test file path
-    monitor = DiscoverMonitor(output_file=str(temp_file))
-    
-    # Call the method with the new articles
+    # Dictionaries with missing keys are accepted as well
+    new_articles = [{
+        'title': 'New Article',
+        'url': 'https://example.com/new',
+        'section': 'news',
+        'source': 'example.com',
+    }]
     with caplog.at_level(logging.INFO):
         monitor.save_articles(new_articles)
     
-    # Verify the results
-    mock_exists.assert_called_once_with(str(temp_file))
-    mock_read_csv.assert_called_once_with(str(temp_file))
-    
-    # Verify concat was called with the correct arguments
-    assert mock_concat.call_count == 1
-    concat_args, _ = mock_concat.call_args
-    # pd.concat is called with a single list argument containing DataFrames
-    assert len(concat_args) == 1
-    assert isinstance(concat_args[0], list)
-    assert len(concat_args[0]) == 2
-    assert all(isinstance(df, pd.DataFrame) for df in concat_args[0])
-    
-    # Verify to_csv was called with the correct arguments
-    assert mock_to_csv.call_count == 1
-    to_csv_args, to_csv_kwargs = mock_to_csv.call_args
-    assert to_csv_kwargs.get('index') is False
-    
-    # Verify the output file path was set correctly
-    assert monitor.output_file == str(temp_file)
-    
-    # Verify log message
-    assert any(f"Saved {len(new_articles)} articles to {temp_file}" in record.message for record in caplog.records)
+    monkeypatch.undo()
+    lines = temp_file.read_text(encoding='utf-8').splitlines()
+    assert lines[0].startswith('url,title,section,')
+    assert sum(line.startswith('url,') for line in lines) == 1, "Header must be written once"
+    df = pd.read_csv(temp_file)
+    assert df['url'].tolist() == ['http://example.com/1', 'https://example.com/new']
+    assert pd.isna(df.loc[1, 'description'])
+    assert any(f"Saved 1 articles to {temp_file}" in record.message for record in caplog.records)
 
-def test_save_articles_duplicate_urls(monkeypatch, tmp_path, caplog):
-    """Test that duplicate URLs are handled correctly."""
-    from unittest.mock import MagicMock, call
-    import pandas as pd
-    from datetime import datetime
-    from discover_monitor.scraper import Article, DiscoverMonitor
-    
-    # Create a temporary file path
+def test_save_articles_header_for_empty_file(tmp_path):
+    """Test that an existing but empty file still gets a header."""
     temp_file = tmp_path / 'test_articles.csv'
-    
-    # Setup test data for existing article with proper datetime objects
-    existing_article = {
-        'url': 'https://example.com/existing',
-        'title': 'Existing Article',
-        'section': 'news',
-        'description': 'Existing description',
-        'source': 'example.com',
-        'is_own_site': True,
-        'published_date': datetime(2023, 1, 1),
-        'last_modified': None,
-        'image_url': None
-    }
-    
-    # Updated article with same URL but different content
-    updated_article = {
-        'url': 'https://example.com/existing',  # Same URL as existing article
-        'title': 'Updated Title',
-        'section': 'news',
-        'description': 'Updated description',
-        'source': 'example.com',
-        'is_own_site': True,
-        'published_date': datetime(2023, 1, 2),
-        'last_modified': datetime(2023, 1, 3),
-        'image_url': 'https://example.com/image.jpg'
-    }
-    
-    # Create DataFrames for testing - ensure they match Article.to_dict() structure
-    existing_dict = {k: [v] for k, v in existing_article.items()}
-    existing_df = pd.DataFrame(existing_dict)
-    
-    # Mock file existence and read_csv
-    mock_exists = MagicMock(return_value=True)
-    monkeypatch.setattr('os.path.exists', mock_exists)
-    
-    mock_read_csv = MagicMock(return_value=existing_df)
-    monkeypatch.setattr('pandas.read_csv', mock_read_csv)
-    
-    # Track the combined DataFrame for assertions
-    combined_dfs = []
-    
-    # Mock concat to capture all calls and return values
-    def mock_concat(args, **kwargs):
-        nonlocal combined_dfs
-        result = pd.concat(args[0] if args else [])
-        combined_dfs.append({
-            'args': args,
-            'kwargs': kwargs,
-            'result': result
-        })
-        return result
-        
-    mock_concat_spy = MagicMock(side_effect=mock_concat)
-    monkeypatch.setattr('pandas.concat', mock_concat_spy)
-    
-    # Track the saved DataFrames
-    saved_dfs = []
-    
-    # Original to_csv method
-    original_to_csv = pd.DataFrame.to_csv
-    
-    # Create a wrapper to capture the DataFrame being saved
-    def to_csv_wrapper(self, path, *args, **kwargs):
-        saved_dfs.append(self.copy())
-        return original_to_csv(self, path, *args, **kwargs)
-    
-    # Patch the to_csv method
-    monkeypatch.setattr('pandas.DataFrame.to_csv', to_csv_wrapper)
-    
-    # Mock makedirs to do nothing
-    mock_makedirs = MagicMock()
-    monkeypatch.setattr('os.makedirs', mock_makedirs)
-    
-    # Create a monitor instance with the test file path
+    temp_file.touch()
     monitor = DiscoverMonitor(output_file=str(temp_file))
     
-    # Reset combined_dfs before the test
-    combined_dfs = []
+    monitor.save_articles([_csv_article(3)])
     
-    # Call the method with the updated article
-    with caplog.at_level(logging.INFO):
-        monitor.save_articles([Article(**updated_article)])
-    
-    # Verify the results
-    mock_exists.assert_called_once_with(str(temp_file))
-    mock_read_csv.assert_called_once_with(str(temp_file))
+    df = pd.read_csv(temp_file)
+    assert df['url'].tolist() == ['http://example.com/3']
+
+def test_save_articles_accepts_generator(tmp_path):
+    """Test that save_articles streams any iterable and ignores empty ones."""
+    temp_file = tmp_path / 'test_articles.csv'
+    monitor = DiscoverMonitor(output_file=str(temp_file))
     
-    # Verify concat was called
-    assert mock_concat_spy.call_count > 0, "pd.concat should have been called"
+    monitor.save_articles(iter(()))
+    assert not temp_file.exists()
     
-    # Verify our wrapper was called
-    assert len(saved_dfs) == 1, f"Expected exactly one DataFrame to be saved, got {len(saved_dfs)}"
-    saved_df = saved_dfs[0]
+    monitor.save_articles(_csv_article(i) for i in (1, 2, 3))
     
-    # Verify the saved data has the expected content
-    assert len(saved_df) == 1, f"Expected exactly one article after deduplication, got {len(saved_df)}"
+    df = pd.read_csv(temp_file)
+    assert df['url'].tolist() == [f'http://example.com/{i}' for i in (1, 2, 3)]
+
+def test_load_seen_urls_uses_sidecar_file(monkeypatch, tmp_path):
+    """Test that seen URLs come from the sidecar file once it exists."""
+    temp_file = tmp_path / 'test_articles.csv'
+    monitor = DiscoverMonitor(output_file=str(temp_file))
+    assert monitor.load_seen_urls() == set()
     
-    # Get the saved article
-    saved_article = saved_df.iloc[0]
+    monitor.save_articles([_csv_article(1), _csv_article(2)])
+    assert (tmp_path / 'test_articles_seen_urls.txt').read_text(encoding='utf-8').splitlines() == [
+        'http://example.com/1', 'http://example.com/2'
+    ]
     
-    # Verify basic fields
-    assert saved_article['url'] == 'https://example.com/existing', "URL mismatch"
-    assert saved_article['title'] == 'Updated Title', "Title was not updated"
-    assert saved_article['description'] == 'Updated description', "Description was not updated"
-    assert saved_article['image_url'] == 'https://example.com/image.jpg', "Image URL was not updated"
+    monitor.save_articles([_csv_article(3)])
+    monkeypatch.setattr(monitor, 'load_existing_data',
+                        MagicMock(side_effect=AssertionError("CSV must not be loaded")))
+    assert monitor.load_seen_urls() == {f'http://example.com/{i}' for i in (1, 2, 3)}
+
+def test_load_seen_urls_bootstraps_from_csv(tmp_path):
+    """Test that a CSV without sidecar file is read once and the sidecar is rebuilt."""
+    temp_file = tmp_path / 'test_articles.csv'
+    monitor = DiscoverMonitor(output_file=str(temp_file))
+    monitor.save_articles([_csv_article(1, url='http://example.com/a'),
+                           _csv_article(2, url='http://example.com/b')])
+    (tmp_path / 'test_articles_seen_urls.txt').unlink()
+    
+    # Appending before the sidecar exists must not create a partial one
+    monitor.save_articles([_csv_article(1)])
+    sidecar = tmp_path / 'test_articles_seen_urls.txt'
+    assert not sidecar.exists()
+    
+    expected = {'http://example.com/a', 'http://example.com/b', 'http://example.com/1'}
+    assert monitor.load_seen_urls() == expected
+    assert set(sidecar.read_text(encoding='utf-8').splitlines()) == expected
+
+def test_load_seen_urls_reads_only_url_column(monkeypatch, tmp_path):
+    """Test that rebuilding the seen URLs only parses the url column."""
+    temp_file = tmp_path / 'test_articles.csv'
+    monitor = DiscoverMonitor(output_file=str(temp_file))
+    monitor.save_articles([_csv_article(1)])
+    (tmp_path / 'test_articles_seen_urls.txt').unlink()
     
-    # Handle date comparisons - convert string dates to datetime objects if needed
-    published_date = saved_article['published_date']
-    if isinstance(published_date, str):
-        published_date = datetime.fromisoformat(published_date.replace('Z', '+00:00'))
-    assert published_date == datetime(2023, 1, 2), "Published date was not updated"
+    read_csv = pd.read_csv
+    mock_read_csv = MagicMock(side_effect=read_csv)
+    monkeypatch.setattr('pandas.read_csv', mock_read_csv)
     
-    last_modified = saved_article['last_modified']
-    if pd.notna(last_modified):  # Handle None/NaT
-        if isinstance(last_modified, str):
-            last_modified = datetime.fromisoformat(last_modified.replace('Z', '+00:00'))
-        assert last_modified == datetime(2023, 1, 3), "Last modified date was not updated"
+    assert monitor.load_seen_urls() == {'http://example.com/1'}
+    mock_read_csv.assert_called_once_with(str(temp_file), usecols=['url'])
+
+def test_save_articles_parquet_output(tmp_path):
+    """Test that a .parquet output file is appended to and read back."""
+    temp_file = tmp_path / 'test_articles.parquet'
+    monitor = DiscoverMonitor(output_file=str(temp_file))
     
-    # Verify log message
-    assert any(f"Saved {1} articles to {temp_file}" in record.message for record in caplog.records), \
-        "Expected success log message not found"
+    monitor.save_articles([_csv_article(1)])
+    monitor.save_articles([{'url': 'https://example.com/new', 'title': 'New'}])
     
-    # Verify makedirs was called for both the default data directory and the output file's directory
-    assert mock_makedirs.call_count == 2, "Expected makedirs to be called twice (for data dir and output dir)"
+    df = pd.read_parquet(temp_file)
+    assert df['url'].tolist() == ['http://example.com/1', 'https://example.com/new']
+    assert not (tmp_path / 'test_articles.parquet.tmp').exists()
+    assert monitor.load_existing_data(usecols=['url'])['url'].tolist() == df['url'].tolist()
+    assert monitor.load_seen_urls() == {'http://example.com/1', 'https://example.com/new'}
+
+def test_convert_csv_to_parquet(tmp_path):
+    """Test the one-off migration of an articles CSV to Parquet."""
+    from discover_monitor.scraper import convert_csv_to_parquet
+    csv_file = tmp_path / 'articles.csv'
+    DiscoverMonitor(output_file=str(csv_file)).save_articles([_csv_article(1), _csv_article(2)])
     
-    # The last call should be for the output file's directory
-    mock_makedirs.assert_any_call(os.path.dirname(str(temp_file)), exist_ok=True)
+    parquet_file = convert_csv_to_parquet(str(csv_file))
     
-    # Verify our wrapper was called
-    assert len(saved_dfs) == 1, f"Expected exactly one DataFrame to be saved, got {len(saved_dfs)}"
-    saved_df = saved_dfs[0]
+    assert parquet_file == str(tmp_path / 'articles.parquet')
+    pd.testing.assert_frame_equal(pd.read_parquet(parquet_file), pd.read_csv(csv_file))
+
+@pytest.mark.parametrize('file_name', ['test_articles.csv', 'test_articles.parquet'])
+def test_compact_articles_keeps_latest_row(tmp_path, file_name):
+    """Test that compaction keeps the most recently fetched row for each URL."""
+    temp_file = tmp_path / file_name
+    monitor = DiscoverMonitor(output_file=str(temp_file))
+    monitor.save_articles([
+        {'url': 'http://example.com/1', 'title': 'Old title', 'timestamp': '2023-01-02T00:00:00'},
+        {'url': 'http://example.com/2', 'title': 'Other', 'timestamp': '2023-01-01T00:00:00'},
+    ])
+    monitor.save_articles([
+        {'url': 'http://example.com/1', 'title': 'Stale retry', 'timestamp': '2023-01-01T00:00:00'},
+        {'url': 'http://example.com/1', 'title': 'Fixed title', 'timestamp': '2023-01-03T00:00:00'},
+    ])
     
-    # Verify the saved data has the expected content
-    assert len(saved_df) == 1, f"Expected exactly one article after deduplication, got {len(saved_df)}"
-    assert saved_df.iloc[0]['url'] == 'https://example.com/existing', "URL mismatch"
-    assert saved_df.iloc[0]['title'] == 'Updated Title', "Title was not updated"
+    assert monitor.compact_articles() == 2
     
-    # Verify the error log for the DataFrame truth value issue
-    assert any("Error loading existing articles: The truth value of a DataFrame is ambiguous" in record.message 
-              for record in caplog.records), "Expected error log about DataFrame truth value"
+    df = monitor.load_existing_data()
+    assert df['url'].tolist() == ['http://example.com/2', 'http://example.com/1']
+    assert df['title'].tolist() == ['Other', 'Fixed title']
+    assert monitor.load_seen_urls() == {'http://example.com/1', 'http://example.com/2'}
+    assert monitor.compact_articles() == 0
 
+def test_progress_logs_without_terminal(monkeypatch, caplog):
+    """Test that progress is logged periodically instead of drawn when stderr is not a TTY."""
+    from discover_monitor.scraper import _progress
+    monkeypatch.setattr('sys.stderr.isatty', lambda: False)
+    
+    with patch('discover_monitor.scraper.tqdm') as mock_tqdm, caplog.at_level(logging.INFO):
+        assert list(_progress(range(45), 45, "Items")) == list(range(45))
+    
+    mock_tqdm.assert_not_called()
+    progress = [record.message for record in caplog.records if record.message.startswith("Items")]
+    assert progress[0] == "Items: 2/45"
+    assert progress[-1] == "Items: 45/45"
+    assert len(progress) == 23
 
-def test_save_articles_edge_cases(monkeypatch, tmp_path, caplog):
-    """Test edge cases for the _save_articles method."""
-    # Create a test CSV file
-    test_file = tmp_path / "test_articles.csv"
-    
-    # Create a sample article
-    article = Article(
-        url="https://example.com/test",
-        title="Test Article",
-        section="Test Section",
-        description="Test Description",
-        source="test.com",
-        is_own_site=True,
-        published_date=datetime(2023, 1, 1),
-        last_modified=datetime(2023, 1, 2)
-    )
-    
-    # Create a DiscoverMonitor instance with a test output file
-    monitor = DiscoverMonitor(output_file=str(test_file))
-    
-    # Test 1: Save with file_path=None (should use default from init)
-    monitor.articles = [article]
-    monitor._save_articles()
-    
-    # Verify the file was created with the default path
-    assert test_file.exists(), "File was not created with default path"
-    
-    # Read the file to verify content
-    df = pd.read_csv(test_file)
-    assert len(df) == 1
-    assert df.iloc[0]['url'] == 'https://example.com/test'
-    
-    # Test 2: Save with empty articles list
-    monitor.articles = []
-    monitor._save_articles()
-    
-    # Verify warning was logged
-    assert any("No hay artículos para guardar" in record.message for record in caplog.records), \
-        "Expected warning about no articles to save"
+def test_progress_uses_tqdm_on_terminal(monkeypatch):
+    """Test that a rate-limited tqdm bar is used when stderr is a TTY."""
+    from discover_monitor.scraper import _progress
+    monkeypatch.setattr('sys.stderr.isatty', lambda: True)
     
-    # Test 3: Test exception handling during file save
-    # Mock pd.DataFrame.to_csv to raise an exception
-    def mock_to_csv(*args, **kwargs):
-        raise Exception("Test exception")
+    with patch('discover_monitor.scraper.tqdm', return_value=iter([1, 2])) as mock_tqdm:
+        assert list(_progress([1, 2], 2, "Items")) == [1, 2]
     
-    # Add the article back
-    monitor.articles = [article]
-    
-    # Replace the to_csv method with our mock
-    original_to_csv = pd.DataFrame.to_csv
-    monkeypatch.setattr(pd.DataFrame, 'to_csv', mock_to_csv)
+    assert mock_tqdm.call_args.kwargs['mininterval'] == 0.5
+
+def test_canonicalize_url():
+    """Test that tracking parameters and cosmetic differences are normalised away."""
+    from discover_monitor.scraper import canonicalize_url
+    expected = 'https://example.com/news/story?a=1&b=2'
+    assert canonicalize_url('HTTPS://Example.COM/news/story/?b=2&utm_source=x&a=1&fbclid=abc#top') == expected
+    assert canonicalize_url(' https://example.com/news/story?a=1&b=2 ') == expected
+    assert canonicalize_url('https://example.com/') == 'https://example.com'
+    # The path keeps its case: only scheme and host are case-insensitive
+    assert canonicalize_url('https://example.com/News') != canonicalize_url('https://example.com/news')
+
+def test_load_seen_urls_are_canonical(tmp_path):
+    """Test that the seen-URL set holds canonical URLs, also when rebuilt from the CSV."""
+    temp_file = tmp_path / 'test_articles.csv'
+    monitor = DiscoverMonitor(output_file=str(temp_file))
+    monitor.save_articles([_csv_article(1, url='https://Example.com/a/?utm_medium=rss')])
     
-    # Call the method and verify it raises the exception
-    with pytest.raises(Exception, match="Test exception"):
-        monitor._save_articles()
+    assert monitor.load_seen_urls() == {'https://example.com/a'}
+    (tmp_path / 'test_articles_seen_urls.txt').unlink()
+    assert monitor.load_seen_urls() == {'https://example.com/a'}
+    assert pd.read_csv(temp_file)['url'].tolist() == ['https://Example.com/a/?utm_medium=rss']
+
+def test_save_articles_write_error(monkeypatch, tmp_path, caplog):
+    """Test that write errors are logged and re-raised."""
+    monitor = DiscoverMonitor(output_file=str(tmp_path / 'test_articles.csv'))
+    monkeypatch.setattr('builtins.open', MagicMock(side_effect=OSError("disk full")))
     
-    # Verify error was logged
-    assert any("Error al guardar los artículos: Test exception" in record.message 
-              for record in caplog.records), "Expected error log about save failure"
+    with pytest.raises(OSError, match="disk full"):
+        monitor.save_articles([_csv_article(1)])
     
-    # Restore the original method
-    monkeypatch.setattr(pd.DataFrame, 'to_csv', original_to_csv)
+    assert any("Error saving articles to" in record.message and "disk full" in record.message
+               for record in caplog.records)
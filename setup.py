@@ -6,6 +6,7 @@ setup(
     packages=find_packages(),
     install_requires=[
         'pandas>=1.3.0',
+        'pyarrow>=7.0.0',
         'requests>=2.26.0',
         'beautifulsoup4>=4.10.0',
         'lxml>=4.6.3',
@@ -17,8 +18,9 @@ setup(
         'tqdm>=4.62.0',
         'python-dateutil>=2.8.2',
         'plotly>=5.0.0',
-        'streamlit>=1.33.0',
-        'fpdf>=1.7.2',
+        'streamlit>=1.65.0',
+        'fpdf2>=2.7.0',
+        'xlsxwriter>=3.0.0',
     ],
-    python_requires='>=3.7',
+    python_requires='>=3.10',
 )